@@ -0,0 +1,65 @@
+"""Battle checkpoint benchmark: cost per round on the page and per flush.
+
+Plays --battles Hard battles round by round, checkpointing after every round
+the way the LePlay page does, and times the checkpoint call (what a round
+pays) separately from the background flush (what the writer thread pays).
+Flushes run every --rounds-per-flush rounds to model fast play inside one
+interval, so the coalescing shows up as fewer rows written than rounds.
+
+    python -m benchmarks.checkpoints
+    python -m benchmarks.checkpoints --battles 2000 --rounds-per-flush 1
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from lebattle import db
+from lebattle.battle import new_battle, play_round
+from lebattle.checkpoints import Checkpointer
+
+ACTIONS = ["attack", "defend", "rest", "special"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--battles", type=int, default=500)
+    parser.add_argument("--rounds-per-flush", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db.DB_PATH = os.path.join(workdir, "bench.db")
+        db.init_db()
+        checkpointer = Checkpointer(interval=3600)  # Flushed by hand below, never by its thread
+        rng = random.Random(0)
+        checkpoint_s, flush_s, rounds, step = [], [], 0, 0
+        battles = [(f"user{i}", new_battle("Hard")) for i in range(args.battles)]
+        while battles:
+            step += 1
+            for username, battle in battles:
+                play_round(battle, rng.choice(ACTIONS))
+                t0 = time.perf_counter()
+                checkpointer.checkpoint(username, battle)
+                checkpoint_s.append(time.perf_counter() - t0)
+                rounds += 1
+            if step % args.rounds_per_flush == 0:
+                t0 = time.perf_counter()
+                checkpointer.flush()
+                flush_s.append(time.perf_counter() - t0)
+            battles = [(username, battle) for username, battle in battles if not battle.is_over()]
+        checkpointer.flush()
+
+    print(f"{args.battles} battles, {rounds} rounds, flush every {args.rounds_per_flush} rounds")
+    print(f"  checkpoint per round   median {statistics.median(checkpoint_s) * 1e6:7.1f} us"
+          f"   max {max(checkpoint_s) * 1e6:8.1f} us")
+    print(f"  flush                  median {statistics.median(flush_s) * 1000:7.1f} ms"
+          f"   ({len(flush_s)} flushes)")
+    print(f"  rows written           {checkpointer.writes} for {rounds} rounds"
+          f" ({checkpointer.coalesced} coalesced)")
+
+
+if __name__ == "__main__":
+    main()
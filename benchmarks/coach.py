@@ -0,0 +1,64 @@
+"""Coach benchmark: time to analyse a lost battle, from first round queued to last result.
+
+Plays battles with random legal moves until it has --battles losses of
+exactly --rounds rounds, then runs the coach over each, the first on a cold
+pool (worker start-up included, as for the first loss after a server start).
+
+    python -m benchmarks.coach
+    python -m benchmarks.coach --rounds 25 --workers 4
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from lebattle import coach, replay
+from lebattle.battle import new_battle, play_round
+from lebattle.game import legal_moves
+
+
+def _losses(rng, count, rounds, difficulty):
+    losses = []
+    while len(losses) < count:
+        battle = new_battle(difficulty)
+        while not battle.is_over() and battle.round <= rounds:
+            play_round(battle, rng.choice(legal_moves(battle.player)))
+        if battle.is_over() and len(battle.actions) == rounds and not battle.player.is_alive():
+            losses.append(replay.encode(battle))
+    return losses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--battles", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--difficulty", default="Hard", choices=["Easy", "Medium", "Hard"])
+    parser.add_argument("--rollouts", type=int, default=coach.ROLLOUTS)
+    parser.add_argument("--workers", type=int, help=f"pool size (default LEBATTLE_COACH_WORKERS, {coach.WORKERS})")
+    args = parser.parse_args(argv)
+    if args.workers:
+        coach.WORKERS = args.workers
+
+    random.seed(0)
+    losses = _losses(random.Random(0), args.battles, args.rounds, args.difficulty)
+    first_s, total_s = [], []
+    for data in losses:
+        t0 = time.perf_counter()
+        rounds = coach.analyze(data, args.rollouts)
+        first = None
+        for _, _, result in rounds:
+            result.wait()
+            first = first or time.perf_counter() - t0
+        first_s.append(first)
+        total_s.append(time.perf_counter() - t0)
+
+    print(f"{len(losses)} {args.rounds}-round {args.difficulty} losses, {args.rollouts} rollouts per move,"
+          f" {coach.WORKERS} workers")
+    print(f"  cold pool        first round {first_s[0]:6.2f} s   all rounds {total_s[0]:6.2f} s")
+    print(f"  warm (median)    first round {statistics.median(first_s[1:] or first_s):6.2f} s"
+          f"   all rounds {statistics.median(total_s[1:] or total_s):6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""LePASS gallery benchmark: image bytes per view and server render time.
+
+Browser time-to-render is dominated by the image bytes it has to download,
+so that is the headline number; the server-side rerun time and the number
+of image elements are reported alongside it.
+
+Compares a max-level LePASS view served from the original images (no
+thumbnail index) with the same view served from the thumbnail/sprite
+pipeline. Runs fully offline: pass --seed to use a directory of real images,
+otherwise a synthetic seed set of photo-sized JPEGs is generated.
+
+    python -m benchmarks.lepass_gallery
+    python -m benchmarks.lepass_gallery --seed ~/lebron-seed --runs 10
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from lebattle import assets, db, thumbnails  # noqa: E402
+from lebattle.collectibles import get_catalog  # noqa: E402
+
+
+def make_seed(seed_dir, size=(1200, 900)):
+    """Write one noisy photo-sized JPEG per collectible"""
+    from PIL import Image
+
+    rng = random.Random(0)
+    for collectible in get_catalog().collectibles:
+        path = os.path.join(seed_dir, collectible.asset)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        image = Image.effect_noise(size, 64).convert("RGB")
+        image = Image.blend(image, Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3))), 0.5)
+        image.save(path, "JPEG", quality=90)
+
+
+def view_bytes(seed_dir, level, built):
+    """Image bytes a browser downloads for one LePASS view at this level"""
+    catalog = get_catalog()
+    singles = [catalog.for_level(level)]  # current, next and teaser collapse at max level
+    if not built:
+        gallery = catalog.unlocked(level)
+        return sum(os.path.getsize(os.path.join(seed_dir, c.asset)) for c in singles + list(gallery))
+    index = thumbnails.gallery_index()
+    out_dir = thumbnails.output_dir()
+    files = {index["thumbs"][c.id] for c in singles}
+    files |= {sprite["file"] for sprite in index["sprites"].values()}
+    return sum(os.path.getsize(os.path.join(out_dir, name)) for name in files)
+
+
+def render_times(runs):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "lebronsim.py"), default_timeout=60)
+    at.session_state.logged_in = True
+    at.session_state.username = "bench"
+    at.session_state.page = "LePASS"
+    at.run()  # Warm up imports
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - t0)
+    assert not at.exception, [e.value for e in at.exception]
+    return samples, len(at.get("image"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LePASS gallery bytes and render time")
+    parser.add_argument("--seed", help="directory of seed images (default: generate synthetic ones)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        seed_dir = args.seed or os.path.join(workdir, "seed")
+        if not args.seed:
+            make_seed(seed_dir)
+
+        db.init_db()
+        db.register_user("bench", "bench")
+        db.update_user_xp_fixed("bench", 10**6, won=True)  # Max level: the whole gallery is unlocked
+        level = db.get_user_stats("bench")["level"]
+
+        assets.STATIC_DIR = os.path.join(workdir, "static-empty")
+        before_bytes = view_bytes(seed_dir, level, built=False)
+        before, before_images = render_times(args.runs)
+
+        assets.STATIC_DIR = os.path.join(workdir, "static")
+        t0 = time.perf_counter()
+        thumbnails.build(seed_dir, offline=True)
+        build_s = time.perf_counter() - t0
+        after_bytes = view_bytes(seed_dir, level, built=True)
+        after, after_images = render_times(args.runs)
+
+    print(f"LePASS at level {level} (median of {args.runs} reruns)")
+    print(f"  image bytes per view   originals {before_bytes / 1024:9.1f} KB   pipeline {after_bytes / 1024:8.1f} KB"
+          f"   ({before_bytes / after_bytes:.1f}x less)")
+    print(f"  server render time     originals {statistics.median(before) * 1000:9.1f} ms   pipeline"
+          f" {statistics.median(after) * 1000:8.1f} ms")
+    print(f"  st.image elements      originals {before_images:9d}      pipeline {after_images:8d}")
+    print(f"  one-time build         {build_s:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
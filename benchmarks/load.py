@@ -0,0 +1,283 @@
+"""Synthetic multi-user load test of the real app, driven through AppTest.
+
+Every simulated user is an AppTest session of lebronsim.py, all against one
+shared SQLite file. A user registers, signs in, plays --battles full battles
+by clicking the action buttons (the app resolves each round and awards XP at
+the end), then opens LePASS and switches its view mode. All N users of a
+step are live at once, spread over --processes worker processes.
+
+AppTest swaps process-wide state (the runtime, config) on every run, so runs
+inside one worker take turns; a user's rerun latency includes waiting for
+its turn, the way a rerun queues for the GIL on a busy server. Workers run
+in parallel, so SQLite sees real concurrent writers.
+
+For each N it reports rerun latency percentiles (one click or navigation,
+as the user waits for it), reruns per second, SQLite lock waits and memory
+per session:
+
+    python -m benchmarks.load                        # N = 1, 10, 100, 1000
+    python -m benchmarks.load --users 1,25 --battles 2 --processes 4
+
+Lock waits are counted by opening connections with a zero busy timeout and
+retrying SQLITE_BUSY the way the default busy handler would, so every wait
+is seen. Memory per session is the workers' RSS growth over the step divided
+by N; it includes AppTest's own bookkeeping, so it overestimates a real
+server session. Registration and sign-in hash with bcrypt at its full cost,
+so large N spends most of its time there, the same as a real login spike.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from lebattle import db
+from lebattle.checkpoints import checkpointer
+from lebattle.pages import play
+from lebattle.sessions import registry
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "lebronsim.py")
+ACTIONS = ["🏀 Attack", "🛡️ Defend", "💤 Rest", "⭐ Special Attack"]
+BUSY_TIMEOUT = 5.0  # Seconds, sqlite3.connect's default
+_run_lock = threading.Lock()  # One AppTest run at a time per process
+
+
+class LockStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.errors = 0
+
+    def record(self, seconds, failed):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.errors += failed
+
+
+lock_stats = LockStats()
+
+
+def _retry_busy(func, *args):
+    """Call func, retrying while the database is locked and recording the wait"""
+    t0 = None
+    delay = 0.001
+    while True:
+        try:
+            result = func(*args)
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            if t0 is None:
+                t0 = time.perf_counter()
+            if time.perf_counter() - t0 > BUSY_TIMEOUT:
+                lock_stats.record(time.perf_counter() - t0, True)
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+            continue
+        if t0 is not None:
+            lock_stats.record(time.perf_counter() - t0, False)
+        return result
+
+
+class _WaitCountingCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        return _retry_busy(super().execute, *args)
+
+    def executemany(self, *args):
+        return _retry_busy(super().executemany, *args)
+
+
+class WaitCountingConnection(sqlite3.Connection):
+    def cursor(self, factory=_WaitCountingCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+    def commit(self):
+        return _retry_busy(super().commit)
+
+
+_sqlite_connect = sqlite3.connect
+
+
+def _counting_connect(database, **kwargs):
+    return _sqlite_connect(database, timeout=0, factory=WaitCountingConnection)
+
+
+def _load_script_run_ctx():
+    """AppTest gives every session the id "test session id"; use the one the harness assigned"""
+    return SimpleNamespace(session_id=st.session_state["load_session_id"])
+
+
+def _rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class User:
+    """One simulated player: a single AppTest session and the latencies it saw"""
+
+    def __init__(self, username, battles, timeout):
+        self.username = username
+        self.password = f"pw-{username}"
+        self.battles = battles
+        self.rng = random.Random(username)
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.at.session_state["load_session_id"] = f"session-{self.username}"
+        self.latencies = []
+        self.error = None
+
+    def _timed(self, element):
+        t0 = time.perf_counter()
+        with _run_lock:
+            element.run()
+        self.latencies.append(time.perf_counter() - t0)
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].message)
+
+    def _button(self, label):
+        for button in self.at.button:
+            if button.label == label:
+                return button
+        raise RuntimeError(f"no {label!r} button on {self.at.session_state.page}")
+
+    def _navigate(self, page):
+        # The radio has no key, so when the app moves pages itself the first click can be lost
+        for _ in range(3):
+            self._timed(self.at.sidebar.radio[0].set_value(page))
+            if self.at.session_state.page == page:
+                return
+        raise RuntimeError(f"could not navigate to {page}")
+
+    def run(self):
+        try:
+            self._timed(self.at)
+            self._navigate("Register")
+            self.at.text_input(key="register_username").input(self.username)
+            self.at.text_input(key="register_password").input(self.password)
+            self._timed(self._button("Create Account").click())
+            self._navigate("Login")
+            self.at.text_input(key="login_username").input(self.username)
+            self.at.text_input(key="login_password").input(self.password)
+            self._timed(self._button("Sign In").click())
+            for i in range(self.battles):
+                if i:
+                    self._timed(self._button("Play Again").click())
+                self._timed(self._button("Start Game").click())
+                while not any(b.label == "Play Again" for b in self.at.button):
+                    enabled = [b for b in self.at.button if b.label in ACTIONS and not b.disabled]
+                    self._timed(self.rng.choice(enabled).click())
+            self._navigate("LePASS")
+            self._timed(self._lepass_radio().set_value("By Rarity"))
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+
+    def _lepass_radio(self):
+        return next(r for r in self.at.main.radio if r.label == "View mode:")
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _worker(step, indices, battles, timeout, db_path):
+    """Run some of a step's users in this process and return their raw measurements"""
+    sqlite3.connect = _counting_connect  # Every lebattle.db connection, including the checkpoint writer's
+    play.get_script_run_ctx = _load_script_run_ctx
+    db.DB_PATH = db_path
+    warmup = User(f"warmup{step}-{os.getpid()}", 1, timeout)
+    warmup.run()  # Imports, page modules and caches, outside the measurement
+    rss_before = _rss_bytes()
+    users = [User(f"load{step}-{i}", battles, timeout) for i in indices]
+    threads = [threading.Thread(target=user.run) for user in users]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    checkpointer.flush()
+    stats = registry.stats()
+    return {
+        "seconds": elapsed,
+        "latencies": [latency for user in users for latency in user.latencies],
+        "errors": [user.error for user in [warmup] + users if user.error],
+        "lock_waits": lock_stats.waits,
+        "lock_wait_seconds": lock_stats.wait_seconds,
+        "lock_errors": lock_stats.errors,
+        "rss_growth": max(0, _rss_bytes() - rss_before),
+        "resident": stats["resident"],
+        "resident_bytes": stats["resident_bytes"],
+    }
+
+
+def run_step(n, battles, timeout, processes, db_path):
+    """Run n users to completion over the worker processes and combine their measurements"""
+    processes = min(processes, n)
+    jobs = [(n, range(p, n, processes), battles, timeout, db_path) for p in range(processes)]
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        parts = pool.starmap(_worker, jobs)
+    latencies = sorted(latency for part in parts for latency in part["latencies"])
+    resident = sum(part["resident"] for part in parts)
+    return {
+        "users": n,
+        "reruns": len(latencies),
+        "seconds": max(part["seconds"] for part in parts),
+        "p50": _percentile(latencies, 0.5),
+        "p95": _percentile(latencies, 0.95),
+        "p99": _percentile(latencies, 0.99),
+        "lock_waits": sum(part["lock_waits"] for part in parts),
+        "lock_wait_seconds": sum(part["lock_wait_seconds"] for part in parts),
+        "lock_errors": sum(part["lock_errors"] for part in parts),
+        "rss_per_session": sum(part["rss_growth"] for part in parts) / n,
+        "battle_bytes": sum(part["resident_bytes"] for part in parts) / max(1, resident),
+        "errors": [error for part in parts for error in part["errors"]],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", default="1,10,100,1000", help="comma-separated concurrent user counts")
+    parser.add_argument("--battles", type=int, default=1, help="full battles each user plays")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds one rerun may take before failing")
+    args = parser.parse_args(argv)
+
+    print(f"{'users':>6} {'reruns':>7} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+          f" {'lock waits':>11} {'waited s':>9} {'RSS/session':>12} {'battle':>8}")
+    failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in [int(value) for value in args.users.split(",")]:
+            db.DB_PATH = os.path.join(workdir, f"load{n}.db")
+            db.init_db()
+            result = run_step(n, args.battles, args.timeout, args.processes, db.DB_PATH)
+            print(f"{n:>6} {result['reruns']:>7} {result['reruns'] / result['seconds']:>9.1f}"
+                  f" {result['p50'] * 1000:>8.1f} {result['p95'] * 1000:>8.1f} {result['p99'] * 1000:>8.1f}"
+                  f" {result['lock_waits']:>11} {result['lock_wait_seconds']:>9.2f}"
+                  f" {result['rss_per_session'] / 1024:>9.0f} KB {result['battle_bytes'] / 1024:>5.1f} KB")
+            if result["lock_errors"] or result["errors"]:
+                failed = True
+                print(f"       {result['lock_errors']} lock timeouts, {len(result['errors'])} users failed;"
+                      f" first: {result['errors'][0] if result['errors'] else '-'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
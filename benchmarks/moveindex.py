@@ -0,0 +1,96 @@
+"""Move-index benchmark: indexing throughput, index size and query latency.
+
+Plays a pool of real battles with random moves, then stores and indexes
+--battles replays drawn from that pool in batches of --batch, the way a busy
+server would record them. Reports how fast replays are indexed, how much the
+index adds to the database per battle, and the median latency of a set of
+pattern queries and next-move lookups over the finished index.
+
+    python -m benchmarks.moveindex
+    python -m benchmarks.moveindex --battles 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from lebattle import db, moveindex, replay
+from lebattle.battle import new_battle, play_round
+
+ACTIONS = ["attack", "defend", "rest", "special"]
+POOL = 5000
+PATTERNS = [
+    "attack attack attack */special",
+    "special/special",
+    "rest attack attack",
+    "*/defend */defend */defend */defend",
+    "defend defend rest attack special",
+    "attack/rest * * * * special/special",
+]
+CONTEXTS = [["rest", "attack", "attack"], ["attack", "attack", "attack"], ["defend"]]
+
+
+def _replay_pool(rng):
+    pool = []
+    for i in range(POOL):
+        difficulty = ("Easy", "Medium", "Hard")[i % 3]
+        battle = new_battle(difficulty)
+        while not battle.is_over():
+            play_round(battle, rng.choice(ACTIONS))
+        pool.append((difficulty, "loss" if battle.player.health == 0 else "win", replay.encode(battle)))
+    return pool
+
+
+def _median_ms(call, repeat=7):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = call()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--battles", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    random.seed(0)
+    pool = _replay_pool(rng)
+    with tempfile.TemporaryDirectory() as workdir:
+        db.DB_PATH = os.path.join(workdir, "bench.db")
+        db.init_db()
+        t0 = time.perf_counter()
+        for start in range(0, args.battles, args.batch):
+            batch = [rng.choice(pool) for _ in range(min(args.batch, args.battles - start))]
+            db.save_replays([(f"user{rng.randrange(10000)}", *replay) for replay in batch])
+        index_s = time.perf_counter() - t0
+
+        conn = sqlite3.connect(db.DB_PATH)
+        conn.execute("VACUUM")
+        sizes = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+        conn.close()
+        replay_bytes = sizes.get("replays", 0)
+        index_bytes = sum(size for name, size in sizes.items() if "ngram" in name)
+
+        print(f"{args.battles} battles stored and indexed at {args.battles / index_s:,.0f}/s")
+        print(f"  replays      {replay_bytes / args.battles:7.1f} bytes/battle")
+        print(f"  move index   {index_bytes / args.battles:7.1f} bytes/battle"
+              f"  ({index_bytes / 2 ** 20:.0f} MB)")
+        for pattern in PATTERNS:
+            count_ms, total = _median_ms(lambda: moveindex.count_battles(pattern))
+            find_ms, _ = _median_ms(lambda: moveindex.find_battles(pattern, 20))
+            print(f"  {pattern:<38} {total:9} battles   count {count_ms:8.2f} ms   first 20 {find_ms:8.2f} ms")
+        for context in CONTEXTS:
+            next_ms, _ = _median_ms(lambda: moveindex.next_player_moves(context))
+            print(f"  next after {' '.join(context):<27} {next_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""PvP broker benchmark: thousands of concurrent duels on one broker.
+
+Pairs 2 x --matches players, then plays every match to the end round by
+round. Each round, both players of every live match submit a random legal
+move, except that each player sits a round out with probability --idle. Then
+the clock jumps past the round deadline and one `tick` resolves the rounds
+still missing a move. Reports the cost of a submission (which includes
+resolving the round when it is the second move), the cost of a tick, and the
+memory one match holds.
+
+    python -m benchmarks.pvp
+    python -m benchmarks.pvp --matches 20000 --idle 0.2
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from lebattle.battle import footprint
+from lebattle.game import legal_moves
+from lebattle.pvp import Broker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=5000)
+    parser.add_argument("--idle", type=float, default=0.05, help="chance a player makes no move in a second")
+    parser.add_argument("--round-seconds", type=float, default=3)
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    rng = random.Random(0)
+    clock = FakeClock()
+    broker = Broker(round_seconds=args.round_seconds, clock=clock)
+
+    t0 = time.perf_counter()
+    for i in range(args.matches):
+        broker.join(f"a{i}")
+        broker.join(f"b{i}")
+    join_s = (time.perf_counter() - t0) / (2 * args.matches)
+    matches = [broker.match_for(f"a{i}") for i in range(args.matches)]
+    match_bytes = statistics.median(footprint(match) for match in matches[:200])
+
+    submit_s, tick_s, seconds = [], [], 0
+    live = matches
+    while live:
+        for match in live:
+            for side in (0, 1):
+                if match.moves[side] is not None or rng.random() < args.idle:
+                    continue  # Already locked in and waiting, or away this second
+                username = match.usernames[side]
+                move = rng.choice(legal_moves(match.fighters[side]))
+                t0 = time.perf_counter()
+                broker.submit(username, move)
+                submit_s.append(time.perf_counter() - t0)
+        clock.now += 1
+        t0 = time.perf_counter()
+        broker.tick()
+        tick_s.append(time.perf_counter() - t0)
+        seconds += 1
+        live = [match for match in live if not match.over]
+
+    stats = broker.stats()
+    submit_s.sort()
+    print(f"{args.matches} concurrent matches over {seconds} simulated seconds,"
+          f" {stats['resolved_rounds']} rounds resolved ({stats['timed_out_rounds']} on timeout)")
+    print(f"  join                  mean {join_s * 1e6:7.1f} us")
+    print(f"  submit                median {statistics.median(submit_s) * 1e6:7.1f} us"
+          f"   p99 {submit_s[int(0.99 * len(submit_s))] * 1e6:7.1f} us")
+    print(f"  tick                  median {statistics.median(tick_s) * 1000:7.2f} ms"
+          f"   max {max(tick_s) * 1000:7.2f} ms")
+    print(f"  memory per match      {match_bytes / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
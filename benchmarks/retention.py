@@ -0,0 +1,82 @@
+"""Retention benchmark: compaction throughput, file size, and how long live writers wait.
+
+Stores --battles battles spread over --days days, then compacts everything
+older than --keep days while a writer thread keeps saving a battle every few
+milliseconds, as a live server would. Reports compaction speed, the
+database file size before and after, and the writer's save latency during
+compaction next to its latency on an idle database.
+
+    python -m benchmarks.retention
+    python -m benchmarks.retention --battles 200000 --batch 1000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.stats import _replay_pool
+from lebattle import db, retention
+
+WRITE_INTERVAL = 0.005
+
+
+def _writer(rng, pool, stop, latencies):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        db.save_replays([(f"live{rng.randrange(100)}", *rng.choice(pool))])
+        latencies.append(time.perf_counter() - t0)
+        time.sleep(WRITE_INTERVAL)
+
+
+def _latency_ms(latencies):
+    ordered = sorted(latencies)
+    return (statistics.median(ordered) * 1000, ordered[int(len(ordered) * 0.99)] * 1000, ordered[-1] * 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--battles", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--keep", type=float, default=90)
+    parser.add_argument("--batch", type=int, default=retention.BATCH)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    random.seed(0)
+    pool = _replay_pool(rng)
+    now = time.time()
+    with tempfile.TemporaryDirectory() as workdir:
+        db.DB_PATH = os.path.join(workdir, "bench.db")
+        db.init_db()
+        for start in range(0, args.battles, 500):
+            batch = [(f"user{rng.randrange(1000)}", *rng.choice(pool)) for _ in range(min(500, args.battles - start))]
+            db.save_replays(batch, created_at=now - rng.randrange(args.days) * 86400)
+        size_before = os.path.getsize(db.DB_PATH)
+
+        for label, compacting in (("idle", False), ("compacting", True)):
+            stop, latencies = threading.Event(), []
+            writer = threading.Thread(target=_writer, args=(random.Random(1), pool, stop, latencies))
+            writer.start()
+            t0 = time.perf_counter()
+            if compacting:
+                compacted, freed, _ = retention.compact(args.keep, args.batch)
+            else:
+                time.sleep(2)
+            elapsed = time.perf_counter() - t0
+            stop.set()
+            writer.join()
+            p50, p99, worst = _latency_ms(latencies)
+            print(f"writer while {label:<11} {len(latencies):6} saves   p50 {p50:6.2f} ms   p99 {p99:7.2f} ms"
+                  f"   max {worst:7.2f} ms")
+
+        print(f"compacted {compacted} of {args.battles} battles in {elapsed:.1f}s "
+              f"({compacted / elapsed:,.0f}/s, batches of {args.batch}), freed {freed} pages")
+        print(f"database file {size_before / 2 ** 20:.1f} MB -> {os.path.getsize(db.DB_PATH) / 2 ** 20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Benchmark suite for the game's hot paths, with a stored baseline.
+
+Runs every case with fixed seeds, writes the results as JSON and compares
+them with a baseline from an earlier run. A case regresses when its best
+time per operation (the least noisy statistic on a shared machine) is more
+than --tolerance slower than the baseline's; the exit status is 1 if any
+case regressed, so CI can gate on it.
+
+    python -m benchmarks.run                      # run, write results, compare
+    python -m benchmarks.run --save-baseline      # run and store as the new baseline
+    python -m benchmarks.run --only engine. --repeat 3
+
+Baselines are only comparable on the machine that produced them, so none is
+committed: save one on the machine (or CI runner) that does the comparing.
+Without one a plain run stops before running anything and says how to make
+it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from lebattle import db, progression, replay
+from lebattle.battle import new_battle, play_round
+from lebattle.collectibles import get_catalog
+from lebattle.game import LeBron, Player, resolve_round
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "benchmarks", "results", "latest.json")
+ACTIONS = ["attack", "defend", "rest", "special"]
+POPULATED_USERS = 10000
+
+
+def _choose_action(difficulty):
+    def case(rng):
+        """Time choose_action over whole seeded battles, without the rest of the round"""
+        elapsed, ops = 0.0, 0
+        for _ in range(200):
+            player, lebron = Player("You", 150, 100), LeBron(difficulty)
+            while player.is_alive() and lebron.is_alive():
+                t0 = time.perf_counter()
+                lebron_action = lebron.choose_action(player)
+                elapsed += time.perf_counter() - t0
+                ops += 1
+                resolve_round(player, rng.choice(ACTIONS), lebron, lebron_action)
+        return ops, elapsed
+    return case
+
+
+def _play_round(rng):
+    """A full headless round: LeBron's choice, resolution and the battle log"""
+    elapsed, ops = 0.0, 0
+    for difficulty in ("Easy", "Medium", "Hard"):
+        for _ in range(100):
+            battle = new_battle(difficulty)
+            while not battle.is_over():
+                action = rng.choice(ACTIONS)
+                t0 = time.perf_counter()
+                play_round(battle, action)
+                elapsed += time.perf_counter() - t0
+                ops += 1
+    return ops, elapsed
+
+
+def _finished_battles(rng, count=300):
+    battles = []
+    for i in range(count):
+        battle = new_battle(("Easy", "Medium", "Hard")[i % 3])
+        while not battle.is_over():
+            play_round(battle, rng.choice(ACTIONS))
+        battles.append(battle)
+    return battles
+
+
+def _replay_encode(rng):
+    battles = _finished_battles(rng)
+    t0 = time.perf_counter()
+    for battle in battles:
+        replay.encode(battle)
+    return len(battles), time.perf_counter() - t0
+
+
+def _replay_playback(rng):
+    replays = [replay.encode(battle) for battle in _finished_battles(rng)]
+    t0 = time.perf_counter()
+    for data in replays:
+        for _ in replay.playback(data):
+            pass
+    return len(replays), time.perf_counter() - t0
+
+
+def _populated_db(workdir):
+    """A users table with POPULATED_USERS rows, built without bcrypt so setup stays fast"""
+    db.DB_PATH = os.path.join(workdir, "bench.db")
+    db.init_db()
+    conn = sqlite3.connect(db.DB_PATH)
+    rng = random.Random(0)
+    conn.executemany(
+        "INSERT INTO users (username, password, xp, level, wins, losses) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"user{i}", b"x", xp, progression.level_for_xp(xp), rng.randrange(50), rng.randrange(50))
+         for i, xp in enumerate(rng.randrange(60000) for _ in range(POPULATED_USERS))],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _update_user_xp(rng):
+    ops = 300
+    t0 = time.perf_counter()
+    for _ in range(ops):
+        db.update_user_xp_fixed(f"user{rng.randrange(POPULATED_USERS)}", rng.randrange(10, 150), rng.random() < 0.5)
+    return ops, time.perf_counter() - t0
+
+
+def _get_user_stats(rng):
+    ops = 2000
+    t0 = time.perf_counter()
+    for _ in range(ops):
+        db.get_user_stats(f"user{rng.randrange(POPULATED_USERS)}")
+    return ops, time.perf_counter() - t0
+
+
+def _authenticate_user(rng):
+    # One real account hashed at the default bcrypt cost; checkpw dominates
+    if not db.authenticate_user("bench", "bench"):
+        db.register_user("bench", "bench")
+    ops = 3
+    t0 = time.perf_counter()
+    for _ in range(ops):
+        db.authenticate_user("bench", "bench")
+    return ops, time.perf_counter() - t0
+
+
+def _progression(rng):
+    levels = [rng.randrange(1, progression.max_level() + 1) for _ in range(20000)]
+    xps = [rng.randrange(60000) for _ in levels]
+    t0 = time.perf_counter()
+    for level, xp in zip(levels, xps):
+        progression.xp_required_for_level(level)
+        progression.get_level_progress(xp, level)
+    return len(levels), time.perf_counter() - t0
+
+
+def _catalog(rng):
+    catalog = get_catalog()
+    rarities = [r.name for r in catalog.rarities] + [None]
+    levels = [rng.randrange(1, len(catalog) + 1) for _ in range(20000)]
+    picks = [rng.choice(rarities) for _ in levels]
+    t0 = time.perf_counter()
+    for level, rarity in zip(levels, picks):
+        collectible = catalog.for_level(level)
+        catalog.by_id[collectible.id]
+        catalog.unlocked(level, rarity)
+    return len(levels), time.perf_counter() - t0
+
+
+# name -> case(rng) returning (operations, seconds spent on them)
+CASES = {
+    "engine.choose_action.easy": _choose_action("Easy"),
+    "engine.choose_action.medium": _choose_action("Medium"),
+    "engine.choose_action.hard": _choose_action("Hard"),
+    "engine.choose_action.learned": _choose_action("Learned"),
+    "engine.play_round": _play_round,
+    "replay.encode": _replay_encode,
+    "replay.playback": _replay_playback,
+    "db.update_user_xp_fixed": _update_user_xp,
+    "db.get_user_stats": _get_user_stats,
+    "db.authenticate_user": _authenticate_user,
+    "progression.lookups": _progression,
+    "catalog.lookups": _catalog,
+}
+
+
+def run_cases(names, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        _populated_db(workdir)
+        for name in names:
+            CASES[name](random.Random(-1))  # Warm up caches and imports, untimed
+            samples = []
+            for i in range(repeat):
+                random.seed(i)  # The engine draws from the module RNG
+                ops, elapsed = CASES[name](random.Random(i))
+                samples.append(elapsed / ops)
+            results[name] = {
+                "median_us": statistics.median(samples) * 1e6,
+                "min_us": min(samples) * 1e6,
+                "ops": ops,
+                "repeat": repeat,
+            }
+    return results
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """(name, baseline best us, current best us, ratio, regressed) for every case in both runs"""
+    rows = []
+    for name, result in results.items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            continue
+        ratio = result["min_us"] / before["min_us"]
+        rows.append((name, before["min_us"], result["min_us"], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", default="", help="run only cases whose name starts with this")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per case")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a case fails")
+    args = parser.parse_args(argv)
+
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"no baseline at {args.baseline} to compare with. Store one for this machine first with "
+                     f"`python -m benchmarks.run --save-baseline`, or pass --baseline")
+    names = [name for name in CASES if name.startswith(args.only)]
+    report = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "created_at": int(time.time()),
+        "cases": run_cases(names, args.repeat),
+    }
+    for path in [args.output] + ([args.baseline] if args.save_baseline else []):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    baseline = None
+    if not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    rows = {row[0]: row for row in compare(report["cases"], baseline, args.tolerance)} if baseline else {}
+
+    print(f"{'case':<30} {'median':>12} {'best':>12} {'baseline':>12}")
+    for name, result in report["cases"].items():
+        line = f"{name:<30} {result['median_us']:9.2f} us {result['min_us']:9.2f} us"
+        if name in rows:
+            _, before, _, ratio, regressed = rows[name]
+            line += f" {before:9.2f} us  {ratio:5.2f}x{'  REGRESSED' if regressed else ''}"
+        print(line)
+    print(f"Results written to {args.output}")
+    return 1 if any(row[4] for row in rows.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
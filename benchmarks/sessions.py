@@ -0,0 +1,150 @@
+"""Memory benchmark for in-progress battles held in session state.
+
+Each mode runs in a fresh Python process that creates --sessions sessions,
+plays --rounds rounds of a Medium battle in each and keeps them all alive,
+then reports the resident memory added per session. "compact" is the
+BattleState record sessions hold now; "legacy" rebuilds the same battles in
+the layout sessions used before it (Player/LeBron objects with per-instance
+dicts and unbounded histories, a list of log dicts and loose keys).
+
+    python -m benchmarks.sessions
+    python -m benchmarks.sessions --sessions 10000 --rounds 20
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+from benchmarks.startup import _rss_mb
+from lebattle.battle import new_battle, play_round, session_footprint
+from lebattle.game import resolve_round
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ACTIONS = ["attack", "defend", "rest", "special"]
+
+
+def _legacy_session(state, log, damage_taken, damage_dealt, meter_history):
+    """The same battle in the session layout used before BattleState"""
+    player, lebron = state.player, state.lebron
+    legacy_player = SimpleNamespace(
+        name=player.name, max_health=player.max_health, health=player.health, max_stamina=player.max_stamina,
+        stamina=player.stamina, special_meter=player.special_meter, is_defending=player.is_defending,
+        buffs=[], debuffs=[], last_health=getattr(player, "last_health", player.health),
+    )
+    legacy_lebron = SimpleNamespace(
+        name=lebron.name, max_health=lebron.max_health, health=lebron.health, max_stamina=lebron.max_stamina,
+        stamina=lebron.stamina, special_meter=lebron.special_meter, is_defending=lebron.is_defending,
+        buffs=[], debuffs=[], difficulty=lebron.difficulty, special_move_name=lebron.special_move_name,
+        abilities=dict(lebron.abilities), move_patterns=dict(lebron.move_patterns),
+        consecutive_attacks=lebron.consecutive_attacks, consecutive_defends=lebron.consecutive_defends,
+        player_last_hp=lebron.player_last_hp, player_last_stamina=lebron.player_last_stamina,
+        player_pattern_memory=list(lebron.player_pattern_memory), turn_count=lebron.turn_count,
+        damage_dealt_history=damage_dealt, damage_taken_history=damage_taken,
+        player_special_meter_history=meter_history, successful_defends=lebron.successful_defends,
+        successful_attacks=lebron.successful_attacks, player_rest_count=lebron.player_rest_count,
+        player_defend_count=lebron.player_defend_count, phase=lebron.phase,
+        adaptive_strategy=dict(lebron.adaptive_strategy),
+    )
+    return {
+        "page": "LePlay", "logged_in": True, "username": "bench", "game_started": True,
+        "difficulty": state.difficulty, "player": legacy_player, "lebron": legacy_lebron, "turn": 0,
+        "round": state.round, "log": log, "current_player_action": "attack", "action_taken": False,
+        "animation_state": "player_attack", "tutorial_shown": True, "restart_game": False,
+        "xp_already_awarded": False,
+    }
+
+
+def _play(rng, rounds, legacy):
+    state = new_battle("Medium")
+    if not legacy:
+        for _ in range(rounds):
+            if state.is_over():
+                break
+            play_round(state, rng.choice(ACTIONS))
+        return {"page": "LePlay", "logged_in": True, "username": "bench", "difficulty": "Medium",
+                "tutorial_shown": True, "battle": state}
+
+    def entry(message, entry_type):
+        return {"message": message, "type": entry_type, "timestamp": time.strftime("%H:%M:%S")}
+
+    log = [entry("The battle begins! Your turn first.", "system")]
+    damage_taken, damage_dealt, meter_history = [], [], []
+    for _ in range(rounds):
+        if state.is_over():
+            break
+        player_health, lebron_health = state.player.health, state.lebron.health
+        lebron_action = state.lebron.choose_action(state.player)
+        log.append(entry(f"Round {state.round} begins - both fighters prepare their moves!", "system"))
+        for entry_type, message in resolve_round(state.player, rng.choice(ACTIONS), state.lebron, lebron_action):
+            log.append(entry(message, entry_type))
+        state.round += 1
+        # The histories the old LeBron kept grow by one entry per hit
+        if lebron_health > state.lebron.health:
+            damage_taken.append(lebron_health - state.lebron.health)
+        if player_health > state.player.health:
+            damage_dealt.append(player_health - state.player.health)
+        meter_history.append(state.player.special_meter)
+    return _legacy_session(state, log, damage_taken, damage_dealt, meter_history)
+
+
+def child(mode, sessions, rounds):
+    """Measure one mode. Runs inside a fresh interpreter."""
+    rng = random.Random(0)
+    _play(rng, rounds, mode == "legacy")  # Import and warm up before the baseline
+    gc.collect()
+    base = _rss_mb()
+    t0 = time.perf_counter()
+    held = [_play(rng, rounds, mode == "legacy") for _ in range(sessions)]
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    rss_per_session_kb = (_rss_mb() - base) * 1024 / sessions
+    sample = held[:: max(1, sessions // 200)]
+    return {
+        "mode": mode,
+        "sessions": len(held),
+        "rss_per_session_kb": rss_per_session_kb,
+        "footprint_per_session_kb": sum(session_footprint(s) for s in sample) / len(sample) / 1024,
+        "create_s": elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=12, help="rounds played in each battle")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser.add_argument("--child", choices=["legacy", "compact"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(child(args.child, args.sessions, args.rounds)))
+        return
+
+    results = {}
+    for mode in ("legacy", "compact"):
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.sessions", "--child", mode,
+             "--sessions", str(args.sessions), "--rounds", str(args.rounds)],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    legacy, compact = results["legacy"], results["compact"]
+    print(f"{args.sessions} sessions, {args.rounds} rounds each")
+    print(f"  RSS per session        legacy {legacy['rss_per_session_kb']:7.1f} KB   compact"
+          f" {compact['rss_per_session_kb']:6.1f} KB   ({legacy['rss_per_session_kb'] / compact['rss_per_session_kb']:.1f}x less)")
+    print(f"  session_footprint      legacy {legacy['footprint_per_session_kb']:7.1f} KB   compact"
+          f" {compact['footprint_per_session_kb']:6.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
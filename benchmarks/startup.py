@@ -0,0 +1,118 @@
+"""Cold-start benchmark for the Streamlit app.
+
+Each run starts a fresh Python process, imports Streamlit the way the server
+does, then executes the app script once (the login page a new visitor sees)
+and navigates to every other page. It reports the time and resident memory
+for each step so the cost of module-level work shows up on its own.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --script /tmp/old_lebronsim.py --json
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCRIPT = os.path.join(REPO_ROOT, "lebronsim.py")
+PAGES = ["LePlay", "LePASS", "LeCareer", "LeLogout"]
+
+
+def _rss_mb():
+    """Current resident set size of this process in MB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak RSS is the best we can do without /proc (KB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def child(script):
+    """Measure one cold start. Runs inside a fresh interpreter."""
+    result = {"rss_base_mb": _rss_mb()}
+
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    result["streamlit_import_s"] = time.perf_counter() - t0
+    result["rss_streamlit_mb"] = _rss_mb()
+
+    at = AppTest.from_file(script, default_timeout=60)
+    t0 = time.perf_counter()
+    at.run()
+    result["first_run_s"] = time.perf_counter() - t0
+    result["rss_first_run_mb"] = _rss_mb()
+
+    # Later reruns of an already-visited page show the steady-state cost
+    t0 = time.perf_counter()
+    at.run()
+    result["rerun_s"] = time.perf_counter() - t0
+
+    at.session_state.logged_in = True
+    at.session_state.username = "bench"
+    for page in PAGES:
+        at.session_state.page = page
+        t0 = time.perf_counter()
+        at.run()
+        result[f"first_visit_{page}_s"] = time.perf_counter() - t0
+    result["rss_all_pages_mb"] = _rss_mb()
+    result["errors"] = [str(e.value) for e in at.exception]
+    return result
+
+
+def run(script, runs):
+    samples = []
+    for _ in range(runs):
+        # Each child gets its own working directory so it creates a fresh users.db
+        with tempfile.TemporaryDirectory() as workdir:
+            env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup", "--child", "--script", script],
+                cwd=workdir, env=env, capture_output=True, text=True, check=True,
+            )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    keys = [k for k in samples[0] if k != "errors"]
+    summary = {k: statistics.median(s[k] for s in samples) for k in keys}
+    summary["errors"] = sorted({e for s in samples for e in s["errors"]})
+    summary["runs"] = runs
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default=DEFAULT_SCRIPT, help="app script to benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to start")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(child(os.path.abspath(args.script))))
+        return
+
+    summary = run(os.path.abspath(args.script), args.runs)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"Startup benchmark: {args.script} (median of {args.runs} fresh processes)")
+    for key, value in summary.items():
+        if key.endswith("_s"):
+            print(f"  {key:<28} {value * 1000:9.1f} ms")
+        elif key.endswith("_mb"):
+            print(f"  {key:<28} {value:9.1f} MB")
+    if summary["errors"]:
+        print("  errors:", *summary["errors"], sep="\n    ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Stats benchmark: LeStats reads as the number of stored battles grows.
+
+Stores battles drawn from a pool of real ones in --batch sized
+save_replays calls, spread over the last --days days, and after each
+checkpoint in --checkpoints times the queries the LeStats page makes (all-time
+totals, the DAYS-day daily rows and the move counts, for one player and for
+everyone) and the deep dive's raw-row scan. The page queries should stay
+flat while the scan grows with the battles.
+
+    python -m benchmarks.stats
+    python -m benchmarks.stats --checkpoints 10000 100000 500000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from lebattle import db, replay
+from lebattle.battle import new_battle, play_round
+from lebattle.pages.lestats import CHUNK_ROWS, DAYS
+
+ACTIONS = ["attack", "defend", "rest", "special"]
+POOL = 2000
+USERS = 1000
+
+
+def _replay_pool(rng):
+    pool = []
+    for i in range(POOL):
+        difficulty = ("Easy", "Medium", "Hard", "Learned")[i % 4]
+        battle = new_battle(difficulty)
+        while not battle.is_over():
+            play_round(battle, rng.choice(ACTIONS))
+        outcome = ("tie" if battle.player.health == battle.lebron.health == 0
+                   else "win" if battle.player.is_alive() else "loss")
+        pool.append((difficulty, outcome, replay.encode(battle)))
+    return pool
+
+
+def _median_ms(call, repeat=9):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def _page(username, since):
+    db.stats_totals(username)
+    db.stats_daily(username, since)
+    db.stats_actions(username)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checkpoints", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    random.seed(0)
+    pool = _replay_pool(rng)
+    now = time.time()
+    since = time.strftime("%Y-%m-%d", time.gmtime(now - DAYS * 86400))
+    with tempfile.TemporaryDirectory() as workdir:
+        db.DB_PATH = os.path.join(workdir, "bench.db")
+        db.init_db()
+        stored, save_s = 0, 0.0
+        print(f"{'battles':>9}{'save/battle':>14}{'page (player)':>16}{'page (everyone)':>18}{'deep dive':>12}")
+        for checkpoint in sorted(args.checkpoints):
+            while stored < checkpoint:
+                size = min(args.batch, checkpoint - stored)
+                batch = [(f"user{rng.randrange(USERS)}", *rng.choice(pool)) for _ in range(size)]
+                t0 = time.perf_counter()
+                db.save_replays(batch, created_at=now - rng.randrange(args.days) * 86400)
+                save_s += time.perf_counter() - t0
+                stored += size
+            player_ms = _median_ms(lambda: _page("user1", since))
+            everyone_ms = _median_ms(lambda: _page("", since))
+            scan_ms = _median_ms(lambda: sum(len(rows) for rows in db.replay_rows(None, CHUNK_ROWS)), repeat=3)
+            print(f"{stored:>9}{save_s / stored * 1e6:>11.0f} us{player_ms:>13.2f} ms{everyone_ms:>15.2f} ms"
+                  f"{scan_ms:>9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
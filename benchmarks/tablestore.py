@@ -0,0 +1,96 @@
+"""Table store benchmark: memory and warm-up of N server workers holding the shipped tables.
+
+Starts --workers fresh interpreters at once. Each loads every table the
+producers in lebattle.tablestore ship, either by attaching to the shared
+store ("store") or by building its own copy from the sources as a process
+without the store would ("private"), and reads every byte of it. Once all
+are warm, each reports its proportional set size (PSS, shared pages split
+between the processes mapping them) and private memory over what it held
+before loading.
+
+    python -m benchmarks.tablestore
+    python -m benchmarks.tablestore --workers 16
+"""
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _memory_kb():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {"pss": fields["Pss"], "private": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def child(mode):
+    """One worker; runs inside a fresh interpreter"""
+    import numpy as np
+    from lebattle import tablestore
+    for module in tablestore.PRODUCERS:
+        importlib.import_module(module)
+    before = _memory_kb()
+
+    t0 = time.perf_counter()
+    if mode == "store":
+        tables = tablestore.attach().tables
+    else:
+        tables = {}
+        for module in tablestore.PRODUCERS:
+            tables.update(importlib.import_module(module).store_tables()[1])
+    checksum = sum(int(array.view(np.uint8).sum()) for array in tables.values())  # Every page read
+    print(json.dumps({"warm_s": time.perf_counter() - t0, "checksum": checksum}), flush=True)
+
+    sys.stdin.readline()  # Wait until every worker is warm, so the shared pages are counted across all
+    after = _memory_kb()
+    print(json.dumps({key: after[key] - before[key] for key in after}), flush=True)
+
+
+def run(mode, workers):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    procs = [subprocess.Popen([sys.executable, "-m", "benchmarks.tablestore", "--child", mode], env=env, cwd=REPO_ROOT,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True) for _ in range(workers)]
+    warm = [json.loads(proc.stdout.readline()) for proc in procs]
+    for proc in procs:
+        proc.stdin.write("\n")
+        proc.stdin.flush()
+    memory = [json.loads(proc.stdout.readline()) for proc in procs]
+    for proc in procs:
+        proc.wait()
+    return {
+        "warm_ms": statistics.median(w["warm_s"] for w in warm) * 1000,
+        "pss_mb": sum(m["pss"] for m in memory) / 1024,
+        "private_mb": sum(m["private"] for m in memory) / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--child", choices=["store", "private"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return child(args.child)
+
+    from lebattle import tablestore
+    store = tablestore.attach()  # Built here if missing, so no worker pays for the build
+    print(f"{args.workers} workers, {store.nbytes() / 1024:.0f} KB of tables (store version {store.version})")
+    print(f"{'mode':<10}{'warm-up (median)':>18}{'PSS (all workers)':>20}{'private (all)':>16}")
+    for mode in ("private", "store"):
+        result = run(mode, args.workers)
+        print(f"{mode:<10}{result['warm_ms']:>15.1f} ms{result['pss_mb']:>17.2f} MB{result['private_mb']:>13.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
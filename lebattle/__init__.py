@@ -0,0 +1 @@
+"""LeBron Boss Battle application package."""
@@ -0,0 +1,229 @@
+"""Offline tuning of LeBron's AI weights with CMA-ES.
+
+LeBron's base move weights and the multipliers choose_action applies to them
+live in an AI weights config (lebattle/data/ai_weights.json, see
+game.load_ai_weights). This searches those values, per difficulty, for the
+ones that bring the player's win rate against a panel of player policies
+(lebattle.tournament specs) to a target.
+
+The search runs in log space around the starting config: a candidate x
+means value * exp(x) for every weight that difficulty's choose_action reads,
+so x = 0 is the current AI. A candidate's loss is
+
+    (mean win rate over the panel - target) ** 2 + REGULARIZATION * mean(x ** 2)
+
+where the second term keeps the AI's character unless moving it pays off.
+Every candidate of a generation plays the same seeded battles (common random
+numbers), so candidates are ranked on the same luck, and battles are spread
+over a process pool. Seeds change every generation so the AI cannot overfit
+one set of battles.
+
+The tuned difficulties are written, with the untouched ones, as a config
+the game loads with LEBATTLE_AI_WEIGHTS:
+
+    python -m lebattle.aitune --difficulty Hard --target 0.2
+    python -m lebattle.aitune --generations 40 --games 200 --out ai_weights.tuned.json
+    LEBATTLE_AI_WEIGHTS=ai_weights.tuned.json streamlit run lebronsim.py
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from lebattle.game import DEFAULT_AI_WEIGHTS, LeBron, resolve_round
+from lebattle.tournament import MAX_ROUNDS, make_contender
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+TARGETS = {"Easy": 0.7, "Medium": 0.4, "Hard": 0.15}  # Player win rate over the panel
+PANEL = ("random", "skilled:0.5", "lebron:Hard")
+MOVES = ("attack", "defend", "rest", "special")
+REGULARIZATION = 0.002
+
+# Multipliers choose_action only reads on Medium and Hard, and only on Hard
+_MEDIUM_UP = ("vs_aggressive_defend", "vs_defensive_attack", "vs_resourceful_attack", "vs_resourceful_rest",
+              "predicted_attack_defend", "predicted_defend_rest", "predicted_defend_attack",
+              "predicted_special_defend", "predicted_rest_attack")
+_HARD_ONLY = ("player_special_ready_defend", "heavy_damage_defend", "player_low_health_attack",
+              "player_low_health_special", "player_low_stamina_attack", "player_turtling_rest",
+              "player_turtling_attack", "near_special_defend")
+
+
+def tunable(difficulty, config):
+    """Names of the weights choose_action reads at this difficulty"""
+    entry = config[difficulty]
+    skipped = set(_HARD_ONLY if difficulty != "Hard" else ()) | set(_MEDIUM_UP if difficulty == "Easy" else ())
+    return list(entry["moves"]) + [name for name in entry["multipliers"] if name not in skipped]
+
+
+def candidate_weights(difficulty, config, names, x):
+    """The flat weights dict LeBron.move_patterns takes, for a point of the search"""
+    entry = config[difficulty]
+    weights = {**entry["moves"], **entry["multipliers"]}
+    for name, step in zip(names, x):
+        weights[name] = weights[name] * math.exp(step)
+        if name.endswith("_chance"):
+            weights[name] = min(weights[name], 1.0)
+    return weights
+
+
+def play_battle(policy, difficulty, weights, seed):
+    """1 if the player policy beats LeBron with these weights, else 0"""
+    random.seed(seed)
+    player = make_contender(policy)
+    lebron = LeBron(difficulty)
+    lebron.move_patterns = weights
+    for _ in range(MAX_ROUNDS):
+        resolve_round(player, player.choose_action(lebron), lebron, lebron.choose_action(player))
+        if not (player.is_alive() and lebron.is_alive()):
+            break
+    return int(player.is_alive() and not lebron.is_alive())
+
+
+def _play_task(task):
+    index, policy, difficulty, weights, seeds = task
+    return index, policy, sum(play_battle(policy, difficulty, weights, seed) for seed in seeds)
+
+
+def evaluate(pool, difficulty, candidates, panel, seeds, chunk=25):
+    """(candidates, panel) array of player win rates, every candidate on the same seeds"""
+    tasks = [(i, policy, difficulty, weights, seeds[start:start + chunk])
+             for i, weights in enumerate(candidates) for policy in panel
+             for start in range(0, len(seeds), chunk)]
+    wins = np.zeros((len(candidates), len(panel)))
+    for index, policy, won in pool.imap_unordered(_play_task, tasks):
+        wins[index, panel.index(policy)] += won
+    return wins / len(seeds)
+
+
+class CMAES:
+    """Covariance matrix adaptation evolution strategy (Hansen's tutorial defaults), minimizing"""
+
+    def __init__(self, dim, sigma=0.3, population=None, seed=0):
+        self.dim = n = dim
+        self.sigma = sigma
+        self.population = population or 4 + int(3 * math.log(n))
+        self.parents = self.population // 2
+        weights = math.log(self.parents + 0.5) - np.log(np.arange(1, self.parents + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1 / np.sum(self.weights ** 2)
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+        self.mean = np.zeros(n)
+        self.cov = np.eye(n)
+        self.basis, self.scales = np.eye(n), np.ones(n)
+        self.pc, self.ps = np.zeros(n), np.zeros(n)
+        self.generation = 0
+        self.rng = np.random.default_rng(seed)
+        self._steps = None
+
+    def ask(self):
+        self._steps = self.rng.standard_normal((self.population, self.dim)) @ (self.basis * self.scales).T
+        return self.mean + self.sigma * self._steps
+
+    def tell(self, losses):
+        best = self._steps[np.argsort(losses)[:self.parents]]
+        step = self.weights @ best
+        self.mean = self.mean + self.sigma * step
+        inv_sqrt = self.basis @ np.diag(1 / self.scales) @ self.basis.T
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * inv_sqrt @ step
+        self.generation += 1
+        hsig = (np.linalg.norm(self.ps) / math.sqrt(1 - (1 - self.cs) ** (2 * self.generation)) / self.chi_n
+                < 1.4 + 2 / (self.dim + 1))
+        self.pc = (1 - self.cc) * self.pc + hsig * math.sqrt(self.cc * (2 - self.cc) * self.mueff) * step
+        self.cov = ((1 - self.c1 - self.cmu) * self.cov
+                    + self.c1 * (np.outer(self.pc, self.pc) + (1 - hsig) * self.cc * (2 - self.cc) * self.cov)
+                    + self.cmu * (best.T * self.weights) @ best)
+        self.sigma *= math.exp(self.cs / self.damps * (np.linalg.norm(self.ps) / self.chi_n - 1))
+        self.cov = np.triu(self.cov) + np.triu(self.cov, 1).T
+        eigenvalues, self.basis = np.linalg.eigh(self.cov)
+        self.scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+
+def _seeds(seed, generation, games):
+    return [zlib.crc32(f"{seed}|{generation}|{game}".encode()) for game in range(games)]
+
+
+def tune(pool, difficulty, config, target, panel=PANEL, generations=30, games=100, sigma=0.3, seed=0,
+         progress=print):
+    """The tuned weights for one difficulty, as a {"moves": ..., "multipliers": ...} entry"""
+    names = tunable(difficulty, config)
+    search = CMAES(len(names), sigma, seed=seed)
+    for generation in range(generations):
+        xs = search.ask()
+        rates = evaluate(pool, difficulty, [candidate_weights(difficulty, config, names, x) for x in xs], panel,
+                         _seeds(seed, generation, games))
+        losses = (rates.mean(axis=1) - target) ** 2 + REGULARIZATION * np.mean(xs ** 2, axis=1)
+        search.tell(losses)
+        best = int(np.argmin(losses))
+        progress(f"  {difficulty} generation {generation + 1:3}: best loss {losses[best]:.5f}, "
+                 f"win rate {rates[best].mean():.1%} (target {target:.0%}), sigma {search.sigma:.3f}")
+    weights = candidate_weights(difficulty, config, names, search.mean)
+    return {
+        "moves": {move: round(weights[move], 4) for move in MOVES},
+        "multipliers": {name: round(weights[name], 4) for name in config[difficulty]["multipliers"]},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune LeBron's AI weights toward target player win rates")
+    parser.add_argument("--difficulty", nargs="+", choices=DIFFICULTIES, default=list(DIFFICULTIES))
+    parser.add_argument("--target", type=float, action="append",
+                        help="player win rate per --difficulty, in order (default: "
+                             + ", ".join(f"{d} {t}" for d, t in TARGETS.items()) + ")")
+    parser.add_argument("--panel", nargs="+", default=list(PANEL), help="player policy specs")
+    parser.add_argument("--base", default=os.environ.get("LEBATTLE_AI_WEIGHTS", DEFAULT_AI_WEIGHTS),
+                        help="config to start from")
+    parser.add_argument("--out", default="ai_weights.tuned.json")
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--games", type=int, default=100, help="battles per candidate and panel policy")
+    parser.add_argument("--check-games", type=int, default=2000, help="battles per policy in the final check")
+    parser.add_argument("--sigma", type=float, default=0.3, help="initial step size, in log space")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    targets = args.target or [TARGETS[difficulty] for difficulty in args.difficulty]
+    if len(targets) != len(args.difficulty):
+        parser.error("give one --target per --difficulty")
+    for spec in args.panel:
+        make_contender(spec)
+    with open(args.base) as f:
+        config = json.load(f)
+    tuned = dict(config)
+
+    with multiprocessing.Pool(args.workers) as pool:
+        for difficulty, target in zip(args.difficulty, targets):
+            t0 = time.perf_counter()
+            tuned[difficulty] = tune(pool, difficulty, config, target, args.panel, args.generations, args.games,
+                                     args.sigma, args.seed)
+            check_seeds = _seeds(args.seed, "check", args.check_games)
+            entries = [config[difficulty], tuned[difficulty]]
+            rates = evaluate(pool, difficulty, [{**e["moves"], **e["multipliers"]} for e in entries],
+                             args.panel, check_seeds)
+            print(f"{difficulty}: tuned in {time.perf_counter() - t0:.0f}s; player win rate on "
+                  f"{args.check_games} fresh battles per policy, before -> after (target {target:.0%}):")
+            for policy, before, after in zip(args.panel, rates[0], rates[1]):
+                print(f"  {policy:<14} {before:6.1%} -> {after:6.1%}")
+            print(f"  {'panel mean':<14} {rates[0].mean():6.1%} -> {rates[1].mean():6.1%}")
+
+    with open(args.out, "w") as f:
+        json.dump(tuned, f, indent=4)
+        f.write("\n")
+    print(f"Wrote {args.out}; load it with LEBATTLE_AI_WEIGHTS={args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
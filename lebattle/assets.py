@@ -0,0 +1,233 @@
+"""Local mirror of every image the app shows.
+
+lebattle/data/assets.json names each UI image (backgrounds, page banners,
+avatars, career photos) and the collectibles catalog adds one entry per
+collectible. `python -m lebattle.assets build` copies every one of them into
+static/assets/ under a content-hash file name, so the URLs never change for
+a given image and browsers can cache them for good, and writes
+static/assets/manifest.json mapping asset names to those files. Streamlit
+serves the store at app/static/assets/.
+
+    python -m lebattle.assets build --seed ~/lebron-seed --offline
+    python -m lebattle.assets check
+
+Sources are looked up in the seed directory (laid out like the `asset`
+paths), then in the existing store, and only then downloaded. Pages resolve
+images by name through the manifest and fall back to the original URL for
+anything not mirrored yet; `check` reports those.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.request
+from collections import namedtuple
+from functools import lru_cache
+
+from lebattle.collectibles import get_catalog
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.environ.get("LEBATTLE_STATIC_DIR", os.path.join(REPO_ROOT, "static"))
+SOURCES_PATH = os.path.join(os.path.dirname(__file__), "data", "assets.json")
+STORE_SUBDIR = "assets"
+MANIFEST_NAME = "manifest.json"
+
+AssetSource = namedtuple("AssetSource", ["name", "url", "asset"])
+
+# File signatures, so stored files get an extension matching their content
+_SIGNATURES = [
+    (b"\x89PNG", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF8", ".gif"),
+]
+
+
+def _sniff_extension(data, fallback):
+    for signature, extension in _SIGNATURES:
+        if data.startswith(signature):
+            return extension
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    return fallback
+
+
+@lru_cache(maxsize=None)
+def _ui_sources():
+    with open(SOURCES_PATH) as f:
+        return {a["name"]: AssetSource(a["name"], a["url"], a["asset"]) for a in json.load(f)["assets"]}
+
+
+@lru_cache(maxsize=None)
+def get_sources():
+    """Every asset the app references, by name: the UI images plus all collectibles"""
+    return {**_ui_sources(), **{c.id: AssetSource(c.id, c.url, c.asset) for c in get_catalog().collectibles}}
+
+
+def _source_url(name):
+    # UI images don't need the collectibles catalog (and the table store behind it)
+    source = _ui_sources().get(name)
+    return source.url if source else get_sources()[name].url
+
+
+@lru_cache(maxsize=16)
+def _load_json(path, mtime):
+    with open(path) as f:
+        return json.load(f)
+
+
+def cached_json(path):
+    """Parse a JSON file, reusing the parsed copy until the file changes. None if missing."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _load_json(path, mtime)
+
+
+def store_dir():
+    return os.path.join(STATIC_DIR, STORE_SUBDIR)
+
+
+def get_manifest():
+    """The built manifest, or None if the store has never been built"""
+    return cached_json(os.path.join(store_dir(), MANIFEST_NAME))
+
+
+def _stored_entry(name):
+    manifest = get_manifest()
+    return manifest["assets"].get(name) if manifest else None
+
+
+def fetch(source, seed_dir=None, offline=False):
+    """Return the bytes of an asset, or None if it can't be found.
+
+    Checks the seed directory, then the store (if the manifest entry is for
+    the same URL), and downloads only as a last resort.
+    """
+    if seed_dir:
+        seed_path = os.path.join(seed_dir, source.asset)
+        if os.path.exists(seed_path):
+            with open(seed_path, "rb") as f:
+                return f.read()
+    entry = _stored_entry(source.name)
+    if entry and entry["url"] == source.url:
+        stored_path = os.path.join(store_dir(), entry["file"])
+        if os.path.exists(stored_path):
+            with open(stored_path, "rb") as f:
+                return f.read()
+    if offline:
+        return None
+
+    request = urllib.request.Request(source.url, headers={"User-Agent": "Mozilla/5.0 (LeBattle asset mirror)"})
+    try:
+        with urllib.request.urlopen(request, timeout=20) as response:
+            return response.read()
+    except OSError:
+        return None
+
+
+def read(name):
+    """Bytes of a mirrored asset, or None if it is not in the store"""
+    entry = _stored_entry(name)
+    if not entry:
+        return None
+    try:
+        with open(os.path.join(store_dir(), entry["file"]), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def build(seed_dir=None, offline=False, prune=False):
+    """Mirror every source into the store and write the manifest. Returns the manifest."""
+    out_dir = store_dir()
+    os.makedirs(out_dir, exist_ok=True)
+    entries, missing = {}, []
+    for source in get_sources().values():
+        data = fetch(source, seed_dir, offline)
+        if data is None:
+            missing.append(source.name)
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        file_name = digest[:16] + _sniff_extension(data, os.path.splitext(source.asset)[1])
+        path = os.path.join(out_dir, file_name)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(data)
+        entries[source.name] = {"file": file_name, "sha256": digest, "bytes": len(data), "url": source.url}
+
+    version = hashlib.sha256(json.dumps(entries, sort_keys=True).encode()).hexdigest()[:12]
+    manifest = {"version": version, "built_at": int(time.time()), "assets": entries, "missing": missing}
+    # Write the manifest last, atomically, so readers never see it point at missing files
+    tmp_path = os.path.join(out_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+
+    if prune:
+        keep = {entry["file"] for entry in entries.values()} | {MANIFEST_NAME}
+        for file_name in os.listdir(out_dir):
+            if file_name not in keep:
+                os.remove(os.path.join(out_dir, file_name))
+    return manifest
+
+
+def health():
+    """List (name, problem) for every referenced asset that pages can't serve locally"""
+    manifest = get_manifest()
+    if manifest is None:
+        return [(name, "store not built") for name in get_sources()]
+    problems = []
+    for name, source in get_sources().items():
+        entry = manifest["assets"].get(name)
+        if entry is None:
+            problems.append((name, "not mirrored"))
+        elif entry["url"] != source.url:
+            problems.append((name, "source URL changed since build"))
+        elif not os.path.exists(os.path.join(store_dir(), entry["file"])):
+            problems.append((name, "file missing from store"))
+    return problems
+
+
+def asset_url(name):
+    """URL for an asset in HTML or CSS: the local store if mirrored, else the original"""
+    entry = _stored_entry(name)
+    if entry:
+        return f"app/static/{STORE_SUBDIR}/{entry['file']}"
+    return _source_url(name)
+
+
+def asset_image(name):
+    """What to pass to st.image for an asset: the local file if mirrored, else the original URL"""
+    entry = _stored_entry(name)
+    if entry:
+        return os.path.join(store_dir(), entry["file"])
+    return _source_url(name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mirror the app's images into the local asset store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="mirror every asset and write the manifest")
+    build_parser.add_argument("--seed", help="directory of seed images laid out like the asset paths")
+    build_parser.add_argument("--offline", action="store_true", help="never download, use only the seed directory and store")
+    build_parser.add_argument("--prune", action="store_true", help="delete stored files the new manifest doesn't use")
+    commands.add_parser("check", help="report assets pages can't serve locally")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest = build(args.seed, args.offline, args.prune)
+        print(f"Manifest {manifest['version']}: {len(manifest['assets'])} assets mirrored")
+    problems = health()
+    for name, problem in problems:
+        print(f"  {name}: {problem}")
+    if args.command == "check":
+        print(f"{len(get_sources()) - len(problems)}/{len(get_sources())} assets served locally")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
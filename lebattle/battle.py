@@ -0,0 +1,218 @@
+"""The in-progress battle kept for each session.
+
+A session holds one BattleState instead of loose player/LeBron/log keys. The
+record has fixed slots and a bounded log, so an idle or long battle costs the
+same few KB as a fresh one. `footprint` measures what a session holds, and
+`pack`/`unpack` turn a battle into a few hundred bytes for storage.
+"""
+
+import json
+import random
+import struct
+import sys
+import time
+from collections import deque
+
+from lebattle.game import LeBron, Player, resolve_round
+from lebattle.metrics import timer
+
+STATE_VERSION = 2
+LOG_LIMIT = 16  # Newest entries kept for the battle log, about four rounds
+PLAYER_HEALTH = 150
+PLAYER_STAMINA = 100
+
+
+class BattleState:
+    __slots__ = ("version", "difficulty", "round", "player", "lebron", "log", "results", "seed", "actions")
+
+    def __init__(self, difficulty, player, lebron, round=1, log=(), results=None, seed=0, actions=b""):
+        self.version = STATE_VERSION
+        self.difficulty = difficulty
+        self.round = round
+        self.player = player
+        self.lebron = lebron
+        # One "type|HH:MM:SS|message" string per entry, a single object each;
+        # type is "system", "player" or "lebron"
+        self.log = list(log)[-LOG_LIMIT:]
+        # Set once the battle's XP is awarded so reruns don't award it again
+        self.results = results
+        # Each round's rolls come from round_rng(seed, round); with one byte of
+        # moves per round (see encode_moves) that is enough to replay the battle
+        self.seed = seed
+        self.actions = bytearray(actions)
+
+    def add_log(self, message, entry_type="system"):
+        self.log.append(f"{entry_type}|{time.strftime('%H:%M:%S')}|{message}")
+        if len(self.log) > LOG_LIMIT:
+            del self.log[0]
+
+    def log_entries(self):
+        """The log as [type, time, message] triples, newest first"""
+        return [entry.split("|", 2) for entry in reversed(self.log)]
+
+    def is_over(self):
+        return not (self.player.is_alive() and self.lebron.is_alive())
+
+
+def new_battle(difficulty):
+    """A fresh battle against LeBron at this difficulty"""
+    state = BattleState(difficulty, Player("You", PLAYER_HEALTH, PLAYER_STAMINA), LeBron(difficulty),
+                        seed=random.getrandbits(32))
+    state.add_log("The battle begins! Your turn first.", "system")
+    return state
+
+
+def play_round(state, player_action):
+    """Resolve one round: LeBron picks his move, both moves apply, the round advances"""
+    with timer("engine_seconds", call="choose_action"):
+        lebron_action = state.lebron.choose_action(state.player)
+    state.add_log(f"Round {state.round} begins - both fighters prepare their moves!", "system")
+    rng = round_rng(state.seed, state.round)
+    for entry_type, message in resolve_round(state.player, player_action, state.lebron, lebron_action, rng):
+        state.add_log(message, entry_type)
+    state.actions.append(encode_moves(player_action, lebron_action))
+    state.round += 1
+    return lebron_action
+
+
+def round_rng(seed, round):
+    """The generator for one round's rolls. Seeding per round keeps a parked battle down to its seed."""
+    return random.Random(seed << 16 | round)
+
+
+def encode_moves(player_action, lebron_action):
+    """Both sides' moves for a round as one small int: player << 2 | LeBron"""
+    return MOVES.index(player_action) << 2 | MOVES.index(lebron_action)
+
+
+def decode_moves(code):
+    return MOVES[code >> 2], MOVES[code & 3]
+
+
+# Binary layout of a packed battle (little-endian). Bump STATE_VERSION when it changes.
+_HEADER = struct.Struct("<BBHI")  # version, difficulty, round, seed
+_FIGHTER = struct.Struct("<hhhhh?")  # health, max_health, stamina, max_stamina, special_meter, is_defending
+_LEBRON_AI = struct.Struct("<B11i5i")  # phase, counters (_LEBRON_COUNTERS), adaptive strategy scores
+_LEBRON_COUNTERS = ("consecutive_attacks", "consecutive_defends", "player_last_hp", "player_last_stamina",
+                    "turn_count", "damage_dealt_total", "damage_dealt_count", "successful_defends",
+                    "successful_attacks", "player_rest_count", "player_defend_count")
+_STRATEGIES = ("aggressive", "defensive", "resourceful", "pattern_based", "special_focused")
+DIFFICULTIES = ("Easy", "Medium", "Hard", "Learned")  # Packed states and replays store an index into this
+_PHASES = ("early", "mid", "late")
+MOVES = ("attack", "defend", "rest", "special")  # In the order of their 2-bit codes (encode_moves)
+
+
+def _pack_fighter(fighter):
+    return _FIGHTER.pack(fighter.health, fighter.max_health, fighter.stamina, fighter.max_stamina,
+                         fighter.special_meter, fighter.is_defending)
+
+
+def _unpack_fighter(fighter, data, offset):
+    (fighter.health, fighter.max_health, fighter.stamina, fighter.max_stamina,
+     fighter.special_meter, fighter.is_defending) = _FIGHTER.unpack_from(data, offset)
+    return offset + _FIGHTER.size
+
+
+def _pack_text(text):
+    data = text.encode()
+    return struct.pack("<H", len(data)) + data
+
+
+def _unpack_text(data, offset):
+    (length,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    return data[offset:offset + length].decode(), offset + length
+
+
+def pack(state):
+    """Serialize a battle to bytes"""
+    player, lebron = state.player, state.lebron
+    parts = [
+        _HEADER.pack(STATE_VERSION, DIFFICULTIES.index(state.difficulty), state.round, state.seed),
+        _pack_text(player.name),
+        _pack_fighter(player),
+        struct.pack("<h", getattr(player, "last_health", -1)),  # -1: not set yet
+        _pack_fighter(lebron),
+        _LEBRON_AI.pack(_PHASES.index(lebron.phase), *(getattr(lebron, name) for name in _LEBRON_COUNTERS),
+                        *(lebron.adaptive_strategy[name] for name in _STRATEGIES)),
+        bytes([len(lebron.player_pattern_memory)]),
+        bytes(MOVES.index(move) for move in lebron.player_pattern_memory),
+        struct.pack(f"<B{len(lebron.damage_taken_history)}H", len(lebron.damage_taken_history),
+                    *lebron.damage_taken_history),
+        bytes([len(state.log)]),
+        *(_pack_text(entry) for entry in state.log),
+        _pack_text(json.dumps(state.results) if state.results is not None else ""),
+        struct.pack("<H", len(state.actions)),
+        bytes(state.actions),
+    ]
+    return b"".join(parts)
+
+
+def unpack(data):
+    """Rebuild a battle from pack() output. Raises ValueError for other layout versions."""
+    version, difficulty, round, seed = _HEADER.unpack_from(data)
+    if version != STATE_VERSION:
+        raise ValueError(f"Packed battle has version {version}, expected {STATE_VERSION}")
+    offset = _HEADER.size
+    name, offset = _unpack_text(data, offset)
+    player = Player(name, PLAYER_HEALTH, PLAYER_STAMINA)
+    offset = _unpack_fighter(player, data, offset)
+    (last_health,) = struct.unpack_from("<h", data, offset)
+    offset += 2
+    if last_health >= 0:
+        player.last_health = last_health
+
+    lebron = LeBron(DIFFICULTIES[difficulty])
+    offset = _unpack_fighter(lebron, data, offset)
+    ai = _LEBRON_AI.unpack_from(data, offset)
+    offset += _LEBRON_AI.size
+    lebron.phase = _PHASES[ai[0]]
+    for name, value in zip(_LEBRON_COUNTERS, ai[1:12]):
+        setattr(lebron, name, value)
+    lebron.adaptive_strategy = dict(zip(_STRATEGIES, ai[12:]))
+    count = data[offset]
+    lebron.player_pattern_memory = [MOVES[code] for code in data[offset + 1:offset + 1 + count]]
+    offset += 1 + count
+    count = data[offset]
+    lebron.damage_taken_history = struct.unpack_from(f"<{count}H", data, offset + 1)
+    offset += 1 + 2 * count
+
+    count = data[offset]
+    offset += 1
+    log = []
+    for _ in range(count):
+        entry, offset = _unpack_text(data, offset)
+        log.append(entry)
+    results, offset = _unpack_text(data, offset)
+    (count,) = struct.unpack_from("<H", data, offset)
+    actions = data[offset + 2:offset + 2 + count]
+    return BattleState(lebron.difficulty, player, lebron, round, log, json.loads(results) if results else None,
+                       seed, actions)
+
+
+def footprint(obj, seen=None):
+    """Approximate bytes held by an object and everything it references"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(footprint(k, seen) + footprint(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(footprint(item, seen) for item in obj)
+    elif not isinstance(obj, type):  # Classes are shared, not per session
+        for cls in type(obj).__mro__:
+            for slot in cls.__dict__.get("__slots__", ()):
+                if hasattr(obj, slot):
+                    size += footprint(getattr(obj, slot), seen)
+        if hasattr(obj, "__dict__"):
+            size += footprint(vars(obj), seen)
+    return size
+
+
+def session_footprint(session_state):
+    """Approximate bytes held by one session's state"""
+    seen = set()
+    return sum(footprint(key, seen) + footprint(session_state[key], seen) for key in list(session_state.keys()))
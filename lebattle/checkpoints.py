@@ -0,0 +1,102 @@
+"""Write-behind checkpoints of each user's unfinished battle.
+
+Every round's resulting battle is packed (see lebattle.battle.pack) and queued
+in memory. A background thread writes the queue to the active_battles table
+every LEBATTLE_CHECKPOINT_MS milliseconds in a single transaction, so a battle
+is written at most once per interval however fast rounds are played, and the
+page never waits on SQLite. A deploy or crash loses at most one interval of
+play; on the next login the battle resumes from its last checkpoint.
+
+A finished battle's checkpoint is not left to the queue: it is deleted in
+the same transaction that awards the battle's XP (see settle), so a crash
+right after the award can't resume the battle and award it twice.
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from lebattle import db
+from lebattle.battle import pack, unpack
+
+FLUSH_INTERVAL = int(os.environ.get("LEBATTLE_CHECKPOINT_MS", 500)) / 1000
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpointer:
+    def __init__(self, interval=FLUSH_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Held while a flush writes, and while a battle is settled
+        self._pending = {}  # username -> packed battle, or None to delete the checkpoint
+        self._thread = None
+        self.writes = 0
+        self.coalesced = 0
+
+    def checkpoint(self, username, battle):
+        """Queue a user's battle for writing. Finished or cleared battles remove the checkpoint."""
+        state = pack(battle) if battle is not None and battle.results is None else None
+        with self._lock:
+            if username in self._pending:
+                self.coalesced += 1
+            self._pending[username] = state
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="lebattle-checkpoints", daemon=True)
+                self._thread.start()
+
+    def load(self, username):
+        """The user's last checkpointed battle, including one not written yet. None if none."""
+        with self._lock:
+            queued = username in self._pending
+            state = self._pending.get(username)
+        if not queued:
+            state = db.load_active_battle(username)
+        if state is None:
+            return None
+        try:
+            return unpack(state)
+        except ValueError:
+            # Written by an older layout; the battle can't be resumed
+            return None
+
+    @contextmanager
+    def settle(self, username):
+        """Around the transaction that awards a finished battle's XP and deletes the user's checkpoint
+        (db.record_battle): drops their queued checkpoint and holds off flushes, so no write-behind
+        copy of the battle from before the award can land after it and be resumed and awarded again."""
+        with self._write_lock:
+            with self._lock:
+                self._pending.pop(username, None)
+            yield
+
+    def flush(self):
+        """Write every queued checkpoint now"""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            try:
+                db.save_active_battles(pending.items())
+            except sqlite3.Error:
+                logger.exception("Writing %d battle checkpoints failed, retrying next interval", len(pending))
+                with self._lock:
+                    # Keep anything queued since; it is newer than what failed
+                    for username, state in pending.items():
+                        self._pending.setdefault(username, state)
+                return
+            self.writes += len(pending)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+checkpointer = Checkpointer()
+atexit.register(checkpointer.flush)
@@ -0,0 +1,105 @@
+"""Post-battle coach: how each move the player could have made would have gone.
+
+A replay (lebattle.replay) is enough to rebuild the battle as it stood at the
+start of every round, LeBron's memory of the player included: apart from the
+move-streak counters, what choose_action remembers depends only on the
+fighters, so calling it, fixing up the streaks and applying the recorded
+moves walks the battle forward exactly.
+
+From each of those snapshots, every move the player could legally have made
+is played out ROLLOUTS times to the end against LeBron's own policy, with the
+player continuing on uniformly random legal moves. A move's estimate is the
+share of its rollouts the player won, a tie counting half. Rollout i draws
+from the same seed for every move, so the moves are compared on the same
+luck and their differences are less noisy than the estimates themselves.
+
+Rounds are analysed in a background process pool, one task per round, so the
+LePlay page can show each round as soon as its task finishes.
+"""
+
+import multiprocessing
+import os
+import random
+import threading
+
+from lebattle.battle import BattleState, decode_moves, pack, round_rng, unpack
+from lebattle.game import LeBron, Player, legal_moves, resolve_round
+from lebattle.replay import moves, read_header
+
+ROLLOUTS = int(os.environ.get("LEBATTLE_COACH_ROLLOUTS", 96))
+WORKERS = int(os.environ.get("LEBATTLE_COACH_WORKERS", os.cpu_count() or 1))
+MAX_ROUNDS = 100  # A rollout still going after this many rounds counts as a tie
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def round_states(data):
+    """(round, player action, packed battle before the round) for every round of a replay"""
+    header, _ = read_header(data)
+    player = Player("You", header["player_health"], header["player_stamina"])
+    lebron = LeBron(header["difficulty"])
+    lebron.max_health = lebron.health = header["lebron_health"]
+    lebron.stamina = header["lebron_stamina"]
+    state = BattleState(header["difficulty"], player, lebron, seed=header["seed"])
+    states = []
+    for round, code in enumerate(moves(data), 1):
+        player_action, lebron_action = decode_moves(code)
+        states.append((round, player_action, pack(state)))
+        attacks, defends = lebron.consecutive_attacks, lebron.consecutive_defends
+        if lebron.choose_action(player) != lebron_action:
+            # Its early returns don't depend on the dice, so both this call and
+            # the real one ran to the end, where the streak counters follow the
+            # move drawn. Redo them for the move actually made.
+            attacks = attacks + 1 if lebron_action == "attack" else 0
+            defends = defends + 1 if lebron_action == "defend" else 0
+            lebron.consecutive_attacks, lebron.consecutive_defends = attacks, defends
+        resolve_round(player, player_action, lebron, lebron_action, round_rng(header["seed"], round))
+        state.actions.append(code)
+        state.round += 1
+    return states
+
+
+def _play_out(state, action):
+    """1, 0.5 or 0 for the player after playing action, then random legal moves, to the end"""
+    player, lebron = state.player, state.lebron
+    for _ in range(MAX_ROUNDS):
+        resolve_round(player, action, lebron, lebron.choose_action(player))
+        if not (player.is_alive() and lebron.is_alive()):
+            return 0.5 if player.is_alive() == lebron.is_alive() else float(player.is_alive())
+        action = random.choice(legal_moves(player))
+    return 0.5
+
+
+def analyze_round(round, packed, rollouts=ROLLOUTS):
+    """(round, {legal move: estimated chance of winning}) for one snapshot"""
+    seed = unpack(packed).seed
+    estimates = {}
+    for action in legal_moves(unpack(packed).player):
+        score = 0.0
+        for i in range(rollouts):
+            random.seed(seed << 24 | round << 12 | i)  # The same luck for every move
+            score += _play_out(unpack(packed), action)
+        estimates[action] = score / rollouts
+    return round, estimates
+
+
+def pool():
+    """The shared worker pool, started on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned rather than forked: the server process runs threads
+            _pool = multiprocessing.get_context("spawn").Pool(WORKERS)
+        return _pool
+
+
+def analyze(data, rollouts=ROLLOUTS):
+    """Start analysing every round of a replay.
+
+    Returns [(round, player action, AsyncResult of analyze_round)], in round
+    order; each result is ready as soon as its own round is done.
+    """
+    workers = pool()
+    return [(round, action, workers.apply_async(analyze_round, (round, packed, rollouts)))
+            for round, action, packed in round_states(data)]
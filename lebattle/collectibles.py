@@ -0,0 +1,130 @@
+"""The LeBron collectibles unlocked through LePASS.
+
+The catalog is read from lebattle/data/collectibles.json into the shared
+table store (lebattle.tablestore), loaded from there once per process and
+indexed by ID, level and rarity so pages never rebuild or scan the list.
+"""
+
+import json
+import os
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+
+from lebattle import tablestore
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(__file__), "data", "collectibles.json")
+
+# asset is the collectible's path inside the local asset store
+Collectible = namedtuple("Collectible", ["id", "level", "url", "rarity", "asset"])
+
+
+class Rarity(namedtuple("Rarity", ["name", "first_level", "last_level"])):
+    __slots__ = ()
+
+    @property
+    def label(self):
+        return f"{self.name} (Levels {self.first_level}-{self.last_level})"
+
+
+class Catalog:
+    def __init__(self, rarities, collectibles):
+        self.rarities = tuple(rarities)
+        self.collectibles = tuple(sorted(collectibles, key=lambda c: c.level))
+        self.by_id = {c.id: c for c in self.collectibles}
+        self.by_level = {c.level: c for c in self.collectibles}
+        self.by_rarity = {r.name: tuple(c for c in self.collectibles if c.rarity == r.name) for r in self.rarities}
+        # Sorted levels per group, for slicing off the unlocked prefix with bisect
+        self._levels = {None: tuple(c.level for c in self.collectibles)}
+        self._levels.update({name: tuple(c.level for c in items) for name, items in self.by_rarity.items()})
+
+    def __len__(self):
+        return len(self.collectibles)
+
+    def for_level(self, level):
+        """The collectible unlocked at a level"""
+        return self.by_level[level]
+
+    def unlocked(self, level, rarity=None):
+        """Collectibles unlocked by a player at this level, in level order"""
+        items = self.collectibles if rarity is None else self.by_rarity[rarity]
+        return items[:bisect_right(self._levels[rarity], level)]
+
+
+def _rarity_for_level(rarities, level):
+    for rarity in rarities:
+        if rarity.first_level <= level <= rarity.last_level:
+            return rarity.name
+    raise ValueError(f"No rarity tier covers level {level}")
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path):
+    with open(path) as f:
+        data = json.load(f)
+    rarities = [Rarity(r["name"], r["first_level"], r["last_level"]) for r in data["rarities"]]
+    collectibles = [
+        Collectible(c["id"], c["level"], c["url"], _rarity_for_level(rarities, c["level"]), c["asset"])
+        for c in data["collectibles"]
+    ]
+    return Catalog(rarities, collectibles)
+
+
+def _utf8(values):
+    import numpy as np
+
+    return np.array([value.encode() for value in values], dtype=bytes)
+
+
+def _stored_catalog(store):
+    names = [name.decode() for name in store["collectibles.rarity_name"].tolist()]
+    rarities = [Rarity(name, first, last) for name, (first, last)
+                in zip(names, store["collectibles.rarity_levels"].tolist())]
+    columns = (store[f"collectibles.{field}"].tolist() for field in ("id", "level", "url", "rarity", "asset"))
+    collectibles = [Collectible(id.decode(), level, url.decode(), names[rarity], asset.decode())
+                    for id, level, url, rarity, asset in zip(*columns)]
+    return Catalog(rarities, collectibles)
+
+
+_stored = (None, None, float("-inf"))  # (store version, its catalog, when the store was last checked)
+
+
+def get_catalog():
+    """The collectibles catalog for this process, loaded on first use"""
+    global _stored
+    version, catalog, checked = _stored
+    now = time.monotonic()
+    if now - checked < tablestore.CHECK_SECONDS:
+        return catalog
+    store = tablestore.attach()
+    if store is None:
+        version, catalog = None, load_catalog(DEFAULT_CATALOG)
+    elif store.version != version:
+        version, catalog = store.version, _stored_catalog(store)
+    _stored = (version, catalog, now)
+    return catalog
+
+
+def store_tables():
+    """(sources, tables) for lebattle.tablestore: one column per collectible field, text as UTF-8 bytes"""
+    import numpy as np  # Only the store build needs it
+
+    catalog = load_catalog.__wrapped__(DEFAULT_CATALOG)  # Uncached: the store is rebuilt when the file changes
+    names = [rarity.name for rarity in catalog.rarities]
+    items = catalog.collectibles
+    return [DEFAULT_CATALOG], {
+        "collectibles.rarity_name": _utf8(names),
+        "collectibles.rarity_levels": np.array([[r.first_level, r.last_level] for r in catalog.rarities],
+                                               dtype=np.int16),
+        "collectibles.id": _utf8(c.id for c in items),
+        "collectibles.level": np.array([c.level for c in items], dtype=np.int16),
+        "collectibles.url": _utf8(c.url for c in items),
+        "collectibles.rarity": np.array([names.index(c.rarity) for c in items], dtype=np.uint8),
+        "collectibles.asset": _utf8(c.asset for c in items),
+    }
+
+
+def get_lebron_image_url(level):
+    """Get the LeBron image URL for a specific level"""
+    return get_catalog().for_level(level).url
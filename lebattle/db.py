@@ -0,0 +1,701 @@
+"""User accounts, XP and battle state, persisted in SQLite."""
+
+import os
+import sqlite3
+import time
+from collections import Counter
+
+import bcrypt
+
+from lebattle.metrics import timed
+from lebattle.battle import MOVES
+from lebattle.game import TIE_XP, calculate_xp_reward
+from lebattle.progression import level_after_xp
+from lebattle.replay import final_health, index_terms, moves, read_header, wildcard_terms
+
+DB_PATH = os.environ.get("LEBATTLE_DB", "users.db")
+STATS_FIELDS = ("battles", "wins", "losses", "ties", "rounds", "win_margin", "loss_margin", "xp")
+_STATS_COLUMNS = ", ".join(f"{field} INTEGER NOT NULL" for field in STATS_FIELDS)
+ROLLUP_FIELDS = STATS_FIELDS + tuple(f"{move}_moves" for move in MOVES)
+_ROLLUP_COLUMNS = ", ".join(f"{field} INTEGER NOT NULL" for field in ROLLUP_FIELDS)
+_REPLAY_COLUMNS = "id, username, difficulty, outcome, rounds, data, created_at"
+
+
+@timed("db_seconds")
+def init_db():
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    # Lets lebattle.retention hand freed pages back a few at a time; only
+    # takes effect on a new database (see enable_incremental_vacuum)
+    c.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password BLOB,
+            xp INTEGER DEFAULT 0,
+            level INTEGER DEFAULT 1,
+            wins INTEGER DEFAULT 0,
+            losses INTEGER DEFAULT 0
+        )
+    ''')
+    # Battles evicted from memory while their session is idle (see lebattle.sessions)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS parked_battles (
+            session_id TEXT PRIMARY KEY,
+            state BLOB NOT NULL,
+            parked_at INTEGER NOT NULL
+        )
+    ''')
+    # Latest checkpoint of each user's unfinished battle (see lebattle.checkpoints)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS active_battles (
+            username TEXT PRIMARY KEY,
+            state BLOB NOT NULL,
+            updated_at INTEGER NOT NULL
+        )
+    ''')
+    # Finished battles in the compact replay format (see lebattle.replay)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS replays (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            rounds INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            created_at INTEGER NOT NULL
+        )
+    ''')
+    c.execute("CREATE INDEX IF NOT EXISTS replays_by_user ON replays (username, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS replays_by_time ON replays (created_at)")
+    # Inverted index over replay move sequences (see lebattle.moveindex): which
+    # battles contain each run of rounds, how many do (also for runs with one
+    # side of some rounds left open), and how often each run of player moves occurs
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS replay_ngrams (
+            gram INTEGER NOT NULL,
+            replay_id INTEGER NOT NULL,
+            PRIMARY KEY (gram, replay_id)
+        ) WITHOUT ROWID
+    ''')
+    c.execute("CREATE TABLE IF NOT EXISTS replay_ngram_battles (gram INTEGER PRIMARY KEY, battles INTEGER NOT NULL)")
+    c.execute("CREATE TABLE IF NOT EXISTS player_ngram_counts (gram INTEGER PRIMARY KEY, count INTEGER NOT NULL)")
+    # Aggregates for the LeStats page, kept up to date as each replay is saved.
+    # username "" holds everyone's battles, so no account may have it (see
+    # register_user). Margins are the winner's HP left.
+    c.execute(f'''
+        CREATE TABLE IF NOT EXISTS stats_daily (
+            username TEXT NOT NULL,
+            day TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            {_STATS_COLUMNS},
+            PRIMARY KEY (username, day, difficulty)
+        ) WITHOUT ROWID
+    ''')
+    c.execute(f'''
+        CREATE TABLE IF NOT EXISTS stats_totals (
+            username TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            {_STATS_COLUMNS},
+            PRIMARY KEY (username, difficulty)
+        ) WITHOUT ROWID
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS stats_actions (
+            username TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            action TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (username, difficulty, action)
+        ) WITHOUT ROWID
+    ''')
+    # Battles whose replays lebattle.retention removed, summed per player, day
+    # and difficulty, with the player's move counts
+    c.execute(f'''
+        CREATE TABLE IF NOT EXISTS battle_rollups (
+            username TEXT NOT NULL,
+            day TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            {_ROLLUP_COLUMNS},
+            PRIMARY KEY (username, day, difficulty)
+        ) WITHOUT ROWID
+    ''')
+    conn.commit()
+    conn.close()
+
+@timed("db_seconds")
+def register_user(username, password):
+    if not username.strip():
+        return False  # Blank names are refused; "" is the stats aggregates' everyone
+    hashed_pw = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    try:
+        c.execute("INSERT INTO users (username, password, xp, level, wins, losses) VALUES (?, ?, 0, 1, 0, 0)", 
+                 (username, hashed_pw))
+        conn.commit()
+        return True
+    except sqlite3.IntegrityError:
+        return False
+    finally:
+        conn.close()
+
+@timed("db_seconds")
+def authenticate_user(username, password):
+    if not username:
+        return False  # Reserved for everyone's stats, even if an older database has such an account
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT password FROM users WHERE username = ?", (username,))
+    result = c.fetchone()
+    conn.close()
+    if result and bcrypt.checkpw(password.encode(), result[0]):
+        return True
+    return False
+
+
+@timed("db_seconds")
+def get_user_stats(username):
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT xp, level, wins, losses FROM users WHERE username = ?", (username,))
+    result = c.fetchone()
+    conn.close()
+    if result:
+        return {
+            "xp": result[0],
+            "level": result[1],
+            "wins": result[2],
+            "losses": result[3]
+        }
+    return {"xp": 0, "level": 1, "wins": 0, "losses": 0}
+
+
+def _award_xp(c, username, xp_earned, won):
+    """Add a finished battle's XP on an open cursor, and a win or loss unless won is None (a tie).
+    Returns whether the user leveled up."""
+    c.execute("SELECT xp, level, wins, losses FROM users WHERE username = ?", (username,))
+    result = c.fetchone()
+    if result is None:
+        if won is not None:
+            # Create new user; no level up for them
+            c.execute("INSERT INTO users (username, xp, level, wins, losses) VALUES (?, ?, ?, ?, ?)",
+                      (username, xp_earned, 1, 1 if won else 0, 0 if won else 1))
+        return False
+
+    current_xp, current_level, wins, losses = result
+    new_xp = current_xp + xp_earned
+    # Check if level up (handles jumps of several levels at once)
+    new_level = level_after_xp(current_level, new_xp)
+    c.execute("UPDATE users SET xp = ?, level = ?, wins = ?, losses = ? WHERE username = ?",
+              (new_xp, new_level, wins + (won is True), losses + (won is False), username))
+    return new_level > current_level
+
+
+@timed("db_seconds")
+def update_user_xp_fixed(username, xp_earned, won=False):
+    """Update user XP, wins, and losses with better error handling"""
+    conn = sqlite3.connect(DB_PATH)
+    leveled_up = _award_xp(conn.cursor(), username, xp_earned, won)
+    conn.commit()
+    conn.close()
+    return leveled_up
+
+
+@timed("db_seconds")
+def award_tie_xp(username, xp_earned):
+    """Add XP for a tied battle without touching wins or losses"""
+    conn = sqlite3.connect(DB_PATH)
+    _award_xp(conn.cursor(), username, xp_earned, None)
+    conn.commit()
+    conn.close()
+
+
+@timed("db_seconds")
+def record_battle(username, difficulty, outcome, data, xp_earned):
+    """Award a finished battle's XP, store its replay and clear the user's
+    battle checkpoint, in one transaction.
+
+    outcome is "win", "loss" or "tie"; a tie adds XP only. If anything fails
+    nothing is written, so the caller can retry without awarding XP twice,
+    and once it commits there is no checkpoint left to resume and award again.
+    Returns whether the user leveled up.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    try:
+        c.execute("BEGIN IMMEDIATE")
+        leveled_up = _award_xp(c, username, xp_earned, None if outcome == "tie" else outcome == "win")
+        _store_replays(c, [(username, difficulty, outcome, data)], int(time.time()))
+        c.execute("DELETE FROM active_battles WHERE username = ?", (username,))
+        conn.commit()
+    finally:
+        conn.close()
+    return leveled_up
+
+
+@timed("db_seconds")
+def park_battles(battles):
+    """Store packed battles for idle sessions, given as (session_id, state) pairs"""
+    now = int(time.time())
+    conn = sqlite3.connect(DB_PATH)
+    conn.executemany("INSERT OR REPLACE INTO parked_battles (session_id, state, parked_at) VALUES (?, ?, ?)",
+                     [(session_id, state, now) for session_id, state in battles])
+    conn.commit()
+    conn.close()
+
+
+@timed("db_seconds")
+def unpark_battle(session_id):
+    """Remove and return a session's packed battle, or None if it has none parked"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT state FROM parked_battles WHERE session_id = ?", (session_id,))
+    result = c.fetchone()
+    if result:
+        c.execute("DELETE FROM parked_battles WHERE session_id = ?", (session_id,))
+        conn.commit()
+    conn.close()
+    return result[0] if result else None
+
+
+@timed("db_seconds")
+def prune_parked_battles(max_age):
+    """Drop battles parked more than max_age seconds ago; their sessions are long gone"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("DELETE FROM parked_battles WHERE parked_at < ?", (int(time.time() - max_age),))
+    conn.commit()
+    conn.close()
+    return c.rowcount
+
+
+@timed("db_seconds")
+def save_active_battles(checkpoints):
+    """Write (username, state) checkpoints in one transaction. A None state deletes the user's row."""
+    now = int(time.time())
+    checkpoints = list(checkpoints)
+    conn = sqlite3.connect(DB_PATH)
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO active_battles (username, state, updated_at) VALUES (?, ?, ?)",
+                         [(username, state, now) for username, state in checkpoints if state is not None])
+        conn.executemany("DELETE FROM active_battles WHERE username = ?",
+                         [(username,) for username, state in checkpoints if state is None])
+    conn.close()
+
+
+@timed("db_seconds")
+def load_active_battle(username):
+    """The user's latest battle checkpoint, or None"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT state FROM active_battles WHERE username = ?", (username,))
+    result = c.fetchone()
+    conn.close()
+    return result[0] if result else None
+
+
+def _index_replays(c, replays):
+    """Add (replay id, data) pairs to the move index on an open cursor"""
+    postings, battles, player_counts = [], Counter(), {}
+    for replay_id, data in replays:
+        codes = moves(data)
+        joint, player = index_terms(codes)
+        postings.extend((gram, replay_id) for gram in joint)
+        battles.update(joint)
+        battles.update(wildcard_terms(codes))
+        for gram, count in player.items():
+            player_counts[gram] = player_counts.get(gram, 0) + count
+    c.executemany("INSERT OR IGNORE INTO replay_ngrams (gram, replay_id) VALUES (?, ?)", postings)
+    c.executemany("INSERT INTO replay_ngram_battles (gram, battles) VALUES (?, ?) "
+                  "ON CONFLICT (gram) DO UPDATE SET battles = battles + excluded.battles", battles.items())
+    c.executemany("INSERT INTO player_ngram_counts (gram, count) VALUES (?, ?) "
+                  "ON CONFLICT (gram) DO UPDATE SET count = count + excluded.count", player_counts.items())
+
+
+def _battle_stats(difficulty, outcome, data):
+    """(STATS_FIELDS values, {player action: times played}) for one finished battle"""
+    header, _ = read_header(data)
+    player_health, lebron_health = final_health(data)
+    won = outcome == "win"
+    xp = TIE_XP if outcome == "tie" else calculate_xp_reward(player_health, lebron_health, difficulty, won)
+    values = (1, int(won), int(outcome == "loss"), int(outcome == "tie"), header["rounds"],
+              player_health if won else 0, lebron_health if outcome == "loss" else 0, xp)
+    actions = {}
+    for code in moves(data):
+        action = MOVES[code >> 2]
+        actions[action] = actions.get(action, 0) + 1
+    return values, actions
+
+
+def _day(created_at):
+    return time.strftime("%Y-%m-%d", time.gmtime(created_at))
+
+
+def _summaries(replays):
+    """(username, day, difficulty, STATS_FIELDS values, {action: count}) per
+    (username, difficulty, outcome, data, created_at) replay"""
+    return [(username, _day(created_at), difficulty, *_battle_stats(difficulty, outcome, data))
+            for username, difficulty, outcome, data, created_at in replays]
+
+
+def _record_stats(c, summaries):
+    """Add battle summaries (see _summaries) to the stats aggregates on an open cursor"""
+    daily, totals, actions = {}, {}, {}
+    for username, day, difficulty, values, played in summaries:
+        for scope in (username, ""):
+            for table, key in ((daily, (scope, day, difficulty)), (totals, (scope, difficulty))):
+                table[key] = [a + b for a, b in zip(table.get(key, (0,) * len(values)), values)]
+            for action, count in played.items():
+                key = (scope, difficulty, action)
+                actions[key] = actions.get(key, 0) + count
+    updates = ", ".join(f"{field} = {field} + excluded.{field}" for field in STATS_FIELDS)
+    placeholders = ", ".join("?" * len(STATS_FIELDS))
+    c.executemany(f"INSERT INTO stats_daily (username, day, difficulty, {', '.join(STATS_FIELDS)}) "
+                  f"VALUES (?, ?, ?, {placeholders}) ON CONFLICT (username, day, difficulty) DO UPDATE SET {updates}",
+                  [(*key, *values) for key, values in daily.items()])
+    c.executemany(f"INSERT INTO stats_totals (username, difficulty, {', '.join(STATS_FIELDS)}) "
+                  f"VALUES (?, ?, {placeholders}) ON CONFLICT (username, difficulty) DO UPDATE SET {updates}",
+                  [(*key, *values) for key, values in totals.items()])
+    c.executemany("INSERT INTO stats_actions (username, difficulty, action, count) VALUES (?, ?, ?, ?) "
+                  "ON CONFLICT (username, difficulty, action) DO UPDATE SET count = count + excluded.count",
+                  [(*key, count) for key, count in actions.items()])
+
+
+@timed("db_seconds")
+def save_replays(replays, created_at=None):
+    """Store and index finished battles' replays, given as (username, difficulty, outcome, data).
+
+    outcome is "win", "loss" or "tie". created_at defaults to now. Returns the new replay ids.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    ids = _store_replays(conn.cursor(), replays, int(time.time() if created_at is None else created_at))
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def _store_replays(c, replays, now):
+    """save_replays on an open cursor"""
+    ids = []
+    for username, difficulty, outcome, data in replays:
+        rounds = read_header(data)[0]["rounds"]
+        c.execute("INSERT INTO replays (username, difficulty, outcome, rounds, data, created_at) "
+                  "VALUES (?, ?, ?, ?, ?, ?)", (username, difficulty, outcome, rounds, data, now))
+        ids.append(c.lastrowid)
+    _index_replays(c, zip(ids, (replay[3] for replay in replays)))
+    _record_stats(c, _summaries([(*replay, now) for replay in replays]))
+    return ids
+
+
+def save_replay(username, difficulty, outcome, data):
+    """Store and index one finished battle's replay. Returns its id."""
+    return save_replays([(username, difficulty, outcome, data)])[0]
+
+
+@timed("db_seconds")
+def reindex_replays(batch=10000):
+    """Rebuild the move index from every stored replay"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    for table in ("replay_ngrams", "replay_ngram_battles", "player_ngram_counts"):
+        c.execute(f"DELETE FROM {table}")
+    last_id = 0
+    while True:
+        rows = conn.execute("SELECT id, data FROM replays WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id, batch)).fetchall()
+        if not rows:
+            break
+        _index_replays(c, rows)
+        last_id = rows[-1][0]
+    conn.commit()
+    conn.close()
+
+
+@timed("db_seconds")
+def rebuild_stats(batch=10000):
+    """Recompute the stats aggregates from the battle rollups and every stored replay"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    for table in ("stats_daily", "stats_totals", "stats_actions"):
+        c.execute(f"DELETE FROM {table}")
+    # Compacted battles live on only in their rollups
+    rollups = c.execute(f"SELECT username, day, difficulty, {', '.join(ROLLUP_FIELDS)} FROM battle_rollups")
+    _record_stats(c, [(*row[:3], row[3:3 + len(STATS_FIELDS)], dict(zip(MOVES, row[3 + len(STATS_FIELDS):])))
+                      for row in rollups.fetchall()])
+    last_id = 0
+    while True:
+        rows = conn.execute("SELECT id, username, difficulty, outcome, data, created_at FROM replays "
+                            "WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch)).fetchall()
+        if not rows:
+            break
+        _record_stats(c, _summaries(row[1:] for row in rows))
+        last_id = rows[-1][0]
+    conn.commit()
+    conn.close()
+
+
+def _index_removals(replays):
+    """(postings, {gram or wildcard gram: battles}) to take out of the move index for (replay id, data) pairs.
+
+    The player n-gram counts keep these battles: they describe how players play, not which battles are stored.
+    """
+    postings, battles = [], Counter()
+    for replay_id, data in replays:
+        codes = moves(data)
+        joint, _ = index_terms(codes)
+        postings.extend((gram, replay_id) for gram in joint)
+        battles.update(joint)
+        battles.update(wildcard_terms(codes))
+    return postings, battles
+
+
+@timed("db_seconds")
+def compact_replays(before, batch=200, archive_path=None):
+    """Roll up to batch of the oldest replays created before `before` (a Unix time) into
+    battle_rollups, copy them to the SQLite file archive_path if given, and delete them
+    with their move index postings. Returns how many were compacted.
+
+    Rollups and index terms are worked out before taking the write lock, so
+    the transaction only writes. The stats aggregates already count these
+    battles, so they don't change.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    try:
+        if archive_path:
+            c.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+            c.execute("CREATE TABLE IF NOT EXISTS archive.replays (id INTEGER PRIMARY KEY, username TEXT NOT NULL, "
+                      "difficulty TEXT NOT NULL, outcome TEXT NOT NULL, rounds INTEGER NOT NULL, data BLOB NOT NULL, "
+                      "created_at INTEGER NOT NULL)")
+        rows = c.execute(f"SELECT {_REPLAY_COLUMNS} FROM replays WHERE created_at < ? ORDER BY created_at LIMIT ?",
+                         (int(before), batch)).fetchall()
+        if not rows:
+            return 0
+        rollups = {}
+        for username, day, difficulty, values, played in _summaries(
+                (username, difficulty, outcome, data, created_at)
+                for _, username, difficulty, outcome, _, data, created_at in rows):
+            key = (username, day, difficulty)
+            values = (*values, *(played.get(move, 0) for move in MOVES))
+            rollups[key] = [a + b for a, b in zip(rollups.get(key, (0,) * len(values)), values)]
+        postings, battles = _index_removals((row[0], row[5]) for row in rows)
+
+        c.execute("BEGIN IMMEDIATE")
+        c.executemany("DELETE FROM replays WHERE id = ?", [(row[0],) for row in rows])
+        if c.rowcount != len(rows):
+            conn.rollback()  # Another compactor got to some of them first; the next call starts over
+            return 0
+        updates = ", ".join(f"{field} = {field} + excluded.{field}" for field in ROLLUP_FIELDS)
+        c.executemany(f"INSERT INTO battle_rollups (username, day, difficulty, {', '.join(ROLLUP_FIELDS)}) "
+                      f"VALUES (?, ?, ?, {', '.join('?' * len(ROLLUP_FIELDS))}) "
+                      f"ON CONFLICT (username, day, difficulty) DO UPDATE SET {updates}",
+                      [(*key, *values) for key, values in rollups.items()])
+        if archive_path:
+            c.executemany(f"INSERT OR IGNORE INTO archive.replays ({_REPLAY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                          rows)
+        c.executemany("DELETE FROM replay_ngrams WHERE gram = ? AND replay_id = ?", postings)
+        c.executemany("UPDATE replay_ngram_battles SET battles = battles - ? WHERE gram = ?",
+                      [(count, gram) for gram, count in battles.items()])
+        c.executemany("DELETE FROM replay_ngram_battles WHERE gram = ? AND battles <= 0",
+                      [(gram,) for gram in battles])
+        conn.commit()
+    finally:
+        conn.close()
+    return len(rows)
+
+
+@timed("db_seconds")
+def count_replays_before(before):
+    conn = sqlite3.connect(DB_PATH)
+    count = conn.execute("SELECT COUNT(*) FROM replays WHERE created_at < ?", (int(before),)).fetchone()[0]
+    conn.close()
+    return count
+
+
+@timed("db_seconds")
+def analyze_db(analysis_limit=1000, budget=None):
+    """Refresh the query planner's statistics, sampling about analysis_limit rows per index.
+
+    Gives up after `budget` seconds, keeping the old statistics. Returns whether it finished.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    if budget is not None:
+        deadline = time.monotonic() + budget
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)  # Non-zero interrupts ANALYZE
+    try:
+        conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+        conn.execute("ANALYZE")
+        conn.commit()
+    except sqlite3.OperationalError:
+        if budget is None or time.monotonic() <= deadline:
+            raise
+        return False
+    finally:
+        conn.close()
+    return True
+
+
+@timed("db_seconds")
+def reclaim_space(pages):
+    """Hand up to `pages` free pages back to the filesystem. Returns (pages freed, free pages left).
+
+    Needs incremental auto-vacuum; otherwise frees nothing and free pages are reused by later writes.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()  # Frees a page per row stepped
+    after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    conn.close()
+    return before - after, after
+
+
+@timed("db_seconds")
+def enable_incremental_vacuum():
+    """Switch an existing database to incremental auto-vacuum. Rewrites the whole file once."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    conn.close()
+
+
+@timed("db_seconds")
+def stats_daily(username="", since_day=""):
+    """{STATS_FIELDS..., "day", "difficulty"} rows from since_day (YYYY-MM-DD) on, oldest first"""
+    conn = sqlite3.connect(DB_PATH)
+    rows = conn.execute(f"SELECT day, difficulty, {', '.join(STATS_FIELDS)} FROM stats_daily "
+                        "WHERE username = ? AND day >= ? ORDER BY day", (username, since_day)).fetchall()
+    conn.close()
+    return [dict(zip(("day", "difficulty", *STATS_FIELDS), row)) for row in rows]
+
+
+@timed("db_seconds")
+def stats_totals(username=""):
+    """{difficulty: {STATS_FIELDS...}} over all time"""
+    conn = sqlite3.connect(DB_PATH)
+    rows = conn.execute(f"SELECT difficulty, {', '.join(STATS_FIELDS)} FROM stats_totals WHERE username = ?",
+                        (username,)).fetchall()
+    conn.close()
+    return {row[0]: dict(zip(STATS_FIELDS, row[1:])) for row in rows}
+
+
+@timed("db_seconds")
+def stats_actions(username=""):
+    """{(difficulty, action): times the player chose it}"""
+    conn = sqlite3.connect(DB_PATH)
+    rows = conn.execute("SELECT difficulty, action, count FROM stats_actions WHERE username = ?",
+                        (username,)).fetchall()
+    conn.close()
+    return {(difficulty, action): count for difficulty, action, count in rows}
+
+
+def replay_rows(username=None, chunk=5000):
+    """Every replay's (id, username, difficulty, outcome, rounds, created_at), as lists of up to chunk rows.
+
+    Streams with one open connection, so memory stays at one chunk however
+    many battles are stored.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        query = "SELECT id, username, difficulty, outcome, rounds, created_at FROM replays"
+        cursor = conn.execute(query + " WHERE username = ?" if username is not None else query,
+                              (username,) if username is not None else ())
+        while True:
+            rows = cursor.fetchmany(chunk)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+
+@timed("db_seconds")
+def ngram_battle_counts(grams):
+    """{gram: number of battles containing it} for the given joint or wildcard n-grams"""
+    conn = sqlite3.connect(DB_PATH)
+    grams = list(grams)
+    rows = conn.execute(f"SELECT gram, battles FROM replay_ngram_battles WHERE gram IN ({','.join('?' * len(grams))})",
+                        grams).fetchall()
+    conn.close()
+    return dict(rows)
+
+
+@timed("db_seconds")
+def battles_with_grams(grams, limit=None):
+    """Ids of battles containing any of the joint n-grams, newest first"""
+    conn = sqlite3.connect(DB_PATH)
+    grams = list(grams)
+    query = (f"SELECT DISTINCT replay_id FROM replay_ngrams WHERE gram IN ({','.join('?' * len(grams))}) "
+             "ORDER BY replay_id DESC")
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    ids = [row[0] for row in conn.execute(query, grams)]
+    conn.close()
+    return ids
+
+
+@timed("db_seconds")
+def count_battles_with_grams(grams):
+    conn = sqlite3.connect(DB_PATH)
+    grams = list(grams)
+    count = conn.execute(f"SELECT COUNT(DISTINCT replay_id) FROM replay_ngrams "
+                         f"WHERE gram IN ({','.join('?' * len(grams))})", grams).fetchone()[0]
+    conn.close()
+    return count
+
+
+@timed("db_seconds")
+def replay_data(replay_ids):
+    """(id, data) for the given replays"""
+    conn = sqlite3.connect(DB_PATH)
+    replay_ids = list(replay_ids)
+    rows = []
+    for start in range(0, len(replay_ids), 900):
+        chunk = replay_ids[start:start + 900]
+        rows += conn.execute(f"SELECT id, data FROM replays WHERE id IN ({','.join('?' * len(chunk))})",
+                             chunk).fetchall()
+    conn.close()
+    return rows
+
+
+@timed("db_seconds")
+def count_replays(min_rounds=0):
+    conn = sqlite3.connect(DB_PATH)
+    count = conn.execute("SELECT COUNT(*) FROM replays WHERE rounds >= ?", (min_rounds,)).fetchone()[0]
+    conn.close()
+    return count
+
+
+@timed("db_seconds")
+def player_ngram_counts(grams):
+    """{gram: occurrences} for the given player-move n-grams"""
+    conn = sqlite3.connect(DB_PATH)
+    grams = list(grams)
+    rows = conn.execute(f"SELECT gram, count FROM player_ngram_counts WHERE gram IN ({','.join('?' * len(grams))})",
+                        grams).fetchall()
+    conn.close()
+    return dict(rows)
+
+
+@timed("db_seconds")
+def get_replays(username, limit=20):
+    """The user's newest replays as (id, difficulty, outcome, rounds, created_at) rows"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT id, difficulty, outcome, rounds, created_at FROM replays WHERE username = ? "
+              "ORDER BY id DESC LIMIT ?", (username, limit))
+    rows = c.fetchall()
+    conn.close()
+    return rows
+
+
+@timed("db_seconds")
+def load_replay(replay_id):
+    """A replay's bytes, or None"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT data FROM replays WHERE id = ?", (replay_id,))
+    result = c.fetchone()
+    conn.close()
+    return result[0] if result else None
@@ -0,0 +1,640 @@
+"""Battle rules, LeBron's AI and XP math. Has no Streamlit dependency."""
+
+import json
+import os
+import random
+
+DEFAULT_AI_WEIGHTS = os.path.join(os.path.dirname(__file__), "data", "ai_weights.json")
+
+
+def load_ai_weights(path):
+    """{difficulty: {name: value}} from an AI weights config: the base move
+    weights and the multipliers choose_action applies to them, in one flat dict"""
+    with open(path) as f:
+        config = json.load(f)
+    return {difficulty: {**entry["moves"], **entry["multipliers"]} for difficulty, entry in config.items()}
+
+
+# LeBron's move weights per difficulty, from lebattle/data/ai_weights.json or the
+# file named by LEBATTLE_AI_WEIGHTS (see lebattle.aitune). Shared by every LeBron, never mutated.
+MOVE_PATTERNS = load_ai_weights(os.environ.get("LEBATTLE_AI_WEIGHTS", DEFAULT_AI_WEIGHTS))
+
+
+class Player:
+    # Slots keep the thousands of live battles a server holds small. last_health
+    # is set by LeBron.choose_action and stays unset until his first analysed turn.
+    __slots__ = ("name", "max_health", "health", "max_stamina", "stamina", "special_meter",
+                 "is_defending", "last_health")
+
+    def __init__(self, name, health, stamina, special_meter=0):
+        self.name = name
+        self.max_health = health
+        self.health = health
+        self.max_stamina = 100
+        self.stamina = stamina
+        self.special_meter = special_meter
+        self.is_defending = False
+
+    def attack(self, rng=random):
+        if self.stamina < 15:
+            return (0, f"{self.name} is too tired to attack!")
+        self.stamina -= 15
+        self.special_meter += 10
+        if self.special_meter > 100:
+            self.special_meter = 100
+        base_damage = rng.randint(15, 30)
+        critical = rng.random() < 0.2
+        if critical:
+            base_damage = int(base_damage * 1.5)
+            return (base_damage, f"{self.name} lands a CRITICAL hit for {base_damage} damage!")
+        return (base_damage, f"{self.name} attacks for {base_damage} damage!")
+
+    def special_attack(self, rng=random):
+        if self.special_meter < 100:
+            return (0, f"{self.name} doesn't have enough energy for a special attack!")
+        self.special_meter = 0
+        self.stamina -= 25
+        if self.stamina < 0:
+            self.stamina = 0
+        damage = rng.randint(40, 60)
+        return (damage, f"{self.name} unleashes a SPECIAL ATTACK for {damage} massive damage!")
+
+    def defend(self):
+        self.stamina -= 10
+        if self.stamina < 0:
+            self.stamina = 0
+        self.is_defending = True  # Set defending state
+        self.special_meter += 15
+        if self.special_meter > 100:
+            self.special_meter = 100
+        return f"{self.name} takes a defensive stance, ready to reduce and heal from incoming damage!"
+
+    def rest(self, rng=random):
+        gained = rng.randint(25, 40)
+        self.stamina += gained
+        if self.stamina > self.max_stamina:
+            self.stamina = self.max_stamina
+        self.special_meter += 5
+        if self.special_meter > 100:
+            self.special_meter = 100
+        return f"{self.name} rests and recovers {gained} stamina."
+
+    def take_damage(self, damage):
+        if self.is_defending:
+            damage = int(damage * 0.5)
+            result = f"{self.name} blocks and reduces damage to {damage}!"
+            self.is_defending = False
+        else:
+            result = f"{self.name} takes {damage} damage!"
+        self.health -= damage
+        if self.health < 0:
+            self.health = 0
+        return result
+
+    def is_alive(self):
+        return self.health > 0
+
+    def reset_turn(self):
+        self.is_defending = False
+
+class LeBron(Player):
+    __slots__ = ("difficulty", "move_patterns", "consecutive_attacks", "consecutive_defends",
+                 "player_last_hp", "player_last_stamina", "player_pattern_memory", "turn_count",
+                 "damage_dealt_total", "damage_dealt_count", "damage_taken_history",
+                 "successful_defends", "successful_attacks", "player_rest_count",
+                 "player_defend_count", "phase", "adaptive_strategy")
+
+    special_move_name = "Signature Slam Dunk"
+    abilities = {
+        "POSTERIZER": "Quick attack that has a chance to lower opponent's stamina",
+        "BLOCKED BY JAMES": "Strong defensive move that also recovers stamina",
+        "ALLEY-OOP TO DAVIS": "Tactical move that increases special meter gain",
+        special_move_name: "Devastating special attack that deals massive damage"
+    }
+
+    def __init__(self, difficulty):
+        health = 100 if difficulty == "Easy" else 160 if difficulty == "Medium" else 180
+        stamina = 100
+        super().__init__("LeBron James", health, stamina)
+        self.difficulty = difficulty
+        self.move_patterns = self.set_move_patterns()
+        self.consecutive_attacks = 0
+        self.consecutive_defends = 0
+        self.player_last_hp = 150  # Store opponent's last HP to track damage dealt
+        self.player_last_stamina = 100  # Store opponent's last stamina to track changes
+        self.player_pattern_memory = []  # Remember opponent's last 5 moves instead of 3
+        self.turn_count = 0
+        self.damage_dealt_total = 0  # Damage dealt across turns that landed a hit
+        self.damage_dealt_count = 0
+        self.damage_taken_history = ()  # Damage taken on the last 3 hits
+        self.successful_defends = 0  # Count successful defend actions
+        self.successful_attacks = 0  # Count successful attack actions
+        self.player_rest_count = 0  # Count how many times player has rested
+        self.player_defend_count = 0  # Count how many times player has defended
+        self.phase = "early"  # Track battle phase (early, mid, late)
+        self.adaptive_strategy = self.initialize_adaptive_strategy()
+
+    def set_move_patterns(self):
+        """Define LeBron's move patterns based on difficulty with more nuanced strategy."""
+        return MOVE_PATTERNS.get(self.difficulty, MOVE_PATTERNS["Hard"])
+
+    def initialize_adaptive_strategy(self):
+        """Initialize adaptive strategy based on opponent behavior."""
+        return {
+            "aggressive": 0,    # Player attacks frequently
+            "defensive": 0,     # Player defends frequently 
+            "resourceful": 0,   # Player manages resources well
+            "pattern_based": 0, # Player follows patterns
+            "special_focused": 0 # Player focuses on special attacks
+        }
+
+    def update_battle_phase(self):
+        """Update the battle phase based on turn count and health."""
+        if self.health > self.max_health * 0.7 and self.turn_count < 5:
+            self.phase = "early"
+        elif self.health > self.max_health * 0.3 or self.turn_count < 10:
+            self.phase = "mid"
+        else:
+            self.phase = "late"
+
+    def analyze_player_pattern(self, player):
+        """Enhanced analysis of player's pattern with more metrics tracked."""
+        if self.difficulty == "Easy":
+            return  # Skip analysis for Easy mode
+
+        # Track player health changes to detect attacks
+        damage_taken = max(0, self.player_last_hp - player.health)
+        if damage_taken > 0:
+            self.damage_taken_history = (self.damage_taken_history + (damage_taken,))[-3:]
+        
+        # Calculate damage dealt to player
+        if hasattr(player, 'last_health') and player.last_health > player.health:
+            damage_dealt = player.last_health - player.health
+            self.damage_dealt_total += damage_dealt
+            self.damage_dealt_count += 1
+            
+            if damage_dealt > 0:
+                self.successful_attacks += 1
+
+        self.player_last_hp = player.health
+
+        # Record player's apparent move
+        player_move = None
+        if damage_taken > 0:
+            if damage_taken > 35:  # Likely a special attack
+                player_move = "special"
+                self.adaptive_strategy["special_focused"] += 2
+            else:
+                player_move = "attack"
+                self.adaptive_strategy["aggressive"] += 1
+        elif player.stamina > self.player_last_stamina:
+            player_move = "rest"
+            self.player_rest_count += 1
+            self.adaptive_strategy["resourceful"] += 1
+        elif player.is_defending:
+            player_move = "defend"
+            self.player_defend_count += 1
+            self.adaptive_strategy["defensive"] += 1
+
+        self.player_last_stamina = player.stamina
+
+        # Add to pattern memory (keep last 5 moves instead of 3)
+        if player_move:
+            self.player_pattern_memory.append(player_move)
+            if len(self.player_pattern_memory) > 5:
+                self.player_pattern_memory.pop(0)
+                
+            # Check for patterns in last 5 moves
+            if len(self.player_pattern_memory) >= 5:
+                # Check for repetitive patterns (e.g., attack-defend-attack-defend)
+                pattern_detected = self.check_for_repeating_patterns()
+                if pattern_detected:
+                    self.adaptive_strategy["pattern_based"] += 2
+
+    def check_for_repeating_patterns(self):
+        """Check for repeating patterns in player's moves."""
+        if len(self.player_pattern_memory) < 4:
+            return False
+            
+        # Check for alternating patterns (e.g., attack-defend-attack-defend)
+        if (self.player_pattern_memory[-4] == self.player_pattern_memory[-2] and 
+            self.player_pattern_memory[-3] == self.player_pattern_memory[-1]):
+            return True
+            
+        # Check for three identical moves in last 4 moves
+        move_counts = {}
+        for move in self.player_pattern_memory[-4:]:
+            move_counts[move] = move_counts.get(move, 0) + 1
+            
+        for count in move_counts.values():
+            if count >= 3:
+                return True
+                
+        return False
+
+    def predict_player_action(self):
+        """Enhanced prediction of player's next action based on comprehensive pattern analysis."""
+        if len(self.player_pattern_memory) < 3 or self.difficulty == "Easy":
+            return None
+
+        # For medium and hard difficulty, perform more sophisticated prediction
+        if self.difficulty in ["Medium", "Hard"]:
+            # Check most recent pattern
+            last_three = self.player_pattern_memory[-3:]
+            
+            # Check for common sequences
+            if last_three == ["attack", "attack", "attack"]:
+                return "special" if random.random() < 0.7 else "rest"
+                
+            if last_three == ["rest", "attack", "attack"]:
+                return "special" if random.random() < 0.6 else "attack"
+                
+            if last_three == ["defend", "defend", "rest"]:
+                return "attack"
+                
+            if last_three == ["special", "rest", "rest"]:
+                return "attack"
+                
+            # Check for stamina-based patterns
+            if "rest" in last_three and last_three[-1] != "rest":
+                # Player recently rested but not on last turn, likely has stamina for attack
+                return "attack" if random.random() < 0.7 else "special"
+                
+            # Check for defensive patterns
+            if last_three.count("defend") >= 2:
+                # Player is defensive, might be setting up for a special
+                return "defend" if random.random() < 0.6 else "rest"
+                
+            # If player just did a special, they might rest
+            if last_three[-1] == "special":
+                return "rest" if random.random() < 0.8 else "defend"
+                
+            # If two attacks in a row, they might be building special
+            if last_three[-2:] == ["attack", "attack"]:
+                return "attack" if random.random() < 0.4 else "special"
+
+        # Advanced pattern prediction for Hard difficulty
+        if self.difficulty == "Hard" and len(self.player_pattern_memory) >= 5:
+            # Look for longer patterns
+            if self.player_pattern_memory[-2:] == ["rest", "rest"]:
+                return "attack"  # Player likely recovering a lot of stamina
+                
+            if self.player_pattern_memory[-3:] == ["defend", "attack", "attack"]:
+                return "special"  # Classic buildup pattern
+                
+            # Analyze dominant play style
+            style_scores = self.adaptive_strategy.copy()
+            dominant_style = max(style_scores, key=style_scores.get)
+            
+            if dominant_style == "aggressive" and style_scores["aggressive"] > 5:
+                return "defend"  # Counter aggressive players with defense
+                
+            if dominant_style == "defensive" and style_scores["defensive"] > 5:
+                return "rest"  # Against defensive players, build resources
+                
+            if dominant_style == "special_focused" and style_scores["special_focused"] > 5:
+                return "defend"  # Prepare for their special attacks
+                
+            if dominant_style == "pattern_based" and style_scores["pattern_based"] > 5:
+                # Break their pattern with unpredictability
+                return random.choice(["attack", "defend", "rest"])
+
+        return None
+
+    def calculate_stamina_efficiency(self):
+        """Calculate how efficiently the player is using stamina."""
+        if not self.damage_dealt_count or self.player_rest_count == 0:
+            return 0
+            
+        avg_damage = self.damage_dealt_total / self.damage_dealt_count
+        stamina_efficiency = avg_damage / (self.player_rest_count + 1)  # Avoid division by zero
+        return stamina_efficiency
+
+    def observe(self, player=None):
+        """Start a turn: advance the turn count and battle phase and read the player's last move"""
+        self.turn_count += 1
+        self.update_battle_phase()
+
+        # Update pattern analysis if we have player information
+        if player:
+            self.analyze_player_pattern(player)
+
+    def choose_action(self, player=None):
+        """Enhanced decision-making for LeBron's actions based on advanced strategy and game state analysis."""
+        self.observe(player)
+        if self.difficulty == "Learned":
+            from lebattle import learned  # Brings in NumPy, so only once someone plays Learned
+
+            return learned.choose(self, player)  # A table lookup; see lebattle.selfplay
+
+        # Initialize base weights from move patterns; w also holds the multipliers below
+        w = self.move_patterns
+        weights = {
+            "attack": w["attack"],
+            "defend": w["defend"],
+            "rest": w["rest"],
+            "special": 0 if self.special_meter < 100 else w["special"]
+        }
+
+        # EMERGENCY RESPONSES (highest priority)
+        # Only rest if stamina is below threshold (25-30)
+        if self.stamina <= 30:
+            # The lower the stamina, the higher the chance to rest
+            rest_urgency = (30 - self.stamina) / 30  # 0.0 to 1.0 scale
+            weights["rest"] *= (1 + w["rest_urgency"] * rest_urgency)  # Up to 3x (by default) when critically low
+
+            # Force rest if extremely low stamina (below 15)
+            if self.stamina < 15:
+                return "rest"
+        else:
+            # Significantly reduce chance of resting when stamina is high
+            weights["rest"] *= w["rest_high_stamina"]  # 80% reduction in rest probability when above threshold
+
+        # PHASE-BASED STRATEGY
+        if self.phase == "early":
+            # Early game: focus on building special meter and resource management
+            weights["defend"] *= w["early_defend"]  # More defensive early on
+            if self.turn_count < 3:
+                weights["attack"] *= w["opening_attack"]  # Slightly less aggressive at start
+                
+        elif self.phase == "mid":
+            # Mid game: balanced approach with tactical decisions
+            weights["attack"] *= w["mid_attack"]
+            # If we have good special meter, consider using it
+            if self.special_meter >= 90:
+                weights["special"] *= w["mid_special_ready"]
+                
+        else:  # late phase
+            # Late game: more aggressive, focus on finishing
+            weights["attack"] *= w["late_attack"]
+            weights["defend"] *= w["late_defend"]
+            # If we have special and player is low, prioritize it
+            if self.special_meter >= 100 and player and player.health < player.max_health * 0.4:
+                return "special"  # Go for the kill
+
+        # ADAPTIVE STRATEGY based on player behavior
+        if self.difficulty in ["Medium", "Hard"]:
+            # Counter aggressive players with more defense
+            if self.adaptive_strategy["aggressive"] > 5:
+                weights["defend"] *= w["vs_aggressive_defend"]
+                
+            # Against defensive players, build special meter
+            if self.adaptive_strategy["defensive"] > 5:
+                weights["attack"] *= w["vs_defensive_attack"]
+                
+            # If player manages resources well, be more aggressive
+            if self.adaptive_strategy["resourceful"] > 5:
+                weights["attack"] *= w["vs_resourceful_attack"]
+                weights["rest"] *= w["vs_resourceful_rest"]
+                
+            # If player is pattern-based, use more unpredictable moves
+            if self.adaptive_strategy["pattern_based"] > 5:
+                # Add randomness to counter predictable players
+                rand_factor = 0.3 + random.random() * 0.4  # 0.3 to 0.7
+                for action in weights:
+                    weights[action] *= (1 + (random.random() - 0.5) * rand_factor)
+
+        # TACTICAL DECISIONS based on prediction
+        predicted_move = self.predict_player_action()
+        if predicted_move and self.difficulty in ["Medium", "Hard"]:
+            # Strategic counter-moves based on prediction
+            if predicted_move == "attack":
+                weights["defend"] *= w["predicted_attack_defend"]
+                
+            elif predicted_move == "defend":
+                weights["rest"] *= w["predicted_defend_rest"]  # Build resources against defensive player
+                weights["attack"] *= w["predicted_defend_attack"]  # Less likely to attack into defense
+                
+            elif predicted_move == "special":
+                weights["defend"] *= w["predicted_special_defend"]  # Very likely to defend against special
+                
+            elif predicted_move == "rest":
+                weights["attack"] *= w["predicted_rest_attack"]  # Punish resting with attacks
+
+        # HARD MODE ENHANCEMENTS
+        if self.difficulty == "Hard":
+            # Check if player is close to having special ready
+            if player and hasattr(player, 'special_meter') and player.special_meter >= 90:
+                weights["defend"] *= w["player_special_ready_defend"]  # Prepare for potential special attack
+                
+            # If player is consistently doing high damage, prioritize defense
+            if len(self.damage_taken_history) >= 3:
+                recent_damage = sum(self.damage_taken_history) / 3
+                if recent_damage > 25:  # Player is doing significant damage
+                    weights["defend"] *= w["heavy_damage_defend"]
+                    
+            # If player has low health, go for the kill
+            if player and player.health < player.max_health * 0.25:
+                weights["attack"] *= w["player_low_health_attack"]
+                weights["special"] *= w["player_low_health_special"] if self.special_meter >= 100 else 1.0
+                
+            # If player has low stamina, apply pressure
+            if player and player.stamina < 30:
+                weights["attack"] *= w["player_low_stamina_attack"]  # Attack when they're low on stamina
+                
+            # If player is defending a lot, wait them out
+            if self.player_defend_count > self.turn_count * 0.4:  # >40% of turns defending
+                weights["rest"] *= w["player_turtling_rest"]
+                weights["attack"] *= w["player_turtling_attack"]
+                
+            # Advanced special meter management
+            if 80 <= self.special_meter < 100:
+                # If close to special, prioritize getting it ready
+                weights["defend"] *= w["near_special_defend"]  # Defense builds special meter
+                
+            # Combo detection - if we've landed several successful attacks
+            if self.successful_attacks >= 3 and player and player.health < player.max_health * 0.6:
+                # Go for special to capitalize on successful combo
+                if self.special_meter >= 100:
+                    return "special"
+
+        # UNIVERSAL IMPROVEMENTS
+        # Avoid predictable patterns
+        if self.consecutive_attacks >= 2:
+            weights["attack"] *= w["repeat_attack"]  # Reduce chance of third consecutive attack
+
+        if self.consecutive_defends >= 2:
+            weights["defend"] *= w["repeat_defend"]  # Reduce chance of third consecutive defense
+
+        # If opponent is defending, consider resting instead of attacking
+        if player and player.is_defending:
+            weights["attack"] *= w["player_defending_attack"]
+            weights["rest"] *= w["player_defending_rest"]
+
+        # Calculate the final decision
+        actions = list(weights.keys())
+        weights_list = list(weights.values())
+
+        chosen_action = random.choices(actions, weights=weights_list)[0]
+
+        # Double-check resting logic - only rest if truly needed (below 30 stamina)
+        if chosen_action == "rest" and self.stamina > 30:
+            # Exception: if player is defending and we've attacked consecutively, resting is smart
+            if not (player and player.is_defending and self.consecutive_attacks >= 2):
+                # Reconsider with reduced rest weight
+                weights["rest"] = w["reconsidered_rest"]  # Very low chance
+                actions = list(weights.keys())
+                weights_list = list(weights.values())
+                chosen_action = random.choices(actions, weights=weights_list)[0]
+
+        # If special meter is full and health is critical, use special as last resort
+        if self.special_meter >= 100 and self.health < self.max_health * 0.2 and chosen_action != "special":
+            # 70% chance to override with special as a desperate move
+            if random.random() < w["desperate_special_chance"]:
+                chosen_action = "special"
+
+        # Update consecutive action counters
+        if chosen_action == "attack":
+            self.consecutive_attacks += 1
+            self.consecutive_defends = 0
+        elif chosen_action == "defend":
+            self.consecutive_defends += 1
+            self.consecutive_attacks = 0
+        else:
+            self.consecutive_attacks = 0
+            self.consecutive_defends = 0
+
+        # Store player's health for next turn comparison
+        if player:
+            player.last_health = player.health
+
+        return chosen_action
+    
+    def attack(self, rng=random):
+        """Perform an attack with a chance to lower opponent's stamina."""
+        damage, msg = super().attack(rng)
+        # Higher chance of bonus effect on harder difficulties
+        poster_chance = 0.2 if self.difficulty == "Easy" else 0.35 if self.difficulty == "Medium" else 0.5
+        if rng.random() < poster_chance:
+            return (damage, "LeBron POSTERS YOU for " + str(damage) + " damage and reduces your stamina!")
+        return (damage, msg)
+
+    def special_attack(self, rng=random):
+        """Perform a devastating special attack."""
+        damage, _ = super().special_attack(rng)
+        # Scaling damage based on difficulty
+        if self.difficulty == "Medium":
+            damage = int(damage * 1.1)  # 10% damage boost
+        elif self.difficulty in ("Hard", "Learned"):
+            damage = int(damage * 1.2)  # 20% damage boost
+        return (damage, f"LeBron unleashes his {self.special_move_name} for {damage} MASSIVE damage!")
+
+    def take_damage(self, damage):
+        if self.is_defending:
+            # Damage reduction scales with difficulty
+            reduction = 0.5
+            reduced_damage = int(damage * (1 - reduction))
+
+            # Healing scales with difficulty
+            heal_percent = 0.5
+            heal_amount = int(reduced_damage * heal_percent)
+
+            self.health += heal_amount
+            # Ensure health doesn't exceed max health
+            if self.health > self.max_health:
+                self.health = self.max_health
+            # Apply the reduced damage
+            self.health -= reduced_damage
+            if self.health < 0:
+                self.health = 0
+            # Reset defending state AFTER processing damage
+            self.is_defending = False
+            return f"{self.name} blocks and reduces damage to {reduced_damage}, then heals {heal_amount} health!"
+        else:
+            # Apply full damage if not defending
+            self.health -= damage
+            if self.health < 0:
+                self.health = 0
+            return f"{self.name} takes {damage} damage!"
+
+def legal_moves(fighter):
+    """The moves the LePlay page would let this fighter pick"""
+    moves = ["rest"]
+    if fighter.stamina >= 15:
+        moves.append("attack")
+    if fighter.stamina >= 10:
+        moves.append("defend")
+    if fighter.special_meter >= 100 and fighter.stamina >= 25:
+        moves.append("special")
+    return moves
+
+
+def resolve_round(player, player_action, lebron, lebron_action, rng=random):
+    """Apply one simultaneous round and return its log as (type, message) pairs.
+
+    Defends resolve first, then attacks and rests, then both sides take damage.
+    Every roll comes from rng, so a seeded rng makes the round reproducible.
+    """
+    entries = []
+    player_damage = 0
+    lebron_damage = 0
+
+    # First, process defensive moves for both
+    if player_action == "defend":
+        entries.append(("player", player.defend()))
+    if lebron_action == "defend":
+        entries.append(("lebron", lebron.defend()))
+
+    # Then process attacks and calculate damage
+    if player_action == "attack":
+        player_damage, msg = player.attack(rng)
+        entries.append(("player", msg))
+    elif player_action == "special":
+        player_damage, msg = player.special_attack(rng)
+        entries.append(("player", msg))
+    elif player_action == "rest":
+        entries.append(("player", player.rest(rng)))
+
+    if lebron_action == "attack":
+        lebron_damage, msg = lebron.attack(rng)
+        entries.append(("lebron", msg))
+    elif lebron_action == "special":
+        lebron_damage, msg = lebron.special_attack(rng)
+        entries.append(("lebron", msg))
+    elif lebron_action == "rest":
+        entries.append(("lebron", lebron.rest(rng)))
+
+    # Finally, apply damage to both sides
+    if player_damage > 0:
+        entries.append(("lebron", lebron.take_damage(player_damage)))
+    if lebron_damage > 0:
+        entries.append(("player", player.take_damage(lebron_damage)))
+
+    player.reset_turn()
+    lebron.reset_turn()
+    return entries
+
+
+TIE_XP = 70  # Flat XP when both fighters fall together, on any difficulty
+
+
+def calculate_xp_reward(player_health, lebron_health, difficulty, won):
+    """
+    Calculate XP based on:
+    - Battle outcome (win/loss)
+    - Health margin
+    - Difficulty level
+    """
+    # Base XP for participation
+    base_xp = 25
+
+    # Difficulty multiplier
+    diff_multiplier = 1.0
+    if difficulty == "Medium":
+        diff_multiplier = 2.0
+    elif difficulty in ("Hard", "Learned"):
+        diff_multiplier = 2.5
+
+    # Victory bonus
+    victory_bonus = 50 if won else 0
+
+    # Health margin bonus (only for wins)
+    margin_bonus = 0
+    if won:
+        margin_bonus = int((player_health / 150) * 30)  # Up to 30 extra XP based on remaining health
+
+    # Calculate total XP
+    total_xp = int((base_xp + victory_bonus + margin_bonus) * diff_multiplier)
+
+    # Ensure minimum XP for participation
+    return max(10, total_xp)
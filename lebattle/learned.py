@@ -0,0 +1,93 @@
+"""LeBron's learned policy: one array lookup per decision.
+
+The battle as LeBron sees it at the start of a turn is bucketed into a state
+index, and the policy is a dense uint8 table of STATES moves trained by
+self-play Q-learning (lebattle.selfplay). It is read from the shared table
+store (lebattle.tablestore), so loading costs nothing and every server
+process on the machine shares the same physical pages instead of holding its
+own copy; a file named by LEBATTLE_LEARNED_POLICY is memory-mapped directly.
+
+A state is, for LeBron and then the opponent, health as a share of max health
+(HEALTH_BUCKETS), stamina (STAMINA_EDGES) and special meter (METER_EDGES),
+plus the opponent's last MEMORY moves as LeBron's pattern analysis recorded
+them. Nobody is defending when a turn starts, so there are no defend flags.
+Stamina and meter edges fall on the move costs, so which moves are legal is a
+function of the state and the table only ever holds legal moves.
+
+Importing this module stays light; nothing is read until the first decision.
+"""
+
+import os
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+from lebattle import tablestore
+
+MOVES = ("attack", "defend", "rest", "special")
+DEFAULT_POLICY = os.path.join(os.path.dirname(__file__), "data", "learned_policy.npy")
+POLICY_PATH = os.environ.get("LEBATTLE_LEARNED_POLICY")  # Instead of the table store
+
+HEALTH_BUCKETS = 8
+STAMINA_EDGES = (10, 15, 25, 40, 70)  # Defend, attack, special; then how long he can keep going
+METER_EDGES = (50, 90, 100)
+MEMORY = 2
+_SEEN = (None, "attack", "defend", "rest", "special")  # A move LeBron read, or nothing yet
+
+_STAMINA = len(STAMINA_EDGES) + 1
+_METER = len(METER_EDGES) + 1
+_FIGHTER = HEALTH_BUCKETS * _STAMINA * _METER
+STATES = _FIGHTER * _FIGHTER * len(_SEEN) ** MEMORY
+
+
+def _fighter(fighter):
+    health = min(fighter.health * HEALTH_BUCKETS // fighter.max_health, HEALTH_BUCKETS - 1)
+    stamina = bisect_right(STAMINA_EDGES, fighter.stamina)
+    meter = bisect_right(METER_EDGES, fighter.special_meter)
+    return (health * _STAMINA + stamina) * _METER + meter
+
+
+def state_index(me, opponent, opponent_moves):
+    """The table row for a fighter deciding against an opponent whose recent moves it read"""
+    index = _fighter(me) * _FIGHTER + _fighter(opponent)
+    recent = list(opponent_moves[-MEMORY:])
+    for move in [None] * (MEMORY - len(recent)) + recent:
+        index = index * len(_SEEN) + _SEEN.index(move)
+    return index
+
+
+def legal_mask():
+    """(STATES, 4) bool array of the moves the deciding fighter may make in each state"""
+    index = np.arange(STATES) // (_FIGHTER * len(_SEEN) ** MEMORY)  # The deciding fighter's part
+    meter = index % _METER
+    stamina = index // _METER % _STAMINA
+    return np.stack([stamina >= 2, stamina >= 1, np.ones(STATES, dtype=bool), (meter == 3) & (stamina >= 3)],
+                    axis=1)
+
+
+@lru_cache(maxsize=None)
+def _map_file(path):
+    table = np.load(path, mmap_mode="r")
+    if table.shape != (STATES,):
+        raise ValueError(f"Policy table has shape {table.shape}, this state space needs ({STATES},)")
+    return table
+
+
+def load_policy(path=None):
+    """The policy table, read-only: from path, LEBATTLE_LEARNED_POLICY, or the table store"""
+    path = path or POLICY_PATH
+    if path:
+        return _map_file(path)
+    store = tablestore.attach()
+    return store["learned.policy"] if store is not None else _map_file(DEFAULT_POLICY)
+
+
+def store_tables():
+    """(sources, tables) for lebattle.tablestore"""
+    return [DEFAULT_POLICY], {"learned.policy": np.load(DEFAULT_POLICY)}
+
+
+def choose(lebron, player):
+    """LeBron's move from the learned policy, after LeBron.observe has read the player's last move"""
+    return MOVES[load_policy()[state_index(lebron, player, lebron.player_pattern_memory)]]
@@ -0,0 +1,195 @@
+"""Background maintenance: named tasks run on intervals by each server process.
+
+`main` calls start() on every rerun; the first call in a process starts one
+scheduler thread, later calls do nothing. Each task in TASKS runs on its own
+thread about every `interval` seconds, plus or minus `jitter` so the workers
+of one deployment don't all hit SQLite at the same moment. The next run is
+scheduled from when the last one finished, so a slow run delays the task
+instead of stacking up runs, and a run is never started while the previous
+one is still going (run_now on a busy task is refused).
+
+Every task has a `budget` in seconds. Bounded tasks are called with it and
+stop within it: compaction between batches, the session sweep between
+batches of SWEEP_BATCH battles, ANALYZE by interrupting it (keeping the old
+statistics). The others are single short steps with nothing to cut short,
+so their budget is advisory. Any run that takes longer is logged and
+counted as an overrun. The last run, duration, outcome and next
+run of every task are on the LeAdmin page, and run times are recorded in
+the maintenance_seconds metric.
+
+LEBATTLE_MAINTENANCE=0 turns the scheduler off, for example on a worker
+that shouldn't compact replays.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+from lebattle import collectibles, metrics, progression, retention, tablestore
+from lebattle.db import analyze_db
+from lebattle.sessions import SWEEP_INTERVAL, registry
+
+ENABLED = os.environ.get("LEBATTLE_MAINTENANCE", "1") != "0"
+TICK = 1.0  # Longest the scheduler sleeps between checks for due tasks
+SWEEP_BATCH = 50  # Idle battles parked per registry lock hold
+
+logger = logging.getLogger(__name__)
+
+
+class Task:
+    __slots__ = ("name", "func", "interval", "jitter", "budget", "bounded", "next_run", "running", "last_run",
+                 "last_duration", "last_error", "runs", "overruns")
+
+    def __init__(self, name, func, interval, jitter, budget, bounded=False, first=None):
+        self.name = name
+        self.func = func  # Called with the budget if bounded, else with no arguments
+        self.interval = interval
+        self.jitter = jitter
+        self.budget = budget
+        self.bounded = bounded
+        self.next_run = interval if first is None else first  # Seconds after start; made absolute by start()
+        self.running = False
+        self.last_run = None  # Wall-clock start of the last finished run
+        self.last_duration = None
+        self.last_error = None
+        self.runs = 0
+        self.overruns = 0
+
+
+class Scheduler:
+    def __init__(self, tasks, clock=time.monotonic):
+        self.tasks = {task.name: task for task in tasks}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the scheduler thread if it isn't running yet"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            now = self._clock()
+            for task in self.tasks.values():
+                task.next_run = now + task.next_run + random.uniform(0, task.jitter)
+            self._thread = threading.Thread(target=self._loop, name="lebattle-maintenance", daemon=True)
+            self._thread.start()
+
+    def run_now(self, name):
+        """Run a task as soon as possible. False if it is running already."""
+        with self._lock:
+            task = self.tasks[name]
+            if task.running:
+                return False
+            task.next_run = self._clock()
+        self._wake.set()
+        return True
+
+    def status(self):
+        """One dict per task: schedule, last run (wall-clock time and seconds), outcome and counters"""
+        with self._lock:
+            now = self._clock()
+            return [{
+                "task": task.name,
+                "every s": task.interval,
+                "budget s": task.budget,
+                "bounded": task.bounded,
+                "running": task.running,
+                "last run": task.last_run,
+                "last s": task.last_duration,
+                "next in s": None if task.running else max(0.0, task.next_run - now),
+                "runs": task.runs,
+                "overruns": task.overruns,
+                "last error": task.last_error,
+            } for task in self.tasks.values()]
+
+    def _loop(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                due = [task for task in self.tasks.values() if not task.running and task.next_run <= now]
+                for task in due:
+                    task.running = True
+                pending = [task.next_run for task in self.tasks.values() if not task.running]
+            for task in due:
+                threading.Thread(target=self._run, args=(task,), name=f"lebattle-maintenance-{task.name}",
+                                 daemon=True).start()
+            self._wake.wait(min([TICK] + [max(0.0, at - now) for at in pending]))
+            self._wake.clear()
+
+    def _run(self, task):
+        started, t0 = time.time(), time.perf_counter()
+        error = None
+        try:
+            task.func(task.budget) if task.bounded else task.func()
+        except Exception as exc:
+            logger.exception("Maintenance task %s failed", task.name)
+            error = f"{type(exc).__name__}: {exc}"
+        duration = time.perf_counter() - t0
+        metrics.observe("maintenance_seconds", duration, task=task.name)
+        if duration > task.budget:
+            logger.warning("Maintenance task %s took %.1fs, over its %.1fs budget", task.name, duration, task.budget)
+        with self._lock:
+            task.running = False
+            task.last_run, task.last_duration, task.last_error = started, duration, error
+            task.runs += 1
+            task.overruns += duration > task.budget
+            task.next_run = self._clock() + task.interval + random.uniform(-task.jitter, task.jitter)
+        self._wake.set()  # The loop may be sleeping without this task's next run in mind
+
+
+def warm_caches():
+    """Map the table store and build the tables read from it, so no player's first rerun pays for it"""
+    tablestore.attach()
+    progression.get_table()
+    collectibles.get_catalog()
+
+
+def refresh_tables():
+    """Remap or rebuild the table store here when it changes, instead of on a rerun"""
+    tablestore.attach()
+
+
+def sweep_sessions(budget):
+    """Park idle battles and prune old parked ones even while nobody is playing"""
+    deadline = time.monotonic() + budget
+    while registry.sweep(SWEEP_BATCH) == SWEEP_BATCH and time.monotonic() < deadline:
+        pass
+
+
+def analyze_indexes(budget):
+    """Refresh the query planner's index statistics"""
+    analyze_db(budget=budget)
+
+
+def compact_replays(budget):
+    """Roll replays past the retention window into daily summaries, for at most `budget` seconds"""
+    retention.compact(budget=budget)
+
+
+def export_metrics():
+    """Keep the Prometheus file fresh while no reruns are happening"""
+    if metrics.METRICS_FILE:
+        metrics.export(metrics.METRICS_FILE)
+
+
+TASKS = [
+    Task("warm_caches", warm_caches, interval=3600, jitter=1, budget=10, first=0),
+    Task("refresh_tables", refresh_tables, interval=5, jitter=1, budget=2),
+    Task("sweep_sessions", sweep_sessions, interval=SWEEP_INTERVAL, jitter=5, budget=2, bounded=True),
+    Task("analyze_indexes", analyze_indexes, interval=6 * 3600, jitter=600, budget=5, bounded=True, first=300),
+    Task("compact_replays", compact_replays, interval=3600, jitter=300, budget=20, bounded=True, first=600),
+    Task("export_metrics", export_metrics, interval=metrics.EXPORT_INTERVAL, jitter=1, budget=1),
+]
+
+scheduler = Scheduler(TASKS)
+
+
+def start():
+    """Start this process's maintenance scheduler, once. Called from `main` on every rerun."""
+    if ENABLED:
+        scheduler.start()
@@ -0,0 +1,200 @@
+"""Lightweight in-process timing histograms and per-rerun counters.
+
+`main` wraps every rerun in `rerun()`, which times it and records how many
+DB calls and Streamlit elements it made, and times the page function it
+calls. DB functions are timed with `timed` and the battle engine with `timer`.
+Observations go into fixed-bucket histograms, so recording is a bisect and a
+few additions, and memory stays constant however long the server runs.
+
+Read them on the LeAdmin page (for LEBATTLE_ADMINS), or set LEBATTLE_METRICS_FILE to have
+the app write a Prometheus text exposition there every
+LEBATTLE_METRICS_INTERVAL seconds (default 15) for node_exporter's textfile
+collector or a plain `cat`.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+METRICS_FILE = os.environ.get("LEBATTLE_METRICS_FILE")
+EXPORT_INTERVAL = float(os.environ.get("LEBATTLE_METRICS_INTERVAL", 15))
+
+SECONDS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot counts values above every bound
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside its bucket. None if empty."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+# Metric families: name -> (help text, buckets)
+FAMILIES = {
+    "rerun_seconds": ("Wall time of a whole script rerun", SECONDS_BUCKETS),
+    "page_seconds": ("Time spent in the page function called from main", SECONDS_BUCKETS),
+    "db_seconds": ("Time spent in a lebattle.db call", SECONDS_BUCKETS),
+    "engine_seconds": ("Time spent in a battle engine call", SECONDS_BUCKETS),
+    "pvp_turn_seconds": ("Time from locking in a PvP move to seeing the round resolve", SECONDS_BUCKETS),
+    "maintenance_seconds": ("Time taken by one run of a background maintenance task", SECONDS_BUCKETS),
+    "rerun_db_calls": ("lebattle.db calls made by one rerun", COUNT_BUCKETS),
+    "rerun_elements": ("Streamlit elements emitted by one rerun", COUNT_BUCKETS),
+}
+
+_lock = threading.Lock()
+_histograms = {}  # (family, labels) -> Histogram; labels is a sorted tuple of (key, value)
+_current = threading.local()  # Counters for the rerun running on this thread
+_last_export = 0.0
+
+
+def observe(family, value, **labels):
+    key = (family, tuple(sorted(labels.items())))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram(FAMILIES[family][1])
+        histogram.observe(value)
+
+
+@contextmanager
+def timer(family, **labels):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(family, time.perf_counter() - t0, **labels)
+
+
+def timed(family):
+    """Decorator timing every call into `family`, labelled with the function name"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if family == "db_seconds":
+                _current.db_calls = getattr(_current, "db_calls", 0) + 1
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(family, time.perf_counter() - t0, call=func.__name__)
+        return wrapper
+    return decorate
+
+
+def _count_elements():
+    """Count the elements this rerun sends, by wrapping its script-run context's public enqueue"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None or getattr(ctx.enqueue, "_lebattle_counted", False):
+        return  # Not under Streamlit, or a context an earlier rerun of this session already wrapped
+    enqueue = ctx.enqueue
+
+    def counting_enqueue(msg):
+        if msg.WhichOneof("type") == "delta" and msg.delta.WhichOneof("type") == "new_element":
+            _current.elements = getattr(_current, "elements", 0) + 1
+        enqueue(msg)
+
+    counting_enqueue._lebattle_counted = True
+    ctx.enqueue = counting_enqueue
+
+
+@contextmanager
+def rerun():
+    """Instrument one script rerun. Yields a dict for labels only known midway, like the page."""
+    _count_elements()
+    _current.db_calls = 0
+    _current.elements = 0
+    labels = {}
+    t0 = time.perf_counter()
+    try:
+        yield labels
+    finally:
+        # st.rerun() and st.stop() end a rerun with an exception; it still counts
+        observe("rerun_seconds", time.perf_counter() - t0, **labels)
+        observe("rerun_db_calls", _current.db_calls, **labels)
+        observe("rerun_elements", _current.elements, **labels)
+        _maybe_export()
+
+
+def summary():
+    """(family, labels, count, p50, p95, p99, mean) for every recorded series"""
+    with _lock:
+        items = sorted(_histograms.items())
+        rows = [(family, dict(labels), h.count, h.quantile(0.5), h.quantile(0.95), h.quantile(0.99), h.sum / h.count)
+                for (family, labels), h in items if h.count]
+    return rows
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def prometheus_text():
+    """Every histogram in the Prometheus text exposition format"""
+    with _lock:
+        snapshot = [(key, list(h.counts), h.sum, h.count) for key, h in sorted(_histograms.items())]
+    lines = []
+    described = set()
+    for (family, labels), counts, total, count in snapshot:
+        name = f"lebattle_{family}"
+        help_text, buckets = FAMILIES[family]
+        if family not in described:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            described.add(family)
+        cumulative = 0
+        for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', bound))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def export(path):
+    """Write the Prometheus text to a file atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+def _maybe_export():
+    global _last_export
+    if METRICS_FILE and time.monotonic() - _last_export >= EXPORT_INTERVAL:
+        _last_export = time.monotonic()
+        export(METRICS_FILE)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
@@ -0,0 +1,226 @@
+"""Pattern search over stored replays' move sequences.
+
+Every saved replay is indexed in SQLite as it is recorded (db.save_replays):
+each distinct run of up to replay.INDEX_N consecutive rounds is a term with a
+posting per battle containing it, and a side table keeps how many battles
+hold each term, so planning a query never touches the postings. The side
+table also counts the runs with one side of some rounds left open
+(replay.wildcard_terms), so counting "attack attack" or "*/defend */defend"
+is one lookup rather than a union over every move the open side allows.
+Databases indexed before those counts existed need a --rebuild.
+
+A pattern is a run of consecutive rounds, one token per round:
+
+    attack            the player attacked; LeBron did anything
+    attack/special    the player attacked and LeBron used his special
+    */special         LeBron used his special; the player did anything
+    *                 any round
+
+"attack attack attack */special" finds battles where three player attacks in
+a row were followed by a LeBron special. A pattern of up to INDEX_N rounds is
+answered from the postings alone. A longer one is narrowed to the battles
+holding its most selective windows, then checked against the replays.
+
+Separately, the player's own moves are counted as n-grams across all battles,
+so `next_player_moves(["rest", "attack", "attack"])` tells what players
+actually did next after that run: the share predict_player_action would get
+right by guessing each move.
+
+    python -m lebattle.moveindex "attack attack attack */special"
+    python -m lebattle.moveindex --next rest attack attack
+    python -m lebattle.moveindex --rebuild
+"""
+
+import argparse
+import itertools
+import re
+import sys
+import time
+
+from lebattle.battle import MOVES
+from lebattle.db import (battles_with_grams, count_battles_with_grams, count_replays, ngram_battle_counts,
+                         player_ngram_counts, reindex_replays, replay_data)
+from lebattle.replay import INDEX_N, OPEN_LEBRON, OPEN_PLAYER, joint_gram, moves, player_gram, wildcard_gram
+
+MAX_EXPANSION = 1024  # Most terms a window's wildcards may expand to before it is passed over
+_ANY = frozenset(range(16))
+# (code, mask) for wildcard_gram, per set of allowed codes a round can have with at most one side open
+_ROUND_TERMS = {
+    **{frozenset([code]): (code, 0) for code in range(16)},
+    **{frozenset(move << 2 | lebron for lebron in range(4)): (move << 2, OPEN_LEBRON) for move in range(4)},
+    **{frozenset(player << 2 | move for player in range(4)): (move, OPEN_PLAYER) for move in range(4)},
+}
+
+
+def parse_pattern(pattern):
+    """A list with the set of allowed round codes (battle.encode_moves) per round"""
+    rounds = []
+    for token in pattern.replace(",", " ").split():
+        player, _, lebron = token.partition("/")
+        sides = []
+        for move in (player, lebron or "*"):
+            if move == "*":
+                sides.append(range(4))
+            elif move in MOVES:
+                sides.append([MOVES.index(move)])
+            else:
+                raise ValueError(f"Unknown move {move!r} in {token!r}; moves are {', '.join(MOVES)} or *")
+        rounds.append(frozenset(p << 2 | l for p in sides[0] for l in sides[1]))
+    if not rounds:
+        raise ValueError("Empty pattern")
+    return rounds
+
+
+def _expand(allowed):
+    return [joint_gram(codes) for codes in itertools.product(*(sorted(codes) for codes in allowed))]
+
+
+def _term(rounds):
+    """The one term whose battle count answers these rounds, or None if a round is * or there are too many"""
+    if len(rounds) > INDEX_N or not all(codes in _ROUND_TERMS for codes in rounds):
+        return None
+    codes, masks = zip(*(_ROUND_TERMS[codes] for codes in rounds))
+    return wildcard_gram(codes, masks)
+
+
+def _windows(rounds):
+    """(estimated battles, start, grams) for each window worth querying, most selective first"""
+    windows = []
+    for n in range(1, min(INDEX_N, len(rounds)) + 1):
+        for start in range(len(rounds) - n + 1):
+            allowed = rounds[start:start + n]
+            if all(codes == _ANY for codes in allowed):
+                continue
+            size = 1
+            for codes in allowed:
+                size *= len(codes)
+            if size > MAX_EXPANSION:
+                continue
+            grams = _expand(allowed)
+            term = _term(allowed)
+            counts = ngram_battle_counts(grams if term is None else [term])
+            windows.append((sum(counts.values()), -n, start, grams))
+    windows.sort()
+    return [(estimate, start, grams) for estimate, _, start, grams in windows]
+
+
+def _plan(rounds):
+    """("exact", grams) when the postings alone answer the pattern, else ("verify", candidate ids)"""
+    if len(rounds) <= INDEX_N:
+        size = 1
+        for codes in rounds:
+            size *= len(codes)
+        if size <= MAX_EXPANSION:
+            return "exact", _expand(rounds)
+    windows = _windows(rounds)
+    if windows and windows[0][0] == 0:
+        return "verify", []
+    candidates = None
+    for _, _, grams in windows[:2]:  # Intersect the two most selective windows
+        ids = set(battles_with_grams(grams))
+        candidates = ids if candidates is None else candidates & ids
+    return "verify", sorted(candidates, reverse=True) if candidates is not None else None
+
+
+def pattern_regex(rounds):
+    """The parsed pattern as a bytes regex over replay.moves output"""
+    return re.compile(b"".join(b"[" + re.escape(bytes(sorted(codes))) + b"]" for codes in rounds))
+
+
+def _verified(candidates, rounds, limit=None):
+    regex = pattern_regex(rounds)
+    found = []
+    for start in range(0, len(candidates), 900):
+        chunk = dict(replay_data(candidates[start:start + 900]))
+        for replay_id in candidates[start:start + 900]:
+            if regex.search(moves(chunk[replay_id])):
+                found.append(replay_id)
+                if limit is not None and len(found) >= limit:
+                    return found
+    return found
+
+
+def find_battles(pattern, limit=100):
+    """Ids of replays containing the pattern, newest first"""
+    rounds = parse_pattern(pattern)
+    kind, found = _plan(rounds)
+    if kind == "exact":
+        return battles_with_grams(found, limit)
+    if found is None:
+        raise ValueError("Pattern is too loose to search by index; replace some wildcards with moves")
+    return _verified(found, rounds, limit)
+
+
+def count_battles(pattern):
+    """How many stored replays contain the pattern"""
+    rounds = parse_pattern(pattern)
+    if all(codes == _ANY for codes in rounds):
+        return count_replays(min_rounds=len(rounds))
+    term = _term(rounds)
+    if term is not None:
+        return ngram_battle_counts([term]).get(term, 0)
+    kind, found = _plan(rounds)
+    if kind == "exact":
+        return count_battles_with_grams(found)
+    if found is None:
+        raise ValueError("Pattern is too loose to search by index; replace some wildcards with moves")
+    return len(_verified(found, rounds))
+
+
+def next_player_moves(context):
+    """{move: times players made it right after the given run of their own moves}"""
+    if len(context) >= INDEX_N:
+        raise ValueError(f"Context can be at most {INDEX_N - 1} moves")
+    for move in context:
+        if move not in MOVES:
+            raise ValueError(f"Unknown move {move!r}; moves are {', '.join(MOVES)}")
+    codes = [MOVES.index(move) for move in context]
+    grams = {move: player_gram(codes + [i]) for i, move in enumerate(MOVES)}
+    counts = player_ngram_counts(grams.values())
+    return {move: counts.get(gram, 0) for move, gram in grams.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search stored replays by move sequence")
+    parser.add_argument("pattern", nargs="*",
+                        help='rounds as "player/lebron" tokens, e.g. attack attack */special')
+    parser.add_argument("--next", action="store_true",
+                        help="treat the arguments as player moves and show what came next")
+    parser.add_argument("--limit", type=int, default=20, help="battle ids to list")
+    parser.add_argument("--rebuild", action="store_true", help="re-index every stored replay first")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        t0 = time.perf_counter()
+        reindex_replays()
+        print(f"Re-indexed {count_replays()} replays in {time.perf_counter() - t0:.1f}s")
+    if not args.pattern:
+        return 0
+
+    t0 = time.perf_counter()
+    try:
+        if args.next:
+            counts = next_player_moves(args.pattern)
+        else:
+            pattern = " ".join(args.pattern)
+            total = count_battles(pattern)
+            ids = find_battles(pattern, args.limit) if total else []
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    if args.next:
+        seen = sum(counts.values())
+        print(f"After {' '.join(args.pattern)}: {seen} occurrences ({elapsed_ms:.1f} ms)")
+        for move, count in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"  {move:<8} {count:8}  {count / seen if seen else 0:6.1%}")
+    else:
+        print(f"{total} battles ({elapsed_ms:.1f} ms)")
+        if ids:
+            print("  " + " ".join(map(str, ids)) + (" ..." if total > len(ids) else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""Page registry. Each page module is imported the first time it is visited."""
+
+import importlib
+import os
+
+# Page name -> (module, render function)
+PAGES = {
+    "Login": ("lebattle.pages.auth", "login_ui"),
+    "Register": ("lebattle.pages.auth", "register_ui"),
+    "LePlay": ("lebattle.pages.play", "play_ui"),
+    "LePvP": ("lebattle.pages.pvp", "pvp_ui"),
+    "LePASS": ("lebattle.pages.lepass", "lepass_ui"),
+    "LeStats": ("lebattle.pages.lestats", "lestats_ui"),
+    "LeLogout": ("lebattle.pages.auth", "logout_ui"),
+    "LeCareer": ("lebattle.pages.lecareer", "lecareer_ui"),
+    "LeAdmin": ("lebattle.pages.admin", "admin_ui"),
+}
+
+# Usernames allowed to see operator pages, comma-separated
+ADMINS = {name.strip() for name in os.environ.get("LEBATTLE_ADMINS", "").split(",") if name.strip()}
+
+
+def is_admin(username):
+    return username in ADMINS
+
+
+def load_page(name):
+    """Return the render function for a page, importing its module on first use"""
+    module_name, func_name = PAGES[name]
+    return getattr(importlib.import_module(module_name), func_name)
@@ -0,0 +1,99 @@
+"""LeAdmin page: operator view of rerun timings, battle memory, maintenance and profiling."""
+
+import time
+
+import streamlit as st
+
+from lebattle import maintenance, metrics, profiling
+from lebattle.checkpoints import checkpointer
+from lebattle.pages import is_admin
+from lebattle.sessions import registry
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def display_metrics():
+    st.markdown("### Timings")
+    rows = metrics.summary()
+    if not rows:
+        st.info("No reruns recorded yet.")
+    timings = [
+        {"metric": family, **labels, "count": count, "p50 ms": _ms(p50), "p95 ms": _ms(p95), "p99 ms": _ms(p99),
+         "mean ms": _ms(mean)}
+        for family, labels, count, p50, p95, p99, mean in rows if family.endswith("_seconds")
+    ]
+    counts = [
+        {"metric": family, **labels, "count": count, "p50": p50, "p95": p95, "p99": p99, "mean": round(mean, 1)}
+        for family, labels, count, p50, p95, p99, mean in rows if not family.endswith("_seconds")
+    ]
+    if timings:
+        st.dataframe(timings, use_container_width=True)
+    if counts:
+        st.markdown("### DB calls and elements per rerun")
+        st.dataframe(counts, use_container_width=True)
+    st.download_button("Download Prometheus metrics", metrics.prometheus_text(), file_name="lebattle.prom")
+
+
+def display_battle_memory():
+    st.markdown("### Battles in memory")
+    stats = registry.stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Resident battles", stats["resident"], f"{stats['resident_bytes'] / 1024:.0f} KB")
+    col2.metric("Parked battles", stats["parked"], f"{stats['restores']} restored")
+    col3.metric("Checkpoint rows written", checkpointer.writes, f"{checkpointer.coalesced} coalesced")
+
+
+def display_maintenance():
+    st.markdown("### Maintenance")
+    if not maintenance.ENABLED:
+        st.info("The maintenance scheduler is off in this process (LEBATTLE_MAINTENANCE=0).")
+        return
+    rows = maintenance.scheduler.status()
+    for row in rows:
+        row["last run"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["last run"])) if row["last run"] else None
+        row["last s"] = None if row["last s"] is None else round(row["last s"], 3)
+        row["next in s"] = None if row["next in s"] is None else round(row["next in s"])
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        name = st.selectbox("Task", [row["task"] for row in rows], key="maintenance_task")
+    with col2:
+        if st.button("Run now", use_container_width=True):
+            if not maintenance.scheduler.run_now(name):
+                st.warning(f"{name} is running already.")
+
+
+def display_profiling():
+    st.markdown("### Profiling")
+    st.caption(f"Armed users' next reruns are captured with cProfile and tracemalloc into {profiling.PROFILE_DIR}/")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        username = st.text_input("Username to profile", value=st.session_state.username, key="profile_username")
+    with col2:
+        reruns = st.number_input("Reruns", min_value=0, max_value=50, value=5, key="profile_reruns")
+    if st.button("Arm profiler", use_container_width=True):
+        profiling.arm(username.strip(), int(reruns))
+        st.rerun()
+    armed = profiling.armed()
+    if armed:
+        st.markdown("Armed: " + ", ".join(f"**{name}** ({left} reruns)" for name, left in armed.items()))
+    captures = profiling.recent_captures()
+    if captures:
+        st.dataframe([{"file": name, "KB": round(size / 1024, 1)} for name, size in captures], use_container_width=True)
+
+
+def admin_ui():
+    if not is_admin(st.session_state.get("username")):
+        st.error("LeAdmin is for operators only.")
+        st.stop()
+
+    st.markdown("<h1 class='game-title'>LeAdmin</h1>", unsafe_allow_html=True)
+    display_metrics()
+    display_battle_memory()
+    display_maintenance()
+    display_profiling()
+    if st.button("Reset metrics", use_container_width=True):
+        metrics.reset()
+        st.rerun()
@@ -0,0 +1,115 @@
+"""Login, Register and LeLogout pages."""
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from lebattle.assets import asset_image
+from lebattle.db import authenticate_user, register_user
+from lebattle.sessions import registry, session_key
+
+
+def login_ui():
+    st.markdown("<h1 class='auth-title'>Welcome Back</h1>", unsafe_allow_html=True)
+    st.markdown("<p class='auth-subtitle'>Sign in to continue your battle</p>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='auth-logo'>", unsafe_allow_html=True)
+    st.image(asset_image("login_logo"), width=350)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    username = st.text_input("Username", key="login_username")
+    password = st.text_input("Password", type="password", key="login_password")
+
+    col1, col2, col3 = st.columns([1,3,1])
+    with col2:
+        if st.button("Sign In", use_container_width=True):
+            if authenticate_user(username, password):
+                st.session_state.logged_in = True
+                st.session_state.username = username
+                st.session_state.resume_battle = True
+                st.success(f"Welcome, {username}!")
+                st.session_state.page = "LePlay"
+                st.rerun()
+            else:
+                st.error("Incorrect username or password")
+
+    st.markdown("<div class='auth-footer'>", unsafe_allow_html=True)
+    st.markdown("Don't have an account? Register an account now! Click the arrow in the top left!", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # JavaScript to handle the register link click
+    st.markdown("""
+    <script>
+        document.getElementById('register-link').addEventListener('click', function(e) {
+            e.preventDefault();
+            window.location.href = window.location.pathname + "?page=Register";
+        });
+    </script>
+    """, unsafe_allow_html=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def register_ui():
+    st.markdown("<h1 class='auth-title'>Create Account</h1>", unsafe_allow_html=True)
+    st.markdown("<p class='auth-subtitle'>Join the battle against LeBron</p>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='auth-logo'>", unsafe_allow_html=True)
+    st.image(asset_image("register_logo"), width=250)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    username = st.text_input("Choose a Username", key="register_username")
+    password = st.text_input("Create Password", type="password", key="register_password")
+
+    col1, col2, col3 = st.columns([1,3,1])
+    with col2:
+        if st.button("Create Account", use_container_width=True):
+            if not username.strip():
+                st.error("Choose a username.")
+            elif register_user(username, password):
+                st.success("Account created successfully!")
+                st.session_state.page = "Login"
+                st.rerun()
+            else:
+                st.error("Username already exists.")
+
+    st.markdown("<div class='auth-footer'>", unsafe_allow_html=True)
+    st.markdown("Already have an account? Sign in!", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # JavaScript to handle the login link click
+    st.markdown("""
+    <script>
+        document.getElementById('login-link').addEventListener('click', function(e) {
+            e.preventDefault();
+            window.location.href = window.location.pathname + "?page=Login";
+        });
+    </script>
+    """, unsafe_allow_html=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def logout_ui():
+    st.markdown("<h1 class='auth-title'>Log Out</h1>", unsafe_allow_html=True)
+    st.markdown("<p class='auth-subtitle'>Are you sure you want to leave?</p>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div style='text-align: center; margin: 30px 0;'>", unsafe_allow_html=True)
+    st.image(asset_image("logout_banner"), width=700)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Cancel", use_container_width=True):
+            st.session_state.page = "LePlay"
+            st.rerun()
+    with col2:
+        if st.button("Confirm LeLogout", use_container_width=True):
+            # The battle stays checkpointed for the user's next login; drop it from this tab
+            registry.put(session_key(get_script_run_ctx().session_id, st.session_state.username), None)
+            st.session_state.clear()
+            st.success("Logged out successfully!")
+            st.session_state.page = "Login"
+            st.rerun()
+
+    st.markdown("</div>", unsafe_allow_html=True)
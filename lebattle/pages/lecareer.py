@@ -0,0 +1,232 @@
+"""LeCareer page: LeBron's career journey.
+
+The content lives in lebattle/data/career.json (timeline, one entry per era
+with its story, stats, achievements and image, and the legacy section). The
+page is rendered to a single HTML fragment once per process and re-rendered
+only when the data file or the asset manifest changes, so adding an era is a
+data change only.
+"""
+
+import html
+import os
+import re
+from functools import lru_cache
+
+import streamlit as st
+
+from lebattle.assets import asset_url, cached_json, get_manifest
+
+CAREER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "career.json")
+
+CAREER_CSS = """
+<style>
+    /* LeCareer specific styling */
+    .career-section {
+        background-color: white;
+        border-radius: 15px;
+        padding: 25px;
+        margin-bottom: 30px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+        border-left: 6px solid #4880EC;
+    }
+
+    .career-title {
+        font-size: 1.8rem;
+        margin-bottom: 15px;
+        font-weight: bold;
+    }
+
+    .career-years {
+        font-size: 1.2rem;
+        color: #666;
+        margin-bottom: 15px;
+    }
+
+    .career-columns {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 25px;
+    }
+
+    .career-text {
+        flex: 3 1 300px;
+    }
+
+    .career-picture {
+        flex: 2 1 200px;
+    }
+
+    .career-picture img {
+        width: 100%;
+        border-radius: 10px;
+    }
+
+    .career-stats {
+        background-color: #f8f9fa;
+        padding: 15px;
+        border-radius: 10px;
+        margin: 15px 0;
+    }
+
+    .career-achievements {
+        margin-top: 15px;
+    }
+
+    .achievement-badge {
+        display: inline-block;
+        background-color: #4880EC;
+        color: white;
+        border-radius: 20px;
+        padding: 5px 10px;
+        margin-right: 8px;
+        margin-bottom: 8px;
+        font-size: 0.9rem;
+    }
+
+    .achievement-badge.championship {
+        background-color: #FFD700; /* Gold for championships */
+        color: #333;
+    }
+
+    .achievement-badge.mvp {
+        background-color: #C0C0C0; /* Silver for MVPs */
+        color: #333;
+    }
+
+    .timeline-container {
+        border-left: 4px solid #4880EC;
+        border-image: linear-gradient(to bottom, #4880EC, #019CAD) 1;
+        padding-left: 25px;
+        margin: 30px 0;
+    }
+
+    .timeline-entry {
+        position: relative;
+        padding: 10px 0;
+    }
+
+    .timeline-point {
+        position: absolute;
+        left: -37px;
+        top: 10px;
+        width: 20px;
+        height: 20px;
+        border-radius: 50%;
+        background-color: #4880EC;
+        border: 3px solid white;
+        box-shadow: 0 0 0 3px rgba(72, 128, 236, 0.2);
+    }
+
+    .career-metrics {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 15px;
+        margin-top: 15px;
+    }
+
+    .career-metric {
+        flex: 1 1 150px;
+        background-color: #f8f9fa;
+        border-radius: 10px;
+        padding: 15px;
+    }
+
+    .career-metric-value {
+        font-size: 2rem;
+        font-weight: bold;
+    }
+
+    .career-metric-delta {
+        color: #09ab3b;
+        font-size: 0.9rem;
+    }
+</style>
+"""
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+
+def _text(value):
+    """Escape text for HTML, turning **bold** markers into <strong>"""
+    return _BOLD.sub(r"<strong>\1</strong>", html.escape(value, quote=False))
+
+
+def _paragraphs(paragraphs):
+    return "".join(f"<p>{_text(p)}</p>" for p in paragraphs)
+
+
+def _timeline_html(timeline):
+    entries = "".join(
+        f"<div class='timeline-entry'><div class='timeline-point'></div>"
+        f"<strong>{_text(point['year'])}</strong> - {_text(point['text'])}</div>"
+        for point in timeline
+    )
+    return f"<div class='timeline-container'>{entries}</div>"
+
+
+def _era_html(era):
+    stats = "".join(f"<li>{_text(label)}: {_text(value)}</li>" for label, value in era["stats"])
+    badges = "".join(
+        f"<span class='achievement-badge {html.escape(a['kind'])}'>{_text(a['text'])}</span>"
+        for a in era["achievements"]
+    )
+    return (
+        f"<div class='career-section' style='border-left-color: {html.escape(era['color'])};'>"
+        f"<h2 class='career-title'>{_text(era['title'])}</h2>"
+        f"<div class='career-years'>{_text(era['years'])}</div>"
+        f"<div class='career-columns'><div class='career-text'>{_paragraphs(era['story'])}"
+        f"<div class='career-stats'><strong>{_text(era['stats_title'])}:</strong><ul>{stats}</ul></div>"
+        f"<div class='career-achievements'><strong>Key Achievements:</strong><br>{badges}</div></div>"
+        f"<div class='career-picture'><img src='{html.escape(asset_url(era['image']))}'"
+        f" alt='{html.escape(era['title'])}'></div></div></div>"
+    )
+
+
+def _legacy_html(legacy):
+    metrics = "".join(
+        f"<div class='career-metric'><div>{_text(m['label'])}</div>"
+        f"<div class='career-metric-value'>{_text(m['value'])}</div>"
+        f"<div class='career-metric-delta'>&uarr; {_text(m['delta'])}</div></div>"
+        for m in legacy["metrics"]
+    )
+    return (
+        f"<div class='career-section'><h2 class='career-title'>{_text(legacy['title'])}</h2>"
+        f"{_paragraphs(legacy['story'])}<div class='career-metrics'>{metrics}</div></div>"
+    )
+
+
+@lru_cache(maxsize=4)
+def _render(career_mtime, manifest_version):
+    # The arguments only key the cache: image URLs change when the asset store is rebuilt
+    career = cached_json(CAREER_PATH)
+    return (
+        CAREER_CSS
+        + f"<h1 class='game-title'>{_text(career['title'])}</h1>"
+        + f"<p style='text-align: center; margin-bottom: 30px;'>{_text(career['subtitle'])}</p>"
+        + _timeline_html(career["timeline"])
+        + "".join(_era_html(era) for era in career["eras"])
+        + _legacy_html(career["legacy"])
+    )
+
+
+def career_html():
+    """The whole LeCareer page as one HTML fragment, rebuilt only when its inputs change"""
+    manifest = get_manifest()
+    return _render(os.stat(CAREER_PATH).st_mtime_ns, manifest and manifest["version"])
+
+
+def lecareer_ui():
+    """Display the LeCareer page showing LeBron's career journey with text and images"""
+
+    # Only allow access if logged in
+    if not st.session_state.get("logged_in", False):
+        st.error("You must be logged in to view LeCareer!")
+        st.session_state.page = "Login"
+        st.rerun()
+
+    st.markdown(career_html(), unsafe_allow_html=True)
+
+    # Return to game button
+    if st.button("Return to Game", use_container_width=True):
+        st.session_state.page = "LePlay"
+        st.rerun()
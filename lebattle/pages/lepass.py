@@ -0,0 +1,313 @@
+"""LePASS page: level progress, the LeBron collection and avatar equip."""
+
+import os
+
+import streamlit as st
+
+from lebattle.assets import cached_json
+from lebattle.collectibles import get_catalog
+from lebattle.db import get_user_stats
+from lebattle.progression import get_table
+from lebattle.thumbnails import gallery_html, image_source
+
+# Written by `python -m lebattle.xpsim --write-guide` from the reward formula and simulated careers
+XP_GUIDE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "xp_guide.json")
+
+
+def add_lepass_css():
+    """Add LePASS-specific CSS styles"""
+
+    st.markdown("""
+    <style>
+        /* LePASS Progress Bar */
+        .lepass-progress-container {
+            width: 100%;
+            height: 30px;
+            background-color: #eee;
+            border-radius: 15px;
+            margin: 10px 0;
+            position: relative;
+            overflow: hidden;
+            box-shadow: inset 0 1px 3px rgba(0,0,0,0.2);
+        }
+
+        .lepass-progress-bar {
+            height: 100%;
+            background: linear-gradient(90deg, #4880EC, #019CAD);
+            border-radius: 15px;
+            transition: width 0.5s ease;
+        }
+
+        .lepass-progress-text {
+            position: absolute;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            color: #333;
+            font-weight: bold;
+            text-shadow: 0 0 3px rgba(255,255,255,0.5);
+        }
+
+        /* LePASS Level Cards */
+        .level-card {
+            background-color: white;
+            border-radius: 10px;
+            padding: 15px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            margin-bottom: 15px;
+            border-left: 4px solid #4880EC;
+        }
+
+        .current-level-card {
+            border-left: 4px solid #FF416C;
+            background-color: #fff9f9;
+        }
+
+        /* LePASS Section Headers */
+        .lepass-section-header {
+            border-bottom: 2px solid #4880EC;
+            padding-bottom: 8px;
+            margin-top: 30px;
+            margin-bottom: 20px;
+            color: #333;
+        }
+
+        /* LeBron Gallery */
+        .lebron-gallery-container {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            justify-content: center;
+        }
+
+        .lebron-gallery-item {
+            position: relative;
+            width: 120px;
+            text-align: center;
+            margin-bottom: 15px;
+        }
+
+        .lebron-gallery-item img {
+            border-radius: 8px;
+            box-shadow: 0 3px 6px rgba(0,0,0,0.1);
+            transition: transform 0.2s ease;
+        }
+
+        .lebron-gallery-item img:hover {
+            transform: scale(1.05);
+            box-shadow: 0 5px 15px rgba(0,0,0,0.2);
+        }
+
+        .lebron-sprite {
+            width: 100px;
+            height: 100px;
+            margin: 0 auto;
+            border-radius: 8px;
+            background-repeat: no-repeat;
+            box-shadow: 0 3px 6px rgba(0,0,0,0.1);
+        }
+
+        .lebron-gallery-caption {
+            margin-top: 5px;
+            font-size: 0.9rem;
+            color: #333;
+        }
+
+        /* Rarity colors */
+        .rarity-common {
+            border-left: 4px solid #7E7F7E; /* Gray */
+        }
+
+        .rarity-uncommon {
+            border-left: 4px solid #4AAA4E; /* Green */
+        }
+
+        .rarity-rare {
+            border-left: 4px solid #3B78DB; /* Blue */
+        }
+
+        .rarity-epic {
+            border-left: 4px solid #9D43D9; /* Purple */
+        }
+
+        .rarity-legendary {
+            border-left: 4px solid #FFA500; /* Orange */
+        }
+    </style>
+    """, unsafe_allow_html=True)
+
+def lepass_ui():
+    """Display the LePASS progression UI with gallery of unlocked LeBron images"""
+
+    # Only allow access if logged in
+    if not st.session_state.get("logged_in", False):
+        st.error("You must be logged in to view LePASS!")
+        st.session_state.page = "Login"
+        st.rerun()
+
+    # Add LePASS-specific CSS
+    add_lepass_css()
+
+    username = st.session_state.username
+    user_stats = get_user_stats(username)
+    current_level = user_stats["level"]
+    current_xp = user_stats["xp"]
+    wins = user_stats["wins"]
+    losses = user_stats["losses"]
+
+    # Calculate progress to next level
+    progression = get_table()
+    max_level = progression.max_level
+    progress = progression.get_level_progress(current_xp, current_level)
+    next_level_xp = progression.xp_required_for_level(current_level + 1)
+    xp_needed = next_level_xp - current_xp
+
+    # Get current LeBron image
+    catalog = get_catalog()
+    current_image_url = image_source(catalog.for_level(current_level))
+    next_image_url = image_source(catalog.for_level(current_level + 1)) if current_level < max_level else current_image_url
+
+    # UI Header
+    st.markdown("<h1 class='game-title'>LePASS™ Battle Pass</h1>", unsafe_allow_html=True)
+
+    # Player Stats Section
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.image(current_image_url, caption=f"Level {current_level} LeBron", width=250)
+
+    with col2:
+        st.markdown(f"### Welcome to your LePASS, {username}!")
+        st.markdown(f"**Current Level:** {current_level}/{max_level}")
+
+        # Progress bar with custom styling
+        st.markdown(
+            f"""
+            <div class="lepass-progress-container">
+                <div class="lepass-progress-bar" style="width: {progress * 100}%"></div>
+                <div class="lepass-progress-text">{current_xp} / {next_level_xp} XP</div>
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+
+        if current_level < max_level:
+            st.markdown(f"**XP needed for Level {current_level + 1}:** {xp_needed} XP")
+        else:
+            st.markdown("**MAX LEVEL REACHED!** You've collected all LeBron images!")
+
+        st.markdown(f"**Battle Record:** {wins} Wins / {losses} Losses")
+
+    # Rewards Preview Section
+    st.markdown("### Next Reward")
+    if current_level < max_level:
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            st.image(next_image_url, caption=f"Level {current_level + 1} LeBron", width=200)
+        with col2:
+            st.markdown(f"**Unlock at Level {current_level + 1}**")
+            st.markdown(f"Earn **{xp_needed}** more XP to unlock!")
+            st.markdown("Win battles against LeBron to earn XP. Higher difficulties and better performance grant more XP!")
+    else:
+        st.success(f"CONGRATULATIONS! You've reached MAX LEVEL and collected all {len(catalog)} LeBron images!")
+
+    # NEW SECTION: LeBron Gallery
+    st.markdown("<h3 class='lepass-section-header'>Your LeBron Collection</h3>", unsafe_allow_html=True)
+
+    # Add a gallery filter option
+    view_options = ["All Unlocked", "By Rarity"]
+    view_mode = st.radio("View mode:", view_options, horizontal=True)
+
+    # Generate the gallery of unlocked LeBron images
+    if view_mode == "All Unlocked":
+        st.markdown("### Unlocked LeBrons")
+
+        # All collectibles at or below current_level are unlocked. The grid is a
+        # single element drawn from the rarity sprite sheets.
+        st.markdown(gallery_html(catalog.unlocked(current_level)), unsafe_allow_html=True)
+
+    else:  # By Rarity
+        # Group LeBron images by rarity tiers
+        st.markdown("### Collection By Rarity")
+
+        # Display images grouped by the catalog's rarity tiers
+        legendary = catalog.rarities[-1].name
+        for rarity in catalog.rarities:
+            unlocked = catalog.unlocked(current_level, rarity.name)
+            if unlocked:  # Only show rarities that have unlocked items
+                st.markdown(f"#### {rarity.label}")
+
+                # Create expandable section for each rarity tier
+                with st.expander("Show Collection", expanded=rarity.name == legendary):
+                    st.markdown(gallery_html(unlocked), unsafe_allow_html=True)
+
+    # Locked images section
+    if current_level < max_level:
+        remaining = max_level - current_level
+        st.markdown(f"### Locked LeBrons ({remaining} remaining)")
+        st.info(f"You still have {remaining} LeBron images to unlock! Continue winning battles to unlock more.")
+
+        # Show a teaser of what's to come
+        teaser_level = min(current_level + 10, max_level)
+        st.markdown(f"Reach level {teaser_level} to unlock:")
+        teaser_image = image_source(catalog.for_level(teaser_level))
+        st.image(teaser_image, caption=f"Level {teaser_level} Preview", width=150)
+
+    # XP Earning Guide
+    st.markdown("<h3 class='lepass-section-header'>How to Earn XP</h3>", unsafe_allow_html=True)
+
+    guide = cached_json(XP_GUIDE_PATH)
+    if guide:
+        for col, (difficulty, xp) in zip(st.columns(len(guide["xp"])), guide["xp"].items()):
+            with col:
+                st.markdown(f"#### {difficulty} Difficulty")
+                st.markdown(f"- Win: {xp['win'][0]}-{xp['win'][1]} XP")
+                st.markdown(f"- Loss: {xp['loss']} XP")
+                st.markdown(f"- Tie: {xp['tie']} XP")
+                milestones = guide["median_battles"][difficulty]
+                st.caption("Typical battles to reach " + ", ".join(
+                    f"level {level}: {battles}" for level, battles in milestones.items() if battles))
+
+    st.info("💡 **TIP:** Higher health at the end of battle = more XP!")
+
+    # Level Progression Chart
+    st.markdown("<h3 class='lepass-section-header'>Level Progression</h3>", unsafe_allow_html=True)
+
+    # Highlight current level in chart (the spec is built once per level and cached)
+    st.vega_lite_chart(progression.chart_spec(current_level))
+
+    # Note about final levels
+    st.markdown("""
+        **Note:** Levels 1-50 increase linearly, while levels 51-60 require exponentially more XP.
+        The final 10 levels are meant to be challenging to achieve!
+    """)
+
+    st.markdown("---")
+    st.markdown("## Equip a LeBron Avatar")
+
+    # Let them pick which of their unlocked LeBrons to equip
+    equippable_choice = st.selectbox(
+        "Choose one of your unlocked LeBrons to equip as your avatar:",
+        catalog.unlocked(current_level),
+        format_func=lambda collectible: f"Level {collectible.level}"
+    )
+
+    if st.button("Equip This LeBron", use_container_width=True):
+        # Store the chosen collectible's ID in session_state
+        st.session_state.equipped_lebron = equippable_choice.id
+
+        st.success(f"You have equipped the LeBron from Level {equippable_choice.level} as your player avatar!")
+        st.image(image_source(equippable_choice), caption=f"Equipped Level {equippable_choice.level} LeBron")
+
+    # Info note if none equipped yet
+    if "equipped_lebron" not in st.session_state:
+        st.info("Currently using the default player profile.")
+    else:
+        st.markdown("### Currently Equipped:")
+        st.image(image_source(catalog.by_id[st.session_state.equipped_lebron]), width=200)
+
+
+    # Return to game button
+    if st.button("Return to Game", use_container_width=True):
+        st.session_state.page = "LePlay"
+        st.rerun()
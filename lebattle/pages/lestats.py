@@ -0,0 +1,109 @@
+"""LeStats page: win rates, battle lengths, XP and move choices, for you or everyone.
+
+Everything above the deep dive is read from the stats aggregates db.save_replays
+keeps up to date (a row per day and difficulty, all-time totals, move
+counts), so the page costs the same few small queries however many battles
+are stored. The deep dive is the exception: on request it streams the raw
+replay rows in chunks into pandas.
+"""
+
+import time
+
+import pandas as pd
+import streamlit as st
+
+from lebattle.battle import DIFFICULTIES, MOVES
+from lebattle.db import replay_rows, stats_actions, stats_daily, stats_totals
+
+DAYS = 90  # Days of history in the charts
+CHUNK_ROWS = 5000
+ROUND_BINS = [0, 5, 10, 15, 20, 30, 50, 10**9]
+ROUND_LABELS = ["1-5", "6-10", "11-15", "16-20", "21-30", "31-50", "51+"]
+
+
+def display_totals(totals):
+    st.markdown("### All-time")
+    rows = []
+    for difficulty in DIFFICULTIES:
+        t = totals.get(difficulty)
+        if not t:
+            continue
+        rows.append({
+            "Difficulty": difficulty,
+            "Battles": t["battles"],
+            "Win rate": f"{t['wins'] / t['battles']:.0%}",
+            "Avg rounds": round(t["rounds"] / t["battles"], 1),
+            "Avg HP left on wins": round(t["win_margin"] / t["wins"], 1) if t["wins"] else None,
+            "LeBron's HP left on losses": round(t["loss_margin"] / t["losses"], 1) if t["losses"] else None,
+            "XP earned": t["xp"],
+        })
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+def display_daily(daily):
+    if not daily:
+        st.info(f"No battles in the last {DAYS} days.")
+        return
+    frame = pd.DataFrame(daily)
+    frame["day"] = pd.to_datetime(frame["day"])
+    by_day = frame.pivot_table(index="day", columns="difficulty", values=["wins", "battles"], aggfunc="sum")
+    st.markdown(f"### Win rate per difficulty, last {DAYS} days")
+    st.line_chart(by_day["wins"] / by_day["battles"])
+    st.markdown("### XP earned per day")
+    st.bar_chart(frame.groupby("day")["xp"].sum())
+
+
+def display_actions(actions):
+    st.markdown("### Moves played")
+    frame = pd.DataFrame([{"move": action, "difficulty": difficulty, "times": count}
+                          for (difficulty, action), count in actions.items()])
+    table = frame.pivot_table(index="move", columns="difficulty", values="times", aggfunc="sum", fill_value=0)
+    table = table.reindex([move for move in MOVES if move in table.index])
+    st.bar_chart(table / table.sum())
+    st.caption("Share of each difficulty's moves.")
+
+
+def deep_dive(username):
+    """Battle length against outcome, and win rate by hour of day, from every raw replay row"""
+    lengths, hours, rows = None, None, 0
+    progress = st.progress(0.0, text="Reading battles...")
+    t0 = time.perf_counter()
+    for chunk in replay_rows(username, CHUNK_ROWS):
+        frame = pd.DataFrame.from_records(chunk, columns=["id", "username", "difficulty", "outcome", "rounds",
+                                                          "created_at"])
+        frame["length"] = pd.cut(frame["rounds"], ROUND_BINS, labels=ROUND_LABELS)
+        frame["hour"] = pd.to_datetime(frame["created_at"], unit="s").dt.hour
+        counts = pd.crosstab(frame["length"], frame["outcome"])
+        lengths = counts if lengths is None else lengths.add(counts, fill_value=0)
+        by_hour = frame.assign(won=frame["outcome"] == "win").groupby("hour")["won"].agg(["sum", "count"])
+        hours = by_hour if hours is None else hours.add(by_hour, fill_value=0)
+        rows += len(chunk)
+        progress.progress(0.5, text=f"Read {rows} battles...")  # The total isn't known up front
+    progress.progress(1.0, text=f"Read {rows} battles in {time.perf_counter() - t0:.2f}s")
+    if not rows:
+        st.info("No battles to dig into yet.")
+        return
+    st.markdown("#### Outcome by battle length")
+    st.dataframe(lengths.reindex(ROUND_LABELS).fillna(0).astype(int), use_container_width=True)
+    st.markdown("#### Win rate by hour of day (UTC)")
+    st.bar_chart(hours["sum"] / hours["count"])
+
+
+def lestats_ui():
+    st.markdown("<h1 class='game-title'>LeStats</h1>", unsafe_allow_html=True)
+    scope = st.radio("Battles", ["Mine", "Everyone's"], horizontal=True, key="stats_scope")
+    username = st.session_state.username if scope == "Mine" else ""
+
+    totals = stats_totals(username)
+    if not totals:
+        st.info("No battles recorded yet. Play one on LePlay!")
+        return
+    display_totals(totals)
+    since = time.strftime("%Y-%m-%d", time.gmtime(time.time() - DAYS * 86400))
+    display_daily(stats_daily(username, since))
+    display_actions(stats_actions(username))
+
+    with st.expander("Deep dive: every raw battle"):
+        st.caption(f"Reads the stored battles {CHUNK_ROWS} at a time; slower the more battles there are.")
+        if st.button("Run deep dive", use_container_width=True):
+            deep_dive(username or None)
@@ -0,0 +1,364 @@
+"""LePlay page: difficulty selection, the battle screen and battle results."""
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from lebattle import coach
+from lebattle.assets import asset_image
+from lebattle.battle import new_battle, play_round
+from lebattle.checkpoints import checkpointer
+from lebattle.collectibles import get_catalog
+from lebattle.db import get_user_stats, record_battle
+from lebattle.game import TIE_XP, calculate_xp_reward
+from lebattle.replay import encode
+from lebattle.sessions import registry, session_key
+from lebattle.thumbnails import image_source
+
+COACH_POLL_SECONDS = 0.25
+COACH_MOVES = [("attack", "🏀 Attack"), ("defend", "🛡️ Defend"), ("rest", "💤 Rest"), ("special", "⭐ Special")]
+
+
+def display_character_card(character, is_player=True):
+    card_class = "player-card" if is_player else "lebron-card"
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.markdown("<div class='custom-avatar-container'>", unsafe_allow_html=True)
+        if is_player:
+            # If the user has equipped a custom LeBron, use that image
+            if "equipped_lebron" in st.session_state and st.session_state.equipped_lebron:
+                avatar_url = image_source(get_catalog().by_id[st.session_state.equipped_lebron])
+            else:
+                # Fall back to the original default if nothing is equipped
+                avatar_url = asset_image("default_avatar")
+
+            st.image(avatar_url, caption=character.name, width=150)
+        else:
+            # LeBron's own image stays the same
+            st.image(asset_image("lebron_avatar"),
+                    caption=character.name, width=150)
+    with col2:
+        st.markdown(f"<div class='stat-label'>Health: {character.health}/{character.max_health}</div>", unsafe_allow_html=True)
+        health_percentage = character.health / character.max_health if character.max_health > 0 else 0
+        st.progress(health_percentage)
+        st.markdown(f"<div class='stat-label'>Stamina: {character.stamina}/{character.max_stamina}</div>", unsafe_allow_html=True)
+        stamina_percentage = character.stamina / character.max_stamina if character.max_stamina > 0 else 0
+        st.progress(stamina_percentage)
+        st.markdown(f"<div class='stat-label'>Special Meter: {character.special_meter}/100</div>", unsafe_allow_html=True)
+        special_percentage = character.special_meter / 100
+        st.progress(special_percentage)
+        if character.is_defending:
+            st.markdown("🛡️ **Defending**")
+
+def initialize_session_state():
+    if "difficulty" not in st.session_state:
+        st.session_state.difficulty = "Medium"
+    if "tutorial_shown" not in st.session_state:
+        st.session_state.tutorial_shown = False
+
+def battle_key():
+    return session_key(get_script_run_ctx().session_id, st.session_state.username)
+
+def get_battle():
+    """This session and user's BattleState from the session registry, None between battles"""
+    return registry.get(battle_key())
+
+def save_battle(battle):
+    """Store this session's battle after changing it, or clear it with None"""
+    registry.put(battle_key(), battle)
+    checkpointer.checkpoint(st.session_state.username, battle)
+
+def resume_battle():
+    """Pick up the user's unfinished battle from its last checkpoint, if there is one"""
+    if get_battle() is None:
+        battle = checkpointer.load(st.session_state.username)
+        if battle is not None:
+            registry.put(battle_key(), battle)
+            st.session_state.difficulty = battle.difficulty
+
+def display_battle_log(battle):
+    st.markdown("### 📜 Battle Log")
+    with st.container():
+        for entry_type, clock, message in battle.log_entries():
+            st.markdown(f"<div class='log-entry {entry_type}-log'><small>{clock}</small> {message}</div>", unsafe_allow_html=True)
+
+def end_battle_with_xp(battle, won):
+    """Update XP, wins, and losses after battle completion"""
+    # Check if XP was already awarded for this battle
+    if battle.results is not None:
+        # Just return the current stats without updating
+        return get_user_stats(st.session_state.username)
+
+    player, lebron = battle.player, battle.lebron
+    difficulty = battle.difficulty
+    username = st.session_state.username
+
+    # Calculate XP reward
+    xp_earned = calculate_xp_reward(player.health, lebron.health, difficulty, won)
+
+    # Make sure we have current user stats before updating
+    current_stats = get_user_stats(username)
+
+    # Now update the user's XP, wins, and losses, and store the replay, in one transaction
+    with checkpointer.settle(username):
+        leveled_up = record_battle(username, difficulty, "win" if won else "loss", encode(battle), xp_earned)
+
+    # Get updated stats
+    updated_stats = get_user_stats(username)
+
+    # Store results on the battle, which also marks its XP as awarded
+    battle.results = {
+        "xp_earned": xp_earned,
+        "leveled_up": leveled_up,
+        "new_level": updated_stats["level"],
+        "total_xp": updated_stats["xp"],
+        "wins": updated_stats["wins"],
+        "losses": updated_stats["losses"]
+    }
+    save_battle(battle)
+
+    return updated_stats
+
+
+def display_coach_table(rounds):
+    """A row per analysed round: the win chance each move had, and the best of them"""
+    rows, turning_point = [], None
+    for round, action, result in rounds:
+        if not result.ready():
+            continue
+        _, estimates = result.get()
+        best = max(estimates, key=estimates.get)
+        row = {"Round": round, "You played": action}
+        row.update({label: f"{estimates[move]:.0%}" if move in estimates else "-" for move, label in COACH_MOVES})
+        row["Best move"] = best
+        rows.append(row)
+        gain = estimates[best] - estimates[action]
+        if turning_point is None or gain > turning_point[0]:
+            turning_point = (gain, round, action, best, estimates)
+    if rows:
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+    if turning_point and turning_point[0] >= 0.05:
+        gain, round, action, best, estimates = turning_point
+        st.markdown(f"**Turning point:** in round {round}, **{best}** instead of **{action}** would have taken "
+                    f"your chances from {estimates[action]:.0%} to {estimates[best]:.0%}.")
+
+
+@st.fragment(run_every=COACH_POLL_SECONDS)
+def display_coach_progress(rounds):
+    done = sum(result.ready() for _, _, result in rounds)
+    if done == len(rounds):
+        st.rerun()  # Redraw once without polling
+    st.progress(done / len(rounds), text=f"Analysing round {done + 1} of {len(rounds)}...")
+    display_coach_table(rounds)
+
+
+def display_coach(battle):
+    """What each move would have done for the player's chances, round by round (see lebattle.coach)"""
+    st.markdown("### 🧠 Coach")
+    st.caption(f"Win chances of every move you could have made, from {coach.ROLLOUTS} playouts of the rest "
+               "of the battle against the same LeBron.")
+    analysis = st.session_state.get("coach")
+    if analysis is None or analysis[0] != battle.seed:
+        analysis = (battle.seed, coach.analyze(encode(battle)))
+        st.session_state.coach = analysis
+    rounds = analysis[1]
+    if all(result.ready() for _, _, result in rounds):
+        display_coach_table(rounds)
+    else:
+        display_coach_progress(rounds)
+
+
+def display_game(battle):
+    st.markdown("<h1 class='game-title'>🏀 LeBron Boss Battle</h1>", unsafe_allow_html=True)
+    player = battle.player
+    lebron = battle.lebron
+    st.markdown(f"### Round {battle.round}")
+    col1, col2 = st.columns(2)
+    with col1:
+        display_character_card(player, is_player=True)
+    with col2:
+        display_character_card(lebron, is_player=False)
+
+    if player.is_alive() and lebron.is_alive():
+        # Player chooses action for this round
+        st.markdown("### Choose Your Action")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            attack_disabled = player.stamina < 15
+            if st.button("🏀 Attack", disabled=attack_disabled, use_container_width=True,
+                         help="Basic attack (Cost: 15 Stamina, +10 Special Meter)"):
+                play_round(battle, "attack")
+                save_battle(battle)
+                st.rerun()
+            st.markdown("<div class='move-info'>Costs 15 stamina<br>+10 special meter</div>", unsafe_allow_html=True)
+        with col2:
+            defend_disabled = player.stamina < 10
+            if st.button("🛡️ Defend", disabled=defend_disabled, use_container_width=True,
+                         help="Reduce incoming damage by 50% (Cost: 10 Stamina, +15 Special Meter)"):
+                play_round(battle, "defend")
+                save_battle(battle)
+                st.rerun()
+            st.markdown("<div class='move-info'>Costs 10 stamina<br>+15 special meter<br>Reduces damage by 50%</div>", unsafe_allow_html=True)
+        with col3:
+            if st.button("💤 Rest", use_container_width=True,
+                         help="Recover 25-40 Stamina (+5 Special Meter)"):
+                play_round(battle, "rest")
+                save_battle(battle)
+                st.rerun()
+            st.markdown("<div class='move-info'>Recover 25-40 stamina<br>+5 special meter</div>", unsafe_allow_html=True)
+        with col4:
+            special_disabled = player.special_meter < 100 or player.stamina < 25
+            if st.button("⭐ Special Attack", disabled=special_disabled, use_container_width=True,
+                         help="Powerful attack that deals massive damage (Requires: Full Special Meter, Costs: 25 Stamina)"):
+                play_round(battle, "special")
+                save_battle(battle)
+                st.rerun()
+            st.markdown("<div class='move-info'>Requires 100% special meter<br>Costs 25 stamina<br>Deals 40-60 damage</div>", unsafe_allow_html=True)
+    else:
+        st.markdown("<div class='game-over-container'>", unsafe_allow_html=True)
+
+        # ------------------- TIE CHECK -------------------
+        if player.health == 0 and lebron.health == 0:
+            st.markdown("## 🤝 TIE! 🤝")
+            st.markdown("### It's a draw! You and LeBron both fell at the same time.")
+
+            tie_xp = TIE_XP
+            if not hasattr(st.session_state, 'username'):
+                st.session_state.username = "Guest"
+            username = st.session_state.username
+
+            if battle.results is None:
+                with checkpointer.settle(username):
+                    record_battle(username, battle.difficulty, "tie", encode(battle), tie_xp)
+                battle.results = {"xp_earned": tie_xp}
+                save_battle(battle)
+
+            st.markdown(f"**TIE XP:** +{tie_xp} (No W/L changes)")
+
+            updated_stats = get_user_stats(username)
+            st.markdown(f"**Total XP:** {updated_stats['xp']} XP")
+            st.markdown(f"**Current Level:** {updated_stats['level']}")
+            st.markdown(f"**Record:** {updated_stats['wins']}W - {updated_stats['losses']}L")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Play Again", use_container_width=True):
+                    save_battle(None)
+                    st.rerun()
+            with col2:
+                if st.button("View LePASS", use_container_width=True):
+                    st.session_state.page = "LePASS"
+                    st.rerun()
+
+            st.markdown("</div>", unsafe_allow_html=True)
+            return
+        # ------------------- END TIE CHECK ----------------
+
+        # Determine battle outcome and award XP
+        won = player.is_alive()
+
+        # Set a default username if not present (for testing)
+        if not hasattr(st.session_state, 'username'):
+            st.session_state.username = "Guest"
+
+        # Call end_battle_with_xp to process battle results and store them on the battle
+        updated_stats = end_battle_with_xp(battle, won)
+
+        # Get battle results from the battle record
+        battle_results = battle.results
+        xp_earned = battle_results["xp_earned"]
+        leveled_up = battle_results["leveled_up"]
+        new_level = battle_results["new_level"]
+
+        if won:
+            st.markdown("## 🏆 VICTORY! 🏆")
+            st.markdown("### You defeated LeBron James!")
+            st.balloons()
+        else:
+            st.markdown("## 💀 DEFEAT! 💀")
+            st.markdown("### LeBron traded you!")
+
+        st.markdown(f"**Final Score:** Round {battle.round}")
+        st.markdown("**Battle Stats:**")
+        st.markdown(f"- Your remaining health: {player.health}/{player.max_health}")
+        st.markdown(f"- LeBron's remaining health: {lebron.health}/{lebron.max_health}")
+
+        # Display XP gained and current stats
+        st.markdown(f"**XP Earned:** +{xp_earned} XP")
+        st.markdown(f"**Total XP:** {battle_results['total_xp']} XP")
+        st.markdown(f"**Current Level:** {new_level}")
+        st.markdown(f"**Record:** {battle_results['wins']}W - {battle_results['losses']}L")
+
+        if leveled_up:
+            st.success(f"🎉 LEVEL UP! You reached Level {new_level}!")
+
+        if not won:
+            display_coach(battle)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Play Again", use_container_width=True):
+                save_battle(None)
+                st.session_state.pop("coach", None)
+                st.rerun()
+        with col2:
+            if st.button("View LePASS", use_container_width=True):
+                st.session_state.page = "LePASS"
+                st.rerun()
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    display_battle_log(battle)
+
+def display_difficulty_selection():
+    st.markdown("<h1 class='game-title'>LeBron Boss Battle</h1>", unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.image(asset_image("difficulty_banner"), width=500)
+    st.markdown("<div class='difficulty-card'>", unsafe_allow_html=True)
+    st.markdown("<h2>Choose Your Difficulty</h2>", unsafe_allow_html=True)
+    difficulty_options = {
+        "Easy": "LeBron has 100 HP and uses basic moves mostly at random.",
+        "Medium": "LeBron has 160 HP and plays more strategically.",
+        "Hard": "LeBron has 180 HP and uses advanced tactics and powerful combos.",
+        "Learned": "LeBron has 180 HP and plays what he taught himself in a million practice battles."
+    }
+    selected_difficulty = st.select_slider(
+        "Select difficulty:",
+        options=list(difficulty_options.keys()),
+        value=st.session_state.difficulty
+    )
+    st.info(difficulty_options[selected_difficulty])
+    st.session_state.difficulty = selected_difficulty
+    show_tutorial = st.checkbox("Show Tutorial", value=not st.session_state.tutorial_shown)
+    if show_tutorial:
+        st.markdown("### How to Play:")
+        st.markdown("""
+        1. **Attack** - Deal damage but costs stamina  
+        2. **Defend** - Reduce incoming damage by 50%  
+        3. **Rest** - Recover stamina  
+        4. **Special Attack** - Powerful move that requires a full special meter
+
+        Fill your special meter by performing actions. Win by reducing LeBron's health to zero!
+        """)
+        st.session_state.tutorial_shown = True
+    if st.button("Start Game", use_container_width=True):
+        save_battle(new_battle(st.session_state.difficulty))
+        st.rerun()
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def play_ui():
+    # Only allow access if logged in
+    if not st.session_state.get("logged_in", False):
+        st.error("You must be logged in to play!")
+        st.session_state.page = "Login"
+        st.rerun()
+    initialize_session_state()
+    # Set at login: continue a battle left unfinished by a restart, crash or closed tab
+    if st.session_state.pop("resume_battle", False):
+        resume_battle()
+    battle = get_battle()
+    if battle is None:
+        display_difficulty_selection()
+    else:
+        display_game(battle)
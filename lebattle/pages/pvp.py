@@ -0,0 +1,137 @@
+"""LePvP page: matchmaking lobby and live duels against another player."""
+
+import html
+import time
+
+import streamlit as st
+
+from lebattle import metrics
+from lebattle.game import legal_moves
+from lebattle.pvp import broker
+
+POLL_SECONDS = 1  # How often the lobby and the duel check the broker for news
+
+MOVE_BUTTONS = [
+    ("attack", "🏀 Attack", "Costs 15 stamina, +10 special meter"),
+    ("defend", "🛡️ Defend", "Costs 10 stamina, +15 special meter, halves damage taken"),
+    ("rest", "💤 Rest", "Recover 25-40 stamina, +5 special meter"),
+    ("special", "⭐ Special Attack", "Needs a full special meter and 25 stamina, deals 40-60 damage"),
+]
+
+
+def display_fighter(fighter, title):
+    st.markdown(f"#### {html.escape(title)}")
+    st.markdown(f"<div class='stat-label'>Health: {fighter.health}/{fighter.max_health}</div>", unsafe_allow_html=True)
+    st.progress(fighter.health / fighter.max_health)
+    st.markdown(f"<div class='stat-label'>Stamina: {fighter.stamina}/{fighter.max_stamina}</div>", unsafe_allow_html=True)
+    st.progress(fighter.stamina / fighter.max_stamina)
+    st.markdown(f"<div class='stat-label'>Special Meter: {fighter.special_meter}/100</div>", unsafe_allow_html=True)
+    st.progress(fighter.special_meter / 100)
+
+
+def display_duel_log(match, side):
+    st.markdown("### 📜 Duel Log")
+    for entry_side, clock, message in match.log_entries():
+        css = "system" if entry_side == "system" else "player" if entry_side == str(side) else "lebron"
+        st.markdown(f"<div class='log-entry {css}-log'><small>{clock}</small> {html.escape(message)}</div>",
+                    unsafe_allow_html=True)
+
+
+def record_turn_latency(match, side):
+    """Time from this player's last move to this rerun showing the round it resolved"""
+    seen = st.session_state.get("pvp_seen")
+    if seen != (match.id, match.round):
+        submitted_at = match.submitted_at[side]
+        if seen is not None and seen[0] == match.id and submitted_at is not None:
+            metrics.observe("pvp_turn_seconds", broker.clock() - submitted_at)
+        st.session_state.pvp_seen = (match.id, match.round)
+
+
+def display_moves(match, side):
+    me = match.fighters[side]
+    seconds_left = max(0, int(match.deadline - broker.clock()))
+    if match.moves[side] is not None:
+        st.info(f"Locked in **{match.moves[side]}**. Waiting for your opponent ({seconds_left}s left)...")
+        return
+    st.markdown(f"### Choose Your Move ({seconds_left}s left)")
+    legal = legal_moves(me)  # The broker refuses anything else
+    for col, (move, label, help_text) in zip(st.columns(4), MOVE_BUTTONS):
+        with col:
+            if st.button(label, disabled=move not in legal, use_container_width=True, help=help_text,
+                         key=f"pvp_{move}"):
+                broker.submit(st.session_state.username, move)
+                st.rerun(scope="fragment")
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def display_duel():
+    username = st.session_state.username
+    match = broker.match_for(username)
+    if match is None:
+        st.rerun()  # The match was dropped; back to the lobby
+    side = match.side(username)
+    record_turn_latency(match, side)
+
+    st.markdown(f"### Round {match.round}" if not match.over else "### Duel over")
+    col1, col2 = st.columns(2)
+    with col1:
+        display_fighter(match.fighters[side], f"{username} (you)")
+    with col2:
+        display_fighter(match.fighters[1 - side], match.usernames[1 - side])
+
+    if match.over:
+        if match.winner is None:
+            st.markdown("## 🤝 TIE! 🤝")
+        elif match.winner == username:
+            st.markdown("## 🏆 VICTORY! 🏆")
+        else:
+            st.markdown("## 😔 DEFEAT 😔")
+        if st.button("Back to Lobby", use_container_width=True):
+            broker.leave(username)
+            st.rerun()
+    else:
+        display_moves(match, side)
+        if st.button("Forfeit", key="pvp_forfeit"):
+            broker.leave(username)
+            st.rerun()
+    display_duel_log(match, side)
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def display_queue():
+    username = st.session_state.username
+    if broker.match_for(username) is not None:
+        st.rerun()  # Paired: redraw the page as a duel
+    waited = time.monotonic() - st.session_state.get("pvp_queued_at", time.monotonic())
+    st.info(f"Looking for an opponent... ({int(waited)}s)")
+    if st.button("Cancel", use_container_width=True):
+        broker.leave(username)
+        st.rerun()
+
+
+def display_lobby():
+    username = st.session_state.username
+    if broker.waiting(username):
+        display_queue()
+        return
+    st.markdown("Duel another player in real time. Both of you lock in a move each round, "
+                f"and the round resolves once both moves are in or after {int(broker.round_seconds)} seconds.")
+    stats = broker.stats()
+    st.caption(f"{stats['live']} duels in progress, {stats['waiting']} players waiting")
+    if st.button("Find Opponent", use_container_width=True):
+        st.session_state.pvp_queued_at = time.monotonic()
+        broker.join(username)
+        st.rerun()
+
+
+def pvp_ui():
+    if not st.session_state.get("logged_in", False):
+        st.error("You must be logged in to duel!")
+        st.session_state.page = "Login"
+        st.rerun()
+
+    st.markdown("<h1 class='game-title'>⚔️ LePvP Duel</h1>", unsafe_allow_html=True)
+    if broker.match_for(st.session_state.username) is None:
+        display_lobby()
+    else:
+        display_duel()
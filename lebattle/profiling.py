@@ -0,0 +1,107 @@
+"""On-demand cProfile and tracemalloc capture for one user's next reruns.
+
+An operator arms a username for N reruns, either from the LeAdmin page or at
+startup with LEBATTLE_PROFILE="alice:5,bob:3" (reruns default to 1). Each of
+that user's next N reruns runs under cProfile and tracemalloc, and writes two
+files to LEBATTLE_PROFILE_DIR (default "profiles"), tagged with the page the
+rerun ended on:
+
+    <time>-<user>-<page>.prof       load with pstats or snakeviz
+    <time>-<user>-<page>.snapshot   load with tracemalloc.Snapshot.load
+
+Everyone else pays one dict lookup per rerun. tracemalloc is process-wide, so
+only one rerun is captured at a time; a second armed rerun that arrives
+meanwhile runs normally and keeps its turn for later.
+"""
+
+import cProfile
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import streamlit as st
+
+PROFILE_DIR = os.environ.get("LEBATTLE_PROFILE_DIR", "profiles")
+TRACEMALLOC_FRAMES = 10
+
+_lock = threading.Lock()
+_armed = {}  # username -> reruns left to capture
+_capturing = threading.Lock()
+
+
+def arm(username, reruns=1):
+    """Capture the next `reruns` reruns of every session signed in as username"""
+    with _lock:
+        if reruns > 0:
+            _armed[username] = reruns
+        else:
+            _armed.pop(username, None)
+
+
+def armed():
+    with _lock:
+        return dict(_armed)
+
+
+def _arm_from_env(spec):
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        username, _, reruns = item.partition(":")
+        arm(username, int(reruns or 1))
+
+
+def _take_turn(username):
+    """Claim one capture for username if it is armed and no capture is running"""
+    with _lock:
+        if username not in _armed or not _capturing.acquire(blocking=False):
+            return False
+        _armed[username] -= 1
+        if not _armed[username]:
+            del _armed[username]
+        return True
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(text))
+
+
+def recent_captures(limit=20):
+    """(file name, size in bytes) for the newest files in PROFILE_DIR"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    entries = [entry for entry in os.scandir(PROFILE_DIR) if entry.is_file()]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    return [(entry.name, entry.stat().st_size) for entry in entries[:limit]]
+
+
+@contextmanager
+def profile_rerun():
+    """Profile this rerun if its user is armed; a no-op otherwise"""
+    username = st.session_state.get("username")
+    if not _armed or username is None or not _take_turn(username):
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            now = time.time()
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f".{int(now * 1000) % 1000:03d}"
+            stem = os.path.join(PROFILE_DIR, f"{stamp}-{_slug(username)}-{_slug(st.session_state.get('page'))}")
+            profiler.dump_stats(f"{stem}.prof")
+            snapshot.dump(f"{stem}.snapshot")
+        finally:
+            _capturing.release()
+
+
+_arm_from_env(os.environ.get("LEBATTLE_PROFILE", ""))
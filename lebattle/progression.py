@@ -0,0 +1,159 @@
+"""Level progression: the XP threshold table and level lookups.
+
+The curve is described in a JSON config (lebattle/data/progression.json by
+default, or the file named by LEBATTLE_PROGRESSION). The default curve's
+thresholds are built once into the shared table store (lebattle.tablestore);
+a config named by LEBATTLE_PROGRESSION is built once per process. Lookups
+are a bisect over the table, and get_table asks the store whether it changed
+at most every tablestore.CHECK_SECONDS.
+"""
+
+import json
+import os
+import time
+from bisect import bisect_right
+from functools import lru_cache
+
+from lebattle import tablestore
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), "data", "progression.json")
+PROGRESSION_PATH = os.environ.get("LEBATTLE_PROGRESSION")  # Instead of the table store
+
+
+def build_thresholds(config):
+    """Build the XP thresholds for levels 1..max_level + 1 from a curve config.
+
+    Each tier covers the levels after the previous tier up to ``through_level``
+    and either adds a flat ``xp_per_level`` or grows exponentially from the
+    tier's starting XP: ``start + k * step * growth ** k`` for the k-th level
+    into the tier. The last tier also covers the level past the cap so the
+    "next level" XP can still be shown at max level.
+    """
+    max_level = config["max_level"]
+    thresholds = [0]  # Level 1 needs no XP
+    level = 1
+    tiers = config["tiers"]
+    for i, tier in enumerate(tiers):
+        start_level, start_xp = level, thresholds[-1]
+        last_level = max_level + 1 if i == len(tiers) - 1 else tier["through_level"]
+        while level < last_level:
+            level += 1
+            if "xp_per_level" in tier:
+                thresholds.append(thresholds[-1] + tier["xp_per_level"])
+            else:
+                k = level - start_level
+                curve = tier["exponential"]
+                thresholds.append(int(start_xp + k * curve["step"] * curve["growth"] ** k))
+    if level < max_level + 1:
+        raise ValueError(f"Progression tiers stop at level {level}, max_level is {max_level}")
+    return tuple(thresholds)
+
+
+class ProgressionTable:
+    def __init__(self, thresholds, max_level):
+        # thresholds[i] is the total XP needed to reach level i + 1
+        self.thresholds = thresholds
+        self.max_level = max_level
+
+    def xp_required_for_level(self, level):
+        if level <= 1:
+            return 0
+        return self.thresholds[min(level, self.max_level + 1) - 1]
+
+    def level_for_xp(self, xp):
+        """Highest level reachable with this much XP, capped at max_level"""
+        return min(bisect_right(self.thresholds, xp), self.max_level)
+
+    def level_after_xp(self, current_level, new_xp):
+        """Level after a player at current_level reaches new_xp (never goes down)"""
+        return max(current_level, self.level_for_xp(new_xp))
+
+    def get_level_progress(self, current_xp, current_level):
+        """Calculate progress percentage to next level"""
+        current_level_xp = self.xp_required_for_level(current_level)
+        xp_for_this_level = self.xp_required_for_level(current_level + 1) - current_level_xp
+        xp_gained_in_level = current_xp - current_level_xp
+
+        progress = xp_gained_in_level / xp_for_this_level if xp_for_this_level > 0 else 1.0
+        return min(1.0, max(0.0, progress))  # Ensure between 0 and 1
+
+    def chart_spec(self, current_level):
+        """Vega-Lite spec for the LePASS level progression chart, highlighting current_level"""
+        return _chart_spec(self.thresholds, self.max_level, current_level)
+
+
+@lru_cache(maxsize=256)
+def _chart_spec(thresholds, max_level, current_level):
+    # Keyed on the thresholds rather than the table, so the cache holds no table alive
+    levels = range(1, max_level + 1)
+    return {
+        "data": {"values": [{"level": i, "xp": thresholds[i - 1], "current": i == current_level} for i in levels]},
+        "mark": {"type": "line", "point": True},
+        "encoding": {
+            "x": {"field": "level", "type": "quantitative", "title": "Level"},
+            "y": {"field": "xp", "type": "quantitative", "title": "XP Required"},
+            "color": {"field": "current", "type": "nominal", "scale": {"range": ["#4880EC", "#FF416C"]}, "legend": None},
+            "size": {"field": "current", "type": "nominal", "scale": {"range": [2, 5]}, "legend": None}
+        },
+        "width": 700,
+        "height": 300
+    }
+
+
+@lru_cache(maxsize=None)
+def load_table(path):
+    with open(path) as f:
+        config = json.load(f)
+    return ProgressionTable(build_thresholds(config), config["max_level"])
+
+
+_stored = (None, None, float("-inf"))  # (store version, its table, when the store was last checked)
+
+
+def get_table():
+    """The progression table for this process, built on first use"""
+    global _stored
+    if PROGRESSION_PATH:
+        return load_table(PROGRESSION_PATH)
+    version, table, checked = _stored
+    now = time.monotonic()
+    if now - checked < tablestore.CHECK_SECONDS:
+        return table
+    store = tablestore.attach()
+    if store is None:
+        version, table = None, load_table(DEFAULT_CONFIG)
+    elif store.version != version:
+        thresholds = store["progression.thresholds"]
+        version, table = store.version, ProgressionTable(tuple(thresholds.tolist()), len(thresholds) - 1)
+    _stored = (version, table, now)
+    return table
+
+
+def store_tables():
+    """(sources, tables) for lebattle.tablestore"""
+    import numpy as np  # Only the store build needs it
+
+    with open(DEFAULT_CONFIG) as f:
+        thresholds = build_thresholds(json.load(f))
+    return [DEFAULT_CONFIG], {"progression.thresholds": np.array(thresholds, dtype=np.int64)}
+
+
+def xp_required_for_level(level):
+    """Total XP needed to reach a level"""
+    return get_table().xp_required_for_level(level)
+
+
+def level_for_xp(xp):
+    return get_table().level_for_xp(xp)
+
+
+def level_after_xp(current_level, new_xp):
+    return get_table().level_after_xp(current_level, new_xp)
+
+
+def get_level_progress(current_xp, current_level):
+    return get_table().get_level_progress(current_xp, current_level)
+
+
+def max_level():
+    return get_table().max_level
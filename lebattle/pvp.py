@@ -0,0 +1,212 @@
+"""Player-vs-player duels: an in-process matchmaking broker.
+
+Signed-in sessions queue with `join` and are paired first come, first served.
+Each round both players lock in a move with `submit`; the round resolves with
+game.resolve_round, defends first, then attacks and rests, then damage. It
+resolves as soon as the second move is in, or ROUND_SECONDS after the round
+opened, with "rest" for whoever hasn't chosen. The LePvP page polls
+`match_for` and redraws when the round number changes.
+
+There is no thread per match. A submission resolves inline, and round
+deadlines sit in one heap that `tick` drains on the next broker call. Apart
+from that heap's O(log n) push and pop, every operation is a few dict
+lookups, so one broker holds thousands of matches. A player who lets
+MAX_MISSED rounds in a row time out forfeits (both at once is a draw), so
+abandoned matches end on their own. Finished matches are dropped once both players have left, or
+after FINISHED_TTL.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from lebattle.battle import LOG_LIMIT, PLAYER_HEALTH, PLAYER_STAMINA
+from lebattle.game import Player, legal_moves, resolve_round
+
+ROUND_SECONDS = float(os.environ.get("LEBATTLE_PVP_ROUND_SECONDS", 20))
+MAX_MISSED = 3
+FINISHED_TTL = 600
+MOVES = ("attack", "defend", "rest", "special")
+DEFAULT_MOVE = "rest"
+
+
+class Match:
+    __slots__ = ("id", "usernames", "fighters", "moves", "submitted_at", "round", "deadline", "missed",
+                 "log", "over", "winner", "left")
+
+    def __init__(self, match_id, usernames, deadline):
+        self.id = match_id
+        self.usernames = usernames
+        self.fighters = tuple(Player(name, PLAYER_HEALTH, PLAYER_STAMINA) for name in usernames)
+        self.moves = [None, None]  # This round's locked-in moves
+        self.submitted_at = [None, None]  # When each side locked in the last resolved move; None if it timed out
+        self.round = 1
+        self.deadline = deadline  # When this round resolves with or without both moves
+        self.missed = [0, 0]  # Consecutive rounds each side let time out
+        # "side|HH:MM:SS|message" strings like BattleState.log; side is "0", "1" or "system"
+        self.log = []
+        self.over = False
+        self.winner = None  # Username once over; stays None for a tie
+        self.left = [False, False]
+        self.add_log("The duel begins! Both fighters lock in a move each round.")
+
+    def side(self, username):
+        return self.usernames.index(username)
+
+    def add_log(self, message, entry_type="system"):
+        self.log.append(f"{entry_type}|{time.strftime('%H:%M:%S')}|{message}")
+        if len(self.log) > LOG_LIMIT:
+            del self.log[0]
+
+    def log_entries(self):
+        """The log as [side, time, message] triples, newest first"""
+        return [entry.split("|", 2) for entry in reversed(self.log)]
+
+
+class Broker:
+    def __init__(self, round_seconds=ROUND_SECONDS, clock=time.monotonic):
+        self.round_seconds = round_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._waiting = OrderedDict()  # username -> None; a queue with O(1) removal
+        self._matches = {}
+        self._by_user = {}
+        self._deadlines = []  # Heap of (deadline, match id, round); stale entries are skipped
+        self._ids = itertools.count(1)
+        self.resolved = 0
+        self.timeouts = 0
+
+    def join(self, username):
+        """Queue for a duel. Returns the new match if an opponent was waiting."""
+        with self._lock:
+            self._tick()
+            if username in self._by_user or username in self._waiting:
+                return self._matches.get(self._by_user.get(username))
+            if not self._waiting:
+                self._waiting[username] = None
+                return None
+            opponent, _ = self._waiting.popitem(last=False)
+            match = Match(next(self._ids), (opponent, username), self.clock() + self.round_seconds)
+            self._matches[match.id] = match
+            self._by_user[opponent] = self._by_user[username] = match.id
+            heapq.heappush(self._deadlines, (match.deadline, match.id, match.round))
+            return match
+
+    def waiting(self, username):
+        with self._lock:
+            return username in self._waiting
+
+    def match_for(self, username):
+        """The user's current match, live or finished, or None"""
+        with self._lock:
+            self._tick()
+            return self._matches.get(self._by_user.get(username))
+
+    def submit(self, username, action):
+        """Lock in this round's move. False if there is no live match, the move is already in,
+        or the move isn't legal for this player's fighter right now."""
+        if action not in MOVES:
+            raise ValueError(f"Unknown move {action!r}")
+        with self._lock:
+            self._tick()
+            match = self._matches.get(self._by_user.get(username))
+            if match is None or match.over:
+                return False
+            side = match.side(username)
+            if match.moves[side] is not None or action not in legal_moves(match.fighters[side]):
+                return False
+            match.moves[side] = action
+            match.submitted_at[side] = self.clock()
+            match.missed[side] = 0
+            if None not in match.moves:
+                self._resolve(match)
+            return True
+
+    def leave(self, username):
+        """Leave the queue, forfeit a live match, or dismiss a finished one"""
+        with self._lock:
+            self._waiting.pop(username, None)
+            match = self._matches.get(self._by_user.pop(username, None))
+            if match is None:
+                return
+            side = match.side(username)
+            match.left[side] = True
+            if not match.over:
+                self._finish(match, match.usernames[1 - side], f"{username} left the duel.")
+            if all(match.left):
+                del self._matches[match.id]
+
+    def tick(self):
+        with self._lock:
+            self._tick()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "waiting": len(self._waiting),
+                "matches": len(self._matches),
+                "live": sum(not match.over for match in self._matches.values()),
+                "resolved_rounds": self.resolved,
+                "timed_out_rounds": self.timeouts,
+            }
+
+    def _tick(self):
+        """Resolve every round whose deadline has passed. Caller holds the lock."""
+        now = self.clock()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, match_id, round = heapq.heappop(self._deadlines)
+            match = self._matches.get(match_id)
+            if match is None or match.round != round:
+                continue  # Resolved in time, or already dropped
+            if match.over:
+                self._drop(match)
+                continue
+            self.timeouts += 1
+            for side in (0, 1):
+                if match.moves[side] is None:
+                    match.moves[side] = DEFAULT_MOVE
+                    match.submitted_at[side] = None
+                    match.missed[side] += 1
+                    match.add_log(f"{match.usernames[side]} ran out of time and rests.")
+            self._resolve(match)
+            if not match.over and min(match.missed) >= MAX_MISSED:
+                self._finish(match, None, f"Both players missed {MAX_MISSED} rounds. The duel is a draw.")
+            for side in (0, 1):
+                if not match.over and match.missed[side] >= MAX_MISSED:
+                    self._finish(match, match.usernames[1 - side],
+                                 f"{match.usernames[side]} missed {MAX_MISSED} rounds and forfeits.")
+
+    def _resolve(self, match):
+        """Apply both locked-in moves and open the next round. Caller holds the lock."""
+        first, second = match.fighters
+        match.add_log(f"Round {match.round} - both fighters reveal their moves!")
+        for entry_type, message in resolve_round(first, match.moves[0], second, match.moves[1]):
+            match.add_log(message, "0" if entry_type == "player" else "1")
+        self.resolved += 1
+        match.moves = [None, None]
+        match.round += 1
+        if not (first.is_alive() and second.is_alive()):
+            winner = None if first.health == second.health == 0 else match.usernames[0 if first.is_alive() else 1]
+            self._finish(match, winner, f"{winner} wins the duel!" if winner else "Both fighters fall. It's a tie!")
+            return
+        match.deadline = self.clock() + self.round_seconds
+        heapq.heappush(self._deadlines, (match.deadline, match.id, match.round))
+
+    def _finish(self, match, winner, message):
+        match.over = True
+        match.winner = winner
+        match.add_log(message)
+        match.round += 1  # Invalidates the pending deadline and tells pollers something changed
+        heapq.heappush(self._deadlines, (self.clock() + FINISHED_TTL, match.id, match.round))
+
+    def _drop(self, match):
+        del self._matches[match.id]
+        for username in match.usernames:
+            if self._by_user.get(username) == match.id:
+                del self._by_user[username]
+
+
+broker = Broker()
@@ -0,0 +1,181 @@
+"""Compact battle replays and lazy playback.
+
+A replay is everything needed to re-run a finished battle with the combat
+rules: the starting state, the seed behind every round's rolls (see
+battle.round_rng) and both sides' moves. Layout, version 1:
+
+    byte      format version
+    byte      difficulty (index into battle's difficulty list)
+    varint    seed
+    varint x4 player health, player stamina, LeBron health, LeBron stamina
+    varint    rounds
+    bytes     moves, one nibble per round (player << 2 | LeBron), two rounds a byte
+
+A typical 10-round battle is about 20 bytes. `playback` re-runs the rounds one
+at a time, so memory stays flat however long the replay is. `index_terms`
+and `wildcard_terms` give the n-grams lebattle.moveindex searches and counts
+by.
+"""
+
+from functools import lru_cache
+
+from lebattle.battle import DIFFICULTIES, PLAYER_HEALTH, PLAYER_STAMINA, decode_moves, round_rng
+from lebattle.game import LeBron, Player, resolve_round
+
+REPLAY_VERSION = 1
+INDEX_N = 4  # Longest run of rounds indexed as one term
+OPEN_LEBRON, OPEN_PLAYER = 1, 2  # wildcard_gram masks: the side of a round that may be any move
+_KEEP = (0b1111, 0b1100, 0b0011)  # Round code bits each mask keeps (player << 2 | LeBron)
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+@lru_cache(maxsize=None)
+def _lebron_start(difficulty):
+    lebron = LeBron(difficulty)
+    return lebron.health, lebron.stamina
+
+
+def encode(battle):
+    """A BattleState, finished or not, as replay bytes"""
+    out = bytearray((REPLAY_VERSION, DIFFICULTIES.index(battle.difficulty)))
+    _write_varint(out, battle.seed)
+    for value in (PLAYER_HEALTH, PLAYER_STAMINA, *_lebron_start(battle.difficulty)):
+        _write_varint(out, value)
+    actions = battle.actions
+    _write_varint(out, len(actions))
+    for i in range(0, len(actions), 2):
+        out.append(actions[i] | (actions[i + 1] << 4 if i + 1 < len(actions) else 0))
+    return bytes(out)
+
+
+def read_header(data):
+    """The replay's header as a dict, and the offset its moves start at"""
+    if data[0] != REPLAY_VERSION:
+        raise ValueError(f"Replay has version {data[0]}, expected {REPLAY_VERSION}")
+    offset = 2
+    values = []
+    for _ in range(6):
+        value, offset = _read_varint(data, offset)
+        values.append(value)
+    seed, player_health, player_stamina, lebron_health, lebron_stamina, rounds = values
+    header = {
+        "difficulty": DIFFICULTIES[data[1]],
+        "seed": seed,
+        "player_health": player_health,
+        "player_stamina": player_stamina,
+        "lebron_health": lebron_health,
+        "lebron_stamina": lebron_stamina,
+        "rounds": rounds,
+    }
+    return header, offset
+
+
+_LOW_NIBBLE = bytes(byte & 0x0F for byte in range(256))
+_HIGH_NIBBLE = bytes(byte >> 4 for byte in range(256))
+
+
+def moves(data):
+    """The replay's per-round move codes (battle.encode_moves) as bytes"""
+    header, offset = read_header(data)
+    packed = data[offset:]
+    codes = bytearray(2 * len(packed))
+    codes[0::2] = packed.translate(_LOW_NIBBLE)
+    codes[1::2] = packed.translate(_HIGH_NIBBLE)
+    return bytes(codes[:header["rounds"]])
+
+
+def joint_gram(codes):
+    """One index term for a run of rounds: its length, then each round's 4-bit code"""
+    gram = len(codes) << 16
+    for i, code in enumerate(codes):
+        gram |= code << 4 * i
+    return gram
+
+
+def wildcard_gram(codes, masks):
+    """One term for a run of rounds with one side of some rounds open: the joint_gram of the codes
+    with the open sides cleared, plus each round's 2-bit mask. With no side open it is the joint_gram."""
+    gram = len(codes) << 16
+    for i, (code, mask) in enumerate(zip(codes, masks)):
+        gram |= (code & _KEEP[mask]) << 4 * i | mask << 20 + 2 * i
+    return gram
+
+
+def player_gram(player_moves):
+    """One term for a run of the player's moves alone (2 bits each, as move indexes)"""
+    gram = len(player_moves) << 8
+    for i, move in enumerate(player_moves):
+        gram |= move << 2 * i
+    return gram
+
+
+def index_terms(codes):
+    """(distinct joint n-grams, {player n-gram: occurrences}) for n up to INDEX_N"""
+    joint, player = set(), {}
+    rounds = len(codes)
+    player_moves = [code >> 2 for code in codes]
+    for n in range(1, INDEX_N + 1):
+        for i in range(rounds - n + 1):
+            joint.add(joint_gram(codes[i:i + n]))
+            gram = player_gram(player_moves[i:i + n])
+            player[gram] = player.get(gram, 0) + 1
+    return joint, player
+
+
+def wildcard_terms(codes):
+    """Distinct wildcard_grams with at least one side open, for runs of up to INDEX_N rounds"""
+    terms, exact = set(), set()
+    for i in range(len(codes)):
+        grams = [0]  # Every way of opening sides of the rounds so far, exact first, as terms of that length
+        for n, code in enumerate(codes[i:i + INDEX_N]):
+            variants = [1 << 16 | (code & keep) << 4 * n | mask << 20 + 2 * n for mask, keep in enumerate(_KEEP)]
+            grams = [gram + variant for gram in grams for variant in variants]
+            terms.update(grams)
+            exact.add(grams[0])
+    terms -= exact
+    return terms
+
+
+def playback(data):
+    """Re-run a replay round by round.
+
+    Yields (round, player action, LeBron action, log entries, player, lebron)
+    per round. The two fighters are the same objects every round, updated in
+    place; copy what you need before advancing.
+    """
+    header, offset = read_header(data)
+    player = Player("You", header["player_health"], header["player_stamina"])
+    lebron = LeBron(header["difficulty"])
+    lebron.max_health = lebron.health = header["lebron_health"]
+    lebron.stamina = header["lebron_stamina"]
+    for round in range(1, header["rounds"] + 1):
+        byte = data[offset + (round - 1) // 2]
+        player_action, lebron_action = decode_moves(byte >> 4 if round % 2 == 0 else byte & 0x0F)
+        entries = resolve_round(player, player_action, lebron, lebron_action, round_rng(header["seed"], round))
+        yield round, player_action, lebron_action, entries, player, lebron
+
+
+def final_health(data):
+    """(player health, LeBron health) when the replay ends"""
+    header, _ = read_header(data)
+    player, lebron = header["player_health"], header["lebron_health"]
+    for _, _, _, _, player_fighter, lebron_fighter in playback(data):
+        player, lebron = player_fighter.health, lebron_fighter.health
+    return player, lebron
@@ -0,0 +1,88 @@
+"""Retention for stored battles: old replays become daily summary rows.
+
+Every battle's replay is kept for RETENTION_DAYS days. After that it is
+rolled into battle_rollups (one row per player, day and difficulty, with
+the player's move counts), optionally copied to an archive SQLite file, and
+deleted with its move index postings (db.compact_replays).
+
+Work is done BATCH replays per transaction, oldest first, with PAUSE seconds
+between transactions, so a live writer waits at most one batch for the lock;
+each batch's rollups and index terms are worked out before the lock is taken.
+After each batch up to VACUUM_PAGES freed pages are handed back to the
+filesystem (incremental auto-vacuum), so the file shrinks a little at a time
+instead of in one long VACUUM.
+
+What the pages read is unaffected. LePASS reads XP, level and the win/loss
+record from the users table, LeStats reads the stats aggregates, and both
+already count compacted battles. rebuild_stats starts from the rollups. Only
+the LeStats deep dive, the move index and the coach need raw replays, so
+they cover the retained window.
+
+Server processes run it in the background for a few seconds an hour (see
+lebattle.maintenance); the command line does a whole backlog at once.
+
+    python -m lebattle.retention --days 180
+    python -m lebattle.retention --days 30 --archive replays-archive.db
+    python -m lebattle.retention --enable-incremental-vacuum
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from lebattle.db import (compact_replays, count_replays, count_replays_before, enable_incremental_vacuum,
+                         init_db, reclaim_space)
+
+RETENTION_DAYS = int(os.environ.get("LEBATTLE_RETENTION_DAYS", 180))
+BATCH = 200
+PAUSE = 0.05
+VACUUM_PAGES = 256
+
+
+def compact(days=RETENTION_DAYS, batch=BATCH, pause=PAUSE, archive=None, budget=None):
+    """Compact every replay older than `days` days, or as many as fit in `budget` seconds.
+
+    Returns (replays compacted, pages freed, whether it finished).
+    """
+    before = time.time() - days * 86400
+    deadline = None if budget is None else time.monotonic() + budget
+    compacted = freed = 0
+    while True:
+        done = compact_replays(before, batch, archive)
+        compacted += done
+        freed += reclaim_space(VACUUM_PAGES)[0]
+        if done < batch:
+            return compacted, freed, True
+        if deadline is not None and time.monotonic() + pause >= deadline:
+            return compacted, freed, False
+        time.sleep(pause)  # Let waiting writers in between batches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll old battle replays into daily summaries and delete them")
+    parser.add_argument("--days", type=float, default=RETENTION_DAYS, help="keep replays this many days")
+    parser.add_argument("--batch", type=int, default=BATCH, help="replays per transaction")
+    parser.add_argument("--pause", type=float, default=PAUSE, help="seconds between transactions")
+    parser.add_argument("--archive", help="SQLite file to copy compacted replays into instead of dropping them")
+    parser.add_argument("--budget", type=float, help="stop after about this many seconds")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="switch an existing database to incremental auto-vacuum first (one full VACUUM)")
+    args = parser.parse_args(argv)
+
+    init_db()  # Adds any tables this database predates
+    if args.enable_incremental_vacuum:
+        t0 = time.perf_counter()
+        enable_incremental_vacuum()
+        print(f"Enabled incremental auto-vacuum in {time.perf_counter() - t0:.1f}s")
+    due = count_replays_before(time.time() - args.days * 86400)
+    print(f"{due} of {count_replays()} replays are older than {args.days:g} days")
+    t0 = time.perf_counter()
+    compacted, freed, finished = compact(args.days, args.batch, args.pause, args.archive, args.budget)
+    print(f"Compacted {compacted} replays{' into ' + args.archive if args.archive else ''} and freed "
+          f"{freed} pages in {time.perf_counter() - t0:.1f}s{'' if finished else ' (budget spent; run again)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
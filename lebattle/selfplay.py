@@ -0,0 +1,190 @@
+"""Self-play Q-learning of LeBron's learned policy (lebattle.learned).
+
+LeBron fights at the Learned difficulty (the Hard body, his moves chosen by
+the learner) against an opponent in the player's body, drawn per battle
+from OPPONENTS: "self" is a snapshot of the learner's own greedy policy,
+refreshed every SNAPSHOT battles, and the rest are lebattle.tournament
+policy specs that keep the policy honest against play unlike its own.
+
+Moves are epsilon-greedy, epsilon decaying linearly to EPSILON_END over the
+run. A move's reward is the change in (LeBron's health share - the
+opponent's), plus 1 for a win and -1 for a loss when the battle ends, and
+its Q value is updated one-step when LeBron next decides, with a step size
+of 1 / visits down to ALPHA_MIN. Illegal moves are pinned far below any
+value, so a row's max is over the legal moves only.
+
+The Q and visit tables live in WORK_DIR so a run can be resumed; the greedy
+policy is written to lebattle/data/learned_policy.npy (or --out) by
+replacing the file, never rewriting it in place, since servers have it
+memory-mapped.
+
+    python -m lebattle.selfplay --battles 300000
+    python -m lebattle.selfplay --resume --battles 100000
+    python -m lebattle.selfplay --evaluate-only --games 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from lebattle import learned
+from lebattle.game import LeBron, resolve_round
+from lebattle.learned import DEFAULT_POLICY, MOVES, STATES, legal_mask, state_index
+from lebattle.tournament import MAX_ROUNDS, LeBronContender, make_contender
+
+WORK_DIR = "selfplay"
+OPPONENTS = ("self", "self", "random", "skilled:0.5", "lebron:Hard")  # Drawn uniformly per battle
+PANEL = ("random", "skilled:0.5", "lebron:Hard")
+SNAPSHOT = 5000
+GAMMA = 0.98
+ALPHA_MIN = 0.05
+EPSILON_START = 0.3
+EPSILON_END = 0.02
+ILLEGAL = -1e9
+_PRIOR = np.array([0.0, 0.0, 0.0, 0.01], dtype=np.float32)  # Untried states fall back to special, then attack
+
+
+class TableContender(LeBronContender):
+    """A fixed policy table fighting in the player's body"""
+    __slots__ = ("table",)
+
+    def __init__(self, table):
+        super().__init__("Learned")
+        self.table = table
+
+    def choose_action(self, opponent):
+        self.observe(opponent)
+        return MOVES[self.table[state_index(self, opponent, self.player_pattern_memory)]]
+
+
+def new_tables():
+    """(Q, visits) for a fresh run"""
+    legal = legal_mask()
+    q = np.where(legal, _PRIOR, np.float32(ILLEGAL)).astype(np.float32)
+    return q, np.zeros((STATES, len(MOVES)), dtype=np.uint32)
+
+
+def greedy(q):
+    return q.argmax(axis=1).astype(np.uint8)
+
+
+def _potential(lebron, player):
+    return lebron.health / lebron.max_health - player.health / player.max_health
+
+
+def play(q, visits, opponent, epsilon=0.0, learn=True):
+    """One battle of the learner against an opponent; 1, 0.5 or 0 for LeBron"""
+    lebron = LeBron("Learned")
+    last = None  # (state, move) awaiting its update
+    reward = 0.0
+    for _ in range(MAX_ROUNDS):
+        action = opponent.choose_action(lebron)
+        lebron.observe(opponent)
+        state = state_index(lebron, opponent, lebron.player_pattern_memory)
+        row = q[state]
+        if learn and last is not None:
+            s, a = last
+            visits[s, a] += 1
+            q[s, a] += max(ALPHA_MIN, 1 / visits[s, a]) * (reward + GAMMA * row.max() - q[s, a])
+        if random.random() < epsilon:
+            move = random.choice(np.flatnonzero(row > ILLEGAL))
+        else:
+            move = int(row.argmax())
+        before = _potential(lebron, opponent)
+        resolve_round(opponent, action, lebron, MOVES[move])
+        reward = _potential(lebron, opponent) - before
+        last = (state, move)
+        if not (opponent.is_alive() and lebron.is_alive()):
+            break
+    result = 0.5 if lebron.is_alive() == opponent.is_alive() else float(lebron.is_alive())
+    if learn:
+        s, a = last
+        visits[s, a] += 1
+        q[s, a] += max(ALPHA_MIN, 1 / visits[s, a]) * (reward + 2 * result - 1 - q[s, a])
+    return result
+
+
+def train(q, visits, battles, seed=0, progress=print):
+    random.seed(seed)
+    table = greedy(q)
+    score = 0.0
+    for battle in range(battles):
+        if battle % SNAPSHOT == 0 and battle:
+            table = greedy(q)
+            progress(f"  {battle:8} battles, LeBron scored {score / SNAPSHOT:.1%} over the last {SNAPSHOT}")
+            score = 0.0
+        spec = random.choice(OPPONENTS)
+        opponent = TableContender(table) if spec == "self" else make_contender(spec)
+        epsilon = EPSILON_START + (EPSILON_END - EPSILON_START) * battle / max(battles - 1, 1)
+        score += play(q, visits, opponent, epsilon)
+
+
+def evaluate(panel=PANEL, games=1000, seed=1):
+    """{spec: (player win rate vs Hard, vs Learned)} on the same seeded battles, through the game's own AI"""
+    report = {}
+    for spec in panel:
+        rates = []
+        for difficulty in ("Hard", "Learned"):
+            wins = 0
+            for game in range(games):
+                random.seed(seed * 1000003 + game)
+                player, lebron = make_contender(spec), LeBron(difficulty)
+                for _ in range(MAX_ROUNDS):
+                    resolve_round(player, player.choose_action(lebron), lebron, lebron.choose_action(player))
+                    if not (player.is_alive() and lebron.is_alive()):
+                        break
+                wins += player.is_alive() and not lebron.is_alive()
+            rates.append(wins / games)
+        report[spec] = tuple(rates)
+    return report
+
+
+def save_policy(policy, path):
+    """Write a policy table by replacing the file, so processes mapping the old one keep a whole table"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, policy)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train LeBron's learned policy by self-play Q-learning")
+    parser.add_argument("--battles", type=int, default=300000)
+    parser.add_argument("--resume", action="store_true", help="continue from the tables in --work")
+    parser.add_argument("--work", default=WORK_DIR, help="directory for the Q and visit tables")
+    parser.add_argument("--out", default=DEFAULT_POLICY)
+    parser.add_argument("--games", type=int, default=1000, help="battles per panel policy when evaluating")
+    parser.add_argument("--evaluate-only", action="store_true", help="only evaluate the policy in --out")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not args.evaluate_only:
+        q_path, visits_path = os.path.join(args.work, "q.npy"), os.path.join(args.work, "visits.npy")
+        if args.resume:
+            q, visits = np.load(q_path), np.load(visits_path)
+        else:
+            q, visits = new_tables()
+        t0 = time.perf_counter()
+        train(q, visits, args.battles, args.seed)
+        elapsed = time.perf_counter() - t0
+        os.makedirs(args.work, exist_ok=True)
+        np.save(q_path, q)
+        np.save(visits_path, visits)
+        save_policy(greedy(q), args.out)
+        seen = np.count_nonzero(visits.any(axis=1))
+        print(f"Trained on {args.battles} battles in {elapsed:.0f}s; {seen} of {STATES} states visited. "
+              f"Wrote {args.out}")
+
+    learned.POLICY_PATH = args.out
+    print(f"Player win rate on {args.games} battles per policy, Hard -> Learned:")
+    for spec, (vs_hard, vs_learned) in evaluate(games=args.games).items():
+        print(f"  {spec:<14} {vs_hard:6.1%} -> {vs_learned:6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""In-process registry of the battles held by live sessions.
+
+Pages look battles up here by Streamlit session ID and username (session_key)
+instead of keeping them in st.session_state, so the server decides what
+stays in memory, and a battle never follows its tab to the next user to sign
+in there. Every lookup records an interaction. The least recently used
+battles are packed into the parked_battles table and dropped from memory
+whenever resident battles exceed LEBATTLE_MEMORY_BUDGET_MB, and battles
+idle for LEBATTLE_IDLE_TIMEOUT seconds by the sweep lebattle.maintenance
+runs every SWEEP_INTERVAL seconds, off the players' reruns. The next lookup
+from that session restores the battle transparently, from memory if its
+write is still in flight: parked battles are written outside the registry
+lock, so no lookup waits on SQLite for someone else's eviction. Resident
+memory therefore follows the players who are actually playing, not every
+tab ever opened.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from lebattle import db
+from lebattle.battle import footprint, pack, unpack
+
+IDLE_TIMEOUT = float(os.environ.get("LEBATTLE_IDLE_TIMEOUT", 15 * 60))
+MEMORY_BUDGET = int(float(os.environ.get("LEBATTLE_MEMORY_BUDGET_MB", 256)) * 1024 * 1024)
+SWEEP_INTERVAL = 30  # Seconds between idle sweeps by lebattle.maintenance; the budget is enforced on every store
+PARKED_TTL = 7 * 24 * 60 * 60  # Parked battles older than this belong to sessions that are gone
+
+
+def session_key(session_id, username):
+    """Registry key for a user's battle in one browser session"""
+    return f"{session_id}/{username}"
+
+
+class _Entry:
+    __slots__ = ("battle", "last_seen", "size")
+
+    def __init__(self, battle, last_seen, size):
+        self.battle = battle
+        self.last_seen = last_seen
+        self.size = size
+
+
+class SessionRegistry:
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, memory_budget=MEMORY_BUDGET, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.memory_budget = memory_budget
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._resident = OrderedDict()  # session_id -> _Entry, least recently used first
+        self._parked = set()  # Session IDs parked by this process, to skip the DB for everyone else
+        self._parking = {}  # session_id -> packed battle popped from memory but not yet written to the DB
+        self._write_lock = threading.Lock()  # Keeps parked_battles writes in eviction order
+        self._resident_bytes = 0
+        self.evictions = 0
+        self.restores = 0
+
+    def get(self, session_id):
+        """The session's battle, restoring it if it was parked. None if it has none."""
+        with self._lock:
+            entry = self._resident.get(session_id)
+            if entry is not None:
+                entry.last_seen = self._clock()
+                self._resident.move_to_end(session_id)
+                battle = entry.battle
+            elif session_id in self._parking:
+                # Evicted but still being written: take it back from memory, and the row is never read
+                battle = unpack(self._parking.pop(session_id))
+                self._store(session_id, battle)
+                self.restores += 1
+                self._park(self._over_budget())
+            elif session_id in self._parked:
+                self._parked.discard(session_id)
+                data = db.unpark_battle(session_id)
+                battle = unpack(data) if data else None
+                if battle is not None:
+                    self._store(session_id, battle)
+                    self.restores += 1
+                    self._park(self._over_budget())
+            else:
+                battle = None
+        self._write_parking()
+        return battle
+
+    def put(self, session_id, battle):
+        """Record the session's battle, or clear it with None. Call again after changing it."""
+        with self._lock:
+            self._drop(session_id)
+            if battle is not None:
+                self._store(session_id, battle)
+                self._park(self._over_budget())
+        self._write_parking()
+
+    def stats(self):
+        """Counts and bytes for monitoring"""
+        with self._lock:
+            return {
+                "resident": len(self._resident),
+                "resident_bytes": self._resident_bytes,
+                "parked": len(self._parked) + len(self._parking),
+                "evictions": self.evictions,
+                "restores": self.restores,
+            }
+
+    def sweep(self, limit=None):
+        """Park battles idle for longer than the timeout, at most `limit` of them. Returns how many."""
+        with self._lock:
+            cutoff = self._clock() - self.idle_timeout
+            evicted = []
+            # Entries are in last-use order, so the idle ones are all at the front
+            while self._resident and (limit is None or len(evicted) < limit):
+                session_id, entry = next(iter(self._resident.items()))
+                if entry.last_seen > cutoff:
+                    break
+                evicted.append((session_id, self._pop(session_id)))
+            self._park(evicted)
+        self._write_parking()
+        db.prune_parked_battles(PARKED_TTL)
+        return len(evicted)
+
+    def _store(self, session_id, battle):
+        entry = _Entry(battle, self._clock(), footprint(battle))
+        self._resident[session_id] = entry
+        self._resident_bytes += entry.size
+
+    def _pop(self, session_id):
+        entry = self._resident.pop(session_id)
+        self._resident_bytes -= entry.size
+        return entry.battle
+
+    def _drop(self, session_id):
+        if session_id in self._resident:
+            self._pop(session_id)
+        self._parking.pop(session_id, None)
+        if session_id in self._parked:
+            self._parked.discard(session_id)
+            db.unpark_battle(session_id)
+
+    def _over_budget(self):
+        """Pop least recently used battles until resident ones fit the budget"""
+        evicted = []
+        while self._resident_bytes > self.memory_budget and len(self._resident) > 1:
+            session_id = next(iter(self._resident))
+            evicted.append((session_id, self._pop(session_id)))
+        return evicted
+
+    def _park(self, evicted):
+        # Runs under the lock so a lookup never sees a battle that is neither resident nor parking
+        for session_id, battle in evicted:
+            self._parking[session_id] = pack(battle)
+        self.evictions += len(evicted)
+
+    def _write_parking(self):
+        """Write the battles waiting in _parking to the DB, outside the registry lock.
+
+        If another thread is writing, leave it to that one: it loops until
+        nothing is waiting, so lookups and stores never wait on the DB.
+        """
+        while self._parking and self._write_lock.acquire(blocking=False):
+            try:
+                # Take the latest state of each under the write lock, so an older write never lands last
+                with self._lock:
+                    batch = list(self._parking.items())
+                if batch:
+                    db.park_battles(batch)
+                with self._lock:
+                    for session_id, state in batch:
+                        # Skip battles restored or cleared during the write; their rows are stale and never read
+                        if self._parking.get(session_id) is state:
+                            del self._parking[session_id]
+                            self._parked.add(session_id)
+            finally:
+                self._write_lock.release()
+
+
+registry = SessionRegistry()
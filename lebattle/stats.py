@@ -0,0 +1,37 @@
+"""Battle stats aggregates behind the LeStats page.
+
+db.save_replays adds every battle to the aggregates as it is saved. Replays
+stored before the aggregates existed, or after they were edited by hand, are
+folded in by rebuilding them from the replays table:
+
+    python -m lebattle.stats --rebuild
+    python -m lebattle.stats --user alice
+"""
+
+import argparse
+import sys
+import time
+
+from lebattle.db import STATS_FIELDS, count_replays, init_db, rebuild_stats, stats_totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show or rebuild the battle stats aggregates")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the aggregates from every stored replay")
+    parser.add_argument("--user", default="", help="show one player's totals instead of everyone's")
+    args = parser.parse_args(argv)
+
+    init_db()  # Adds any tables this database predates
+    if args.rebuild:
+        t0 = time.perf_counter()
+        rebuild_stats()
+        print(f"Rebuilt the stats of {count_replays()} replays in {time.perf_counter() - t0:.1f}s")
+    totals = stats_totals(args.user)
+    print(f"{'difficulty':<12}" + "".join(f"{field:>12}" for field in STATS_FIELDS))
+    for difficulty, row in totals.items():
+        print(f"{difficulty:<12}" + "".join(f"{row[field]:>12}" for field in STATS_FIELDS))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
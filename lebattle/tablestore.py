@@ -0,0 +1,206 @@
+"""Precomputed tables shared by every server process through one mapped file.
+
+Modules that ship precomputed data (PRODUCERS) each give a store_tables()
+returning the source files they read and {name: array} built from them.
+`build` packs every table into one binary file, and every process attaches
+to it with mmap: a table is a read-only NumPy view of the mapping, so
+reading it copies nothing, the pages live once in the OS page cache however
+many workers map them, and a worker's warm-up is a header parse instead of
+loading and rebuilding each table itself.
+
+The file is an 8-byte magic, a 4-byte format version and a 4-byte header
+length, a JSON header (store version, source file stamps, and dtype, shape and offset
+per table), then each table's bytes at an ALIGN-byte boundary. The store
+version is a digest of the tables, so two builds of the same sources agree.
+
+A build writes a temporary file and renames it over the store, so a process
+opening the store always sees a whole one, and processes still holding the
+old mapping keep reading the old file until they move on. `attach` checks at
+most every CHECK_SECONDS whether the store was replaced or a source changed
+since it was built, and rebuilds or remaps as needed; the first process to
+need a missing store builds it.
+
+    python -m lebattle.tablestore build
+    python -m lebattle.tablestore info
+
+LEBATTLE_TABLES names the store file (default tables/lebattle.tables).
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORE_PATH = os.environ.get("LEBATTLE_TABLES", os.path.join(REPO_ROOT, "tables", "lebattle.tables"))
+PRODUCERS = ("lebattle.learned", "lebattle.progression", "lebattle.collectibles")
+MAGIC = b"LBTABLES"
+FORMAT = 1
+ALIGN = 64
+CHECK_SECONDS = 1.0
+
+_PREFIX = struct.Struct("<8sII")  # Magic, format, header length
+_attached = {}  # Path -> [store or None, monotonic time of the last check]
+_lock = threading.Lock()
+
+
+def _aligned(size):
+    return -(-size // ALIGN) * ALIGN
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class TableStore:
+    """A store file mapped read-only; store[name] is a zero-copy NumPy view"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (st.st_ino, st.st_mtime_ns)
+        magic, format, header_length = _PREFIX.unpack_from(self._mmap)
+        if magic != MAGIC or format != FORMAT:
+            raise ValueError(f"{path} is not a format {FORMAT} table store")
+        header = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_length])
+        self.version = header["version"]
+        self.sources = header["sources"]
+        import numpy as np  # Deferred: lebattle.db imports this module on every cold start
+
+        self.tables = {}
+        for name, entry in header["tables"].items():
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"], dtype=np.int64))
+            array = np.frombuffer(self._mmap, dtype, count, entry["offset"]).reshape(entry["shape"])
+            self.tables[name] = array
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    def __contains__(self, name):
+        return name in self.tables
+
+    def nbytes(self):
+        return sum(array.nbytes for array in self.tables.values())
+
+    def is_current(self):
+        """Whether this is still the file at path and none of its sources changed"""
+        try:
+            st = os.stat(self.path)
+            return ((st.st_ino, st.st_mtime_ns) == self.identity
+                    and all(_stamp(source) == stamp for source, stamp in self.sources.items()))
+        except OSError:
+            return False
+
+
+def write_store(path, tables, sources=()):
+    """Write {name: array} as a store at path, replacing any store there. Returns the version."""
+    import numpy as np
+
+    arrays = {name: np.ascontiguousarray(array) for name, array in sorted(tables.items())}
+    digest = hashlib.blake2b(digest_size=8)
+    entries, relative, offset = {}, {}, 0
+    for name, array in arrays.items():
+        digest.update(f"{name}|{array.dtype.str}|{array.shape}".encode())
+        digest.update(array.data)
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape)}
+        relative[name] = offset
+        offset += _aligned(array.nbytes)
+    header = {"version": digest.hexdigest(), "sources": {source: _stamp(source) for source in sources},
+              "tables": entries}
+
+    # The data starts at the first boundary after the header, which holds the
+    # offsets, so move the start until the header with them fits in front of it
+    start = 0
+    while True:
+        for name, entry in entries.items():
+            entry["offset"] = start + relative[name]
+        encoded = json.dumps(header).encode()
+        if _PREFIX.size + len(encoded) <= start:
+            break
+        start = _aligned(_PREFIX.size + len(encoded))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, FORMAT, len(encoded)) + encoded)
+            for name, array in arrays.items():
+                f.seek(entries[name]["offset"])
+                f.write(array.data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return header["version"]
+
+
+def build(path=None):
+    """Build the store from every producer's sources. Returns the version."""
+    tables, sources = {}, []
+    for module in PRODUCERS:
+        used, produced = importlib.import_module(module).store_tables()
+        sources += used
+        tables.update(produced)
+    return write_store(path or STORE_PATH, tables, sources)
+
+
+def attach(path=None):
+    """This process's view of the current store, built if missing or stale; None if it can't be built"""
+    path = path or STORE_PATH
+    entry = _attached.get(path)
+    if entry is not None and time.monotonic() - entry[1] < CHECK_SECONDS:
+        return entry[0]
+    with _lock:
+        store = entry[0] if entry is not None else None
+        if store is None or not store.is_current():
+            store = _open(path)
+        _attached[path] = [store, time.monotonic()]
+        return store
+
+
+def _open(path):
+    try:
+        store = TableStore(path)
+        if store.is_current():
+            return store
+    except (OSError, ValueError):
+        pass
+    try:
+        build(path)  # Missing, stale or unreadable: whichever process gets here first rebuilds it
+        return TableStore(path)
+    except OSError:
+        return None  # A read-only deployment without a store; callers load their sources directly
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the shared table store")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--path", default=STORE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        t0 = time.perf_counter()
+        version = build(args.path)
+        print(f"Built {args.path} version {version} in {time.perf_counter() - t0:.2f}s")
+    store = TableStore(args.path)
+    print(f"{args.path}: version {store.version}, {len(store.tables)} tables, {store.nbytes()} bytes"
+          f"{'' if store.is_current() else ' (stale: sources changed since the build)'}")
+    for name, array in store.tables.items():
+        print(f"  {name:<28} {str(array.dtype):<8} {'x'.join(map(str, array.shape)):>10} {array.nbytes:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Thumbnails and per-rarity sprite sheets for the LePASS gallery.
+
+`python -m lebattle.thumbnails` mirrors the collectibles into the asset
+store (see lebattle.assets), then writes content-hashed thumbnails and one
+sprite sheet per rarity tier into static/lepass/, which Streamlit serves at
+app/static/lepass/. With --offline only the seed directory and the existing
+store are used.
+
+    python -m lebattle.thumbnails --seed ~/lebron-seed --offline
+
+Pages read the index written alongside the images. Collectibles missing from
+it are shown from the asset store, or their remote URL, as before.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+
+from lebattle import assets
+from lebattle.collectibles import get_catalog
+
+OUTPUT_SUBDIR = "lepass"
+URL_PREFIX = "app/static/" + OUTPUT_SUBDIR + "/"
+INDEX_NAME = "index.json"
+
+THUMB_SIZE = 256  # Bounding box for single images (avatar, next reward, teaser)
+CELL_SIZE = 100  # Gallery images are shown at width=100
+SPRITE_COLUMNS = 5
+JPEG_QUALITY = 82
+
+
+def _write_hashed(image, out_dir):
+    """Save an image as JPEG under its content hash and return the file name"""
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    data = buffer.getvalue()
+    name = hashlib.sha256(data).hexdigest()[:16] + ".jpg"
+    path = os.path.join(out_dir, name)
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(data)
+    return name
+
+
+def output_dir():
+    return os.path.join(assets.STATIC_DIR, OUTPUT_SUBDIR)
+
+
+def build(seed_dir=None, offline=False):
+    """Build thumbnails, sprite sheets and the index. Returns the index."""
+    from PIL import Image, ImageOps
+
+    # Originals come from the asset store, so each one is fetched at most once
+    assets.build(seed_dir, offline)
+    out_dir = output_dir()
+    os.makedirs(out_dir, exist_ok=True)
+    catalog = get_catalog()
+    index = {"version": 1, "thumbs": {}, "sprites": {}, "missing": []}
+
+    cells = {}
+    for collectible in catalog.collectibles:
+        data = assets.read(collectible.id)
+        if data is None:
+            index["missing"].append(collectible.id)
+            continue
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        thumb = image.copy()
+        thumb.thumbnail((THUMB_SIZE, THUMB_SIZE))
+        index["thumbs"][collectible.id] = _write_hashed(thumb, out_dir)
+        cells[collectible.id] = ImageOps.fit(image, (CELL_SIZE, CELL_SIZE))
+
+    for rarity in catalog.rarities:
+        members = [c for c in catalog.by_rarity[rarity.name] if c.id in cells]
+        if not members:
+            continue
+        rows = (len(members) + SPRITE_COLUMNS - 1) // SPRITE_COLUMNS
+        sheet = Image.new("RGB", (SPRITE_COLUMNS * CELL_SIZE, rows * CELL_SIZE), "white")
+        positions = {}
+        for i, collectible in enumerate(members):
+            x, y = (i % SPRITE_COLUMNS) * CELL_SIZE, (i // SPRITE_COLUMNS) * CELL_SIZE
+            sheet.paste(cells[collectible.id], (x, y))
+            positions[collectible.id] = [x, y]
+        index["sprites"][rarity.name] = {"file": _write_hashed(sheet, out_dir), "cells": positions}
+
+    # Write the index last so readers never see it point at missing files
+    tmp_path = os.path.join(out_dir, INDEX_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp_path, os.path.join(out_dir, INDEX_NAME))
+    return index
+
+
+def gallery_index():
+    """The built index, reloaded only when the file changes. None if never built."""
+    return assets.cached_json(os.path.join(output_dir(), INDEX_NAME))
+
+
+def image_source(collectible):
+    """What to pass to st.image for a collectible: its thumbnail if built, else the mirrored original"""
+    index = gallery_index()
+    name = index and index["thumbs"].get(collectible.id)
+    return os.path.join(output_dir(), name) if name else assets.asset_image(collectible.id)
+
+
+def gallery_html(collectibles):
+    """HTML for a gallery grid. Cells come from the rarity sprite sheets where built."""
+    index = gallery_index() or {"sprites": {}}
+    items = []
+    for collectible in collectibles:
+        sprite = index["sprites"].get(collectible.rarity)
+        position = sprite and sprite["cells"].get(collectible.id)
+        if position:
+            x, y = position
+            picture = (
+                f"<div class='lebron-sprite' style=\"background-image: url('{URL_PREFIX}{sprite['file']}');"
+                f" background-position: -{x}px -{y}px;\"></div>"
+            )
+        else:
+            picture = f"<img src='{assets.asset_url(collectible.id)}' width='{CELL_SIZE}'>"
+        items.append(
+            f"<div class='lebron-gallery-item'>{picture}"
+            f"<div class='lebron-gallery-caption'>Level {collectible.level}</div></div>"
+        )
+    return "<div class='lebron-gallery-container'>" + "".join(items) + "</div>"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build LePASS thumbnails and sprite sheets")
+    parser.add_argument("--seed", help="directory of seed images laid out like the catalog asset paths")
+    parser.add_argument("--offline", action="store_true", help="never download, use only the seed directory and store")
+    args = parser.parse_args(argv)
+
+    index = build(args.seed, args.offline)
+    print(f"{len(index['thumbs'])} thumbnails, {len(index['sprites'])} sprite sheets")
+    if index["missing"]:
+        print("Missing originals (served from their remote URL):", ", ".join(index["missing"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""AI-vs-AI tournaments between LeBron policies, rated with Glicko.
+
+A policy is named by a spec string, "kind" or "kind:argument":
+
+    lebron:Easy, lebron:Medium, lebron:Hard   LeBron's AI at that difficulty
+    lebron:Learned                            the self-play policy (lebattle.learned)
+    random                                    a uniformly random legal move
+    skilled:0.5                               the Hard AI's move with that probability,
+                                              otherwise a random legal one
+
+Every contender fights in the same body (the player's 150 HP and plain
+moves), so only decision making differs. A bracket is played as rounds of
+pairings, each pairing as --games games with sides alternating:
+
+    round-robin  every pair meets once, scheduled by the circle method
+    swiss        --rounds rounds, pairing players on equal scores, no rematches
+
+Games run in a process pool and every finished game is appended to
+results.jsonl in the output directory as it arrives, so throughput grows
+with --workers and an interrupted bracket picks up where it stopped when run
+again with the same directory. A round-robin queues all of its rounds at
+once; Swiss waits for each round to finish, as its results pair the next. Each round is one Glicko rating period; the
+ratings are recomputed from results.jsonl, so they do not depend on the order
+games finished in. Ratings are reported with a 95% interval of two RDs.
+
+    python -m lebattle.tournament lebron:Easy lebron:Medium lebron:Hard random --games 200
+    python -m lebattle.tournament --out tournaments/swiss --format swiss --rounds 5 ...
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import zlib
+
+from lebattle.battle import PLAYER_HEALTH, PLAYER_STAMINA
+from lebattle.game import LeBron, Player, legal_moves, resolve_round
+
+DEFAULT_OUT = "tournaments/latest"
+MAX_ROUNDS = 300  # A game still going after this many rounds is a draw
+INITIAL_RATING = 1500.0
+INITIAL_RD = 350.0
+_Q = math.log(10) / 400
+
+
+class LeBronContender(LeBron):
+    """LeBron's decision making at one difficulty, fighting in the player's body"""
+    __slots__ = ()
+    attack = Player.attack
+    special_attack = Player.special_attack
+    take_damage = Player.take_damage
+
+    def __init__(self, difficulty):
+        super().__init__(difficulty)
+        self.max_health = self.health = PLAYER_HEALTH
+        self.stamina = PLAYER_STAMINA
+
+
+class RandomContender(Player):
+    __slots__ = ()
+
+    def __init__(self, arg=None):
+        super().__init__("Random", PLAYER_HEALTH, PLAYER_STAMINA)
+
+    def choose_action(self, opponent):
+        return random.choice(legal_moves(self))
+
+
+class SkilledContender(LeBronContender):
+    """A player somewhere between random play (skill 0) and the Hard AI (skill 1)"""
+    __slots__ = ("skill",)
+
+    def __init__(self, arg=None):
+        super().__init__("Hard")
+        self.skill = float(arg) if arg is not None else 0.5
+
+    def choose_action(self, opponent):
+        action = super().choose_action(opponent)  # Always asked, so the AI's memory stays current
+        if random.random() >= self.skill or action not in legal_moves(self):
+            action = random.choice(legal_moves(self))
+        return action
+
+
+# Policy kind -> factory taking the spec's argument (None without one)
+POLICIES = {
+    "lebron": LeBronContender,
+    "random": RandomContender,
+    "skilled": SkilledContender,
+}
+
+
+def make_contender(spec):
+    kind, _, arg = spec.partition(":")
+    if kind not in POLICIES:
+        raise ValueError(f"Unknown policy {spec!r}; kinds are {', '.join(POLICIES)}")
+    return POLICIES[kind](arg or None)
+
+
+def play_game(spec_a, spec_b, seed):
+    """One game between two policies. Returns (1, 0.5 or 0 for a, rounds played)."""
+    random.seed(seed)
+    a, b = make_contender(spec_a), make_contender(spec_b)
+    rounds = 0
+    while a.is_alive() and b.is_alive() and rounds < MAX_ROUNDS:
+        action_a = a.choose_action(b)
+        action_b = b.choose_action(a)
+        resolve_round(a, action_a, b, action_b)
+        rounds += 1
+    if a.is_alive() == b.is_alive():
+        return 0.5, rounds
+    return (1.0 if a.is_alive() else 0.0), rounds
+
+
+def _play_task(task):
+    """Play a pairing's remaining games in a worker; sides swap on odd games"""
+    round, a, b, games, seed = task
+    results = []
+    for game in games:
+        game_seed = zlib.crc32(f"{seed}|{round}|{a}|{b}|{game}".encode())
+        if game % 2:
+            score, rounds = play_game(b, a, game_seed)
+            score = 1 - score
+        else:
+            score, rounds = play_game(a, b, game_seed)
+        results.append({"round": round, "a": a, "b": b, "game": game, "score": score, "rounds": rounds})
+    return results
+
+
+def round_robin_schedule(players):
+    """Rounds of pairings where every pair meets exactly once (circle method)"""
+    players = list(players) + ([None] if len(players) % 2 else [])
+    half = len(players) // 2
+    rounds = []
+    for _ in range(len(players) - 1):
+        pairs = [(players[i], players[-1 - i]) for i in range(half)]
+        rounds.append([pair for pair in pairs if None not in pair])
+        players = [players[0], players[-1]] + players[1:-1]
+    return rounds
+
+
+def swiss_pairings(players, results, ratings):
+    """Pair players with equal scores, best first, avoiding rematches where possible"""
+    scores = {player: 0.0 for player in players}
+    met = set()
+    for result in results:
+        scores[result["a"]] += result["score"]
+        scores[result["b"]] += 1 - result["score"]
+        met.add(frozenset((result["a"], result["b"])))
+    order = sorted(players, key=lambda p: (-scores[p], -ratings[p][0], p))
+    pairs = []
+    while len(order) > 1:
+        first = order.pop(0)
+        opponent = next((p for p in order if frozenset((first, p)) not in met), order[0])
+        order.remove(opponent)
+        pairs.append((first, opponent))
+    return pairs  # With an odd field the lowest-ranked player left over sits the round out
+
+
+def _g(rd):
+    return 1 / math.sqrt(1 + 3 * _Q ** 2 * rd ** 2 / math.pi ** 2)
+
+
+def glicko_ratings(players, results):
+    """{player: (rating, RD)} after treating each bracket round as one rating period"""
+    ratings = {player: (INITIAL_RATING, INITIAL_RD) for player in players}
+    by_round = {}
+    for result in results:
+        by_round.setdefault(result["round"], []).append(result)
+    for round in sorted(by_round):
+        games = {player: [] for player in players}
+        for result in by_round[round]:
+            games[result["a"]].append((result["b"], result["score"]))
+            games[result["b"]].append((result["a"], 1 - result["score"]))
+        updated = {}
+        for player, played in games.items():
+            rating, rd = ratings[player]
+            if not played:
+                updated[player] = (rating, rd)
+                continue
+            variance_inv, delta = 0.0, 0.0
+            for opponent, score in played:
+                opp_rating, opp_rd = ratings[opponent]
+                g = _g(opp_rd)
+                expected = 1 / (1 + 10 ** (-g * (rating - opp_rating) / 400))
+                variance_inv += _Q ** 2 * g ** 2 * expected * (1 - expected)
+                delta += g * (score - expected)
+            denominator = 1 / rd ** 2 + variance_inv
+            updated[player] = (rating + _Q / denominator * delta, math.sqrt(1 / denominator))
+        ratings = updated
+    return ratings
+
+
+def load_results(path):
+    """Every complete line of results.jsonl; a line cut short by an interruption is dropped"""
+    results = []
+    if not os.path.exists(path):
+        return results
+    with open(path) as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return results
+
+
+class Tournament:
+    def __init__(self, out_dir, players=None, format="round-robin", games=100, rounds=None, seed=0):
+        self.out_dir = out_dir
+        config_path = os.path.join(out_dir, "config.json")
+        if os.path.exists(config_path):
+            with open(config_path) as f:
+                config = json.load(f)  # Resuming: the stored bracket wins over the arguments
+        else:
+            if not players or len(players) < 2:
+                raise ValueError("A tournament needs at least two policies")
+            if len(set(players)) != len(players):
+                raise ValueError("Each policy can enter a tournament once")
+            for spec in players:
+                make_contender(spec)  # Fail on a bad spec before any game is played
+            if format == "round-robin":
+                rounds = len(round_robin_schedule(players))
+            config = {"players": list(players), "format": format, "games": games, "seed": seed,
+                      "rounds": rounds or math.ceil(math.log2(len(players)))}
+            os.makedirs(out_dir, exist_ok=True)
+            with open(config_path, "w") as f:
+                json.dump(config, f, indent=2)
+        self.config = config
+        self.players = config["players"]
+        self.results_path = os.path.join(out_dir, "results.jsonl")
+        self.results = load_results(self.results_path)
+        # Rewrite without a torn last line so appends start on a clean line
+        with open(self.results_path, "w") as f:
+            f.writelines(json.dumps(result) + "\n" for result in self.results)
+
+    def pairings(self, round):
+        if self.config["format"] == "round-robin":
+            return round_robin_schedule(self.players)[round]
+        earlier = [result for result in self.results if result["round"] < round]
+        return swiss_pairings(self.players, earlier, glicko_ratings(self.players, earlier))
+
+    def run(self, workers=None, chunk=25, progress=None):
+        """Play every game not yet in results.jsonl"""
+        done = {(r["round"], r["a"], r["b"], r["game"]) for r in self.results}
+        rounds = range(self.config["rounds"])
+        # Only Swiss pairings depend on earlier results; a round-robin's schedule is fixed up front
+        stages = [rounds] if self.config["format"] == "round-robin" else [[round] for round in rounds]
+        with multiprocessing.Pool(workers) as pool, open(self.results_path, "a") as out:
+            for stage in stages:
+                tasks = []
+                for round in stage:
+                    for a, b in self.pairings(round):
+                        games = [game for game in range(self.config["games"]) if (round, a, b, game) not in done]
+                        for start in range(0, len(games), chunk):
+                            tasks.append((round, a, b, games[start:start + chunk], self.config["seed"]))
+                for batch in pool.imap_unordered(_play_task, tasks):
+                    out.writelines(json.dumps(result) + "\n" for result in batch)
+                    out.flush()
+                    self.results.extend(batch)
+                    if progress:
+                        progress(len(self.results))
+
+    def standings(self):
+        """(policy, rating, RD, wins, draws, losses) rows, best rating first"""
+        ratings = glicko_ratings(self.players, self.results)
+        record = {player: [0, 0, 0] for player in self.players}
+        for result in self.results:
+            for player, score in ((result["a"], result["score"]), (result["b"], 1 - result["score"])):
+                record[player][0 if score == 1 else 1 if score == 0.5 else 2] += 1
+        rows = [(player, *ratings[player], *record[player]) for player in self.players]
+        return sorted(rows, key=lambda row: -row[1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play an AI-vs-AI tournament between LeBron policies")
+    parser.add_argument("policies", nargs="*", help="policy specs, e.g. lebron:Hard random")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="bracket directory; an existing one is resumed")
+    parser.add_argument("--format", choices=["round-robin", "swiss"], default="round-robin")
+    parser.add_argument("--games", type=int, default=100, help="games per pairing")
+    parser.add_argument("--rounds", type=int, help="swiss rounds (default log2 of the field)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    tournament = Tournament(args.out, args.policies, args.format, args.games, args.rounds, args.seed)
+    if args.policies and args.policies != tournament.players:
+        print(f"Resuming {args.out} with its stored policies: {' '.join(tournament.players)}")
+    tournament.run(args.workers, progress=lambda n: print(f"\r{n} games", end="", flush=True))
+    print()
+
+    print(f"{'policy':<20} {'rating':>7} {'95% interval':>16} {'W':>6} {'D':>5} {'L':>6}")
+    for policy, rating, rd, wins, draws, losses in tournament.standings():
+        print(f"{policy:<20} {rating:7.0f} {rating - 2 * rd:7.0f} - {rating + 2 * rd:<6.0f}"
+              f" {wins:6} {draws:5} {losses:6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""Career simulator for tuning the XP reward and the level curve.
+
+Models a population of synthetic players levelling from 1 to max_level,
+each with a skill and a difficulty they play at, and reports how many
+battles it takes to reach the end of every progression tier.
+
+Outcomes come from measured battles, not guesses. `measure` plays real
+engine battles for each (skill, difficulty) pair on SKILLS and stores the
+outcome counts and the player's remaining health on wins in OUTCOMES_PATH.
+A player of skill s makes a strong move (LeBron's Hard AI, fighting in the
+player's body as in lebattle.tournament) with probability s and a random
+legal move otherwise. Synthetic players draw a skill from a Beta
+distribution and are matched to the nearest measured skill.
+
+Each (skill, difficulty) pair's XP per battle, through
+game.calculate_xp_reward and game.TIE_XP, is turned into an inverse CDF of
+QUANTILES steps. A battle is then one random index into it, so careers are
+played in NumPy batches of BATCH battles for every player still levelling:
+gather, cumulative sum, level lookup, and a per-player histogram of levels
+that adds up to battles-to-level without keeping any trajectory.
+
+`write_guide` stores the XP table and the median battles per tier in
+GUIDE_PATH, which the LePASS "How to Earn XP" section renders.
+
+    python -m lebattle.xpsim --players 100000
+    python -m lebattle.xpsim --measure --games 4000
+    python -m lebattle.xpsim --write-guide
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from lebattle.battle import PLAYER_HEALTH
+from lebattle.game import TIE_XP, LeBron, calculate_xp_reward, legal_moves, resolve_round
+from lebattle.progression import DEFAULT_CONFIG, get_table, load_table
+from lebattle.tournament import MAX_ROUNDS, LeBronContender
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+OUTCOMES_PATH = os.path.join(DATA_DIR, "xp_outcomes.json")
+GUIDE_PATH = os.path.join(DATA_DIR, "xp_guide.json")
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+SKILLS = (0.0, 0.25, 0.5, 0.75, 1.0)
+QUANTILES = 1024
+BATCH = 128  # Battles played per player per NumPy step
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def play_measured_battle(skill, difficulty, rng):
+    """(outcome, player health left) for one battle; outcome is "win", "loss" or "tie\""""
+    player = LeBronContender("Hard")
+    lebron = LeBron(difficulty)
+    for _ in range(MAX_ROUNDS):
+        action = player.choose_action(lebron)  # Always called, so its memory stays current
+        if rng.random() >= skill or action not in legal_moves(player):
+            action = rng.choice(legal_moves(player))
+        resolve_round(player, action, lebron, lebron.choose_action(player))
+        if not (player.is_alive() and lebron.is_alive()):
+            break
+    if player.is_alive() == lebron.is_alive():
+        return "tie", player.health
+    return ("win" if player.is_alive() else "loss"), player.health
+
+
+def measure(games=2000, seed=0):
+    """Outcome counts per (skill, difficulty), with a histogram of health left on wins"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    cells = []
+    for skill in SKILLS:
+        for difficulty in DIFFICULTIES:
+            cell = {"skill": skill, "difficulty": difficulty, "loss": 0, "tie": 0,
+                    "win_health": [0] * (PLAYER_HEALTH + 1)}
+            for _ in range(games):
+                outcome, health = play_measured_battle(skill, difficulty, rng)
+                if outcome == "win":
+                    cell["win_health"][health] += 1
+                else:
+                    cell[outcome] += 1
+            cells.append(cell)
+    return {"games": games, "seed": seed, "cells": cells}
+
+
+def load_outcomes(path=OUTCOMES_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def xp_values(difficulty):
+    """{"win": XP by health left (index), "loss": XP, "tie": XP} from the game's reward formula"""
+    return {
+        "win": [calculate_xp_reward(health, 0, difficulty, True) for health in range(PLAYER_HEALTH + 1)],
+        "loss": calculate_xp_reward(0, 1, difficulty, False),
+        "tie": TIE_XP,
+    }
+
+
+def xp_quantiles(outcomes):
+    """(QUANTILES-step inverse CDF of XP per battle per cell, win rate per cell), cells in file order"""
+    tables, win_rates = [], []
+    steps = (np.arange(QUANTILES) + 0.5) / QUANTILES
+    for cell in outcomes["cells"]:
+        xp = xp_values(cell["difficulty"])
+        values = np.array(xp["win"] + [xp["loss"], xp["tie"]], dtype=np.int32)
+        weights = np.array(cell["win_health"] + [cell["loss"], cell["tie"]], dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        cdf = np.cumsum(weights[order]) / weights.sum()
+        tables.append(values[order][np.minimum(np.searchsorted(cdf, steps), len(cdf) - 1)].astype(np.int16))
+        win_rates.append(sum(cell["win_health"]) / weights.sum())
+    return np.stack(tables), np.array(win_rates)
+
+
+def simulate(players=100000, difficulty_mix=(0.3, 0.5, 0.2), skill_beta=(2.0, 2.0), outcomes=None,
+             table=None, max_battles=50000, seed=0):
+    """Play every player's career to the level cap.
+
+    Returns a dict of per-player arrays: "difficulty" (index into DIFFICULTIES),
+    "skill", and "battles", an int32 (players, max_level + 1) array whose
+    [p, level] is the battle on which player p reached that level (0 for
+    level 1, -1 if not reached within max_battles).
+    """
+    outcomes = outcomes or load_outcomes()
+    table = table or get_table()
+    rng = np.random.default_rng(seed)
+    quantiles, _ = xp_quantiles(outcomes)
+    cell_index = {(cell["skill"], cell["difficulty"]): i for i, cell in enumerate(outcomes["cells"])}
+    skills = np.array(sorted({cell["skill"] for cell in outcomes["cells"]}))
+
+    difficulty = rng.choice(len(DIFFICULTIES), size=players, p=np.array(difficulty_mix) / sum(difficulty_mix))
+    skill = rng.beta(*skill_beta, size=players)
+    nearest = skills[np.abs(skill[:, None] - skills[None, :]).argmin(axis=1)]
+    lookup = np.array([[cell_index[(s, d)] for d in DIFFICULTIES] for s in skills])
+    cells = lookup[np.searchsorted(skills, nearest), difficulty]
+
+    max_level = table.max_level
+    thresholds = np.array(table.thresholds[1:max_level], dtype=np.int32)  # XP for levels 2..max_level
+    columns = max_level + 1
+    battles = np.full((players, columns), -1, dtype=np.int32)
+    battles[:, :2] = 0
+    xp = np.zeros(players, dtype=np.int32)
+    level = np.ones(players, dtype=np.int64)
+    active = np.arange(players)
+    played = 0
+    while len(active) and played < max_battles:
+        draws = rng.integers(0, QUANTILES, size=(len(active), BATCH), dtype=np.int16)
+        totals = np.cumsum(quantiles[cells[active, None], draws], axis=1, dtype=np.int32)
+        totals += xp[active, None]
+        end_level = np.searchsorted(thresholds, totals[:, -1], side="right") + 1
+        # Only players who levelled up in this batch need per-battle levels: a
+        # histogram of them gives how many battles in the batch ended under
+        # each level, so the battle each new level was reached on
+        up = np.flatnonzero(end_level > level[active])
+        levels = np.searchsorted(thresholds, totals[up], side="right") + 1
+        rows = np.repeat(np.arange(len(up)), BATCH)
+        counts = np.bincount(rows * columns + levels.ravel(), minlength=len(up) * columns)
+        under = np.cumsum(counts.reshape(len(up), columns), axis=1)
+        row, new_level = np.nonzero((np.arange(columns)[None, :] > level[active[up], None])
+                                    & (np.arange(columns)[None, :] <= end_level[up, None]))
+        battles[active[up][row], new_level] = played + under[row, new_level - 1] + 1
+        xp[active] = totals[:, -1]
+        level[active] = end_level
+        played += BATCH
+        active = active[end_level < max_level]
+
+    return {"difficulty": difficulty, "skill": skill, "battles": battles}
+
+
+def tier_ends(path=None):
+    """The last level of every tier of a progression config (default: the live one)"""
+    with open(path or os.environ.get("LEBATTLE_PROGRESSION", DEFAULT_CONFIG)) as f:
+        config = json.load(f)
+    return [tier.get("through_level", config["max_level"]) for tier in config["tiers"]]
+
+
+def percentiles(result, levels, difficulty=None):
+    """{level: {percentile: battles}} over the players who reached each level"""
+    battles = result["battles"]
+    if difficulty is not None:
+        battles = battles[result["difficulty"] == DIFFICULTIES.index(difficulty)]
+    report = {}
+    for level in levels:
+        reached = battles[:, level]
+        reached = reached[reached >= 0]
+        report[level] = {p: int(v) for p, v in zip(PERCENTILES, np.percentile(reached, PERCENTILES))} \
+            if len(reached) else None
+    return report
+
+
+def write_guide(result, levels, path=GUIDE_PATH):
+    guide = {
+        "generated_by": "python -m lebattle.xpsim --write-guide",
+        "players": len(result["skill"]),
+        "xp": {},
+        "median_battles": {},
+    }
+    for difficulty in DIFFICULTIES:
+        xp = xp_values(difficulty)
+        guide["xp"][difficulty] = {"win": [min(xp["win"][1:]), max(xp["win"])], "loss": xp["loss"], "tie": xp["tie"]}
+        report = percentiles(result, levels, difficulty)
+        guide["median_battles"][difficulty] = {str(level): report[level][50] if report[level] else None
+                                               for level in levels}
+    with open(path, "w") as f:
+        json.dump(guide, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate player careers to tune XP rewards and the level curve")
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--mix", default="0.3,0.5,0.2", help="share of players on Easy,Medium,Hard")
+    parser.add_argument("--skill-beta", default="2,2", help="a,b of the Beta distribution skills are drawn from")
+    parser.add_argument("--progression", help="curve config to simulate (default: the live one)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--measure", action="store_true", help=f"re-measure battle outcomes into {OUTCOMES_PATH}")
+    parser.add_argument("--games", type=int, default=2000, help="battles per skill and difficulty when measuring")
+    parser.add_argument("--write-guide", action="store_true", help=f"store the LePASS XP guide in {GUIDE_PATH}")
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        t0 = time.perf_counter()
+        outcomes = measure(args.games, args.seed)
+        with open(OUTCOMES_PATH, "w") as f:
+            json.dump(outcomes, f, separators=(",", ":"))
+            f.write("\n")
+        print(f"Measured {args.games * len(outcomes['cells'])} battles in {time.perf_counter() - t0:.1f}s")
+    outcomes = load_outcomes()
+    _, win_rates = xp_quantiles(outcomes)
+    print("Win rate by skill: " + "   ".join(
+        f"{difficulty} " + "/".join(f"{rate:.0%}" for rate, cell in zip(win_rates, outcomes["cells"])
+                                    if cell["difficulty"] == difficulty)
+        for difficulty in DIFFICULTIES))
+
+    table = load_table(args.progression) if args.progression else get_table()
+    levels = tier_ends(args.progression)
+    t0 = time.perf_counter()
+    result = simulate(args.players, [float(x) for x in args.mix.split(",")],
+                      [float(x) for x in args.skill_beta.split(",")], outcomes, table, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.players} careers in {elapsed:.1f}s")
+
+    header = "".join(f"{'p' + str(p):>8}" for p in PERCENTILES)
+    for difficulty in (None, *DIFFICULTIES):
+        print(f"\nBattles to reach level ({difficulty or 'all players'})")
+        print(f"{'level':>7}{header}")
+        for level, row in percentiles(result, levels, difficulty).items():
+            print(f"{level:>7}" + ("".join(f"{row[p]:>8}" for p in PERCENTILES) if row else "   not reached"))
+
+    if args.write_guide:
+        write_guide(result, levels)
+        print(f"\nWrote {GUIDE_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())